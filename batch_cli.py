@@ -0,0 +1,241 @@
+# sections/batch_cli.py
+"""Headless bulk extraction.
+
+    python batch_cli.py specs/ "archive/**/*.docx" -o out --format parquet -j 8 --resume
+
+Inputs are .docx files, .zip archives of them, directories (searched recursively) or glob
+patterns. Archive members are read one at a time, never extracted, and named
+``<archive>/<member path>`` in ``Source File`` and the manifest. Documents are parsed
+in this process, or on a pool of ``-j`` processes, and each one's stories and ACs are
+appended to the output as soon as it finishes, so nothing is concatenated in memory.
+``manifest.jsonl`` in the output directory records every processed file; ``--resume``
+skips files it lists as done.
+Without ``--resume`` the previous results in the output directory are cleared first;
+only a resumed run appends to them.
+``--profile`` appends one JSON line of per-stage parse stats per document to ``profile.jsonl``.
+``--grammar`` picks how Epic and Story headings are recognised (see ``grammars``).
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import zipfile
+
+from batch_ingest import ENGINES, archive_members, default_workers, is_archive, iter_archive, iter_parse_documents, tag_source
+from grammars import DEFAULT_GRAMMAR, GRAMMARS
+
+FORMATS = ("csv", "parquet", "jsonl")
+MANIFEST = "manifest.jsonl"
+PROFILE = "profile.jsonl"
+
+# -------- Input discovery --------
+def discover_inputs(patterns):
+    """Expand files, directories and globs into a de-duplicated, ordered list of .docx and .zip paths."""
+    seen, out = set(), []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "**", "*.docx"), recursive=True) +
+                             glob.glob(os.path.join(pattern, "**", "*.zip"), recursive=True))
+        elif os.path.isfile(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+        for path in matches:
+            # skip Word lock files ("~$name.docx") and anything that is not a .docx or .zip
+            if os.path.basename(path).startswith("~$") or not (path.lower().endswith(".docx") or is_archive(path)):
+                continue
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                out.append(path)
+    return out
+
+def expand_archives(paths):
+    """``{document name: size in bytes}`` in input order, archive members listed as ``<archive>/<member>``."""
+    docs = {}
+    for path in paths:
+        if is_archive(path):
+            docs.update((f"{path}/{info.filename}", info.file_size) for info in archive_members(path))
+        else:
+            docs[path] = os.path.getsize(path)
+    return docs
+
+def iter_sources(paths, names):
+    """``(name, source)`` for every document in ``names``: paths as they are, archive members as bytes."""
+    for path in paths:
+        if not is_archive(path):
+            if path in names: yield path, path
+            continue
+        prefix = f"{path}/"
+        members = {n[len(prefix):] for n in names if n.startswith(prefix)}
+        if members:
+            yield from iter_archive(path, path, members)
+
+def load_manifest(out_dir):
+    """Absolute paths recorded as successfully processed in the output manifest."""
+    done = set()
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line: continue
+            entry = json.loads(line)
+            if not entry.get("error"):
+                done.add(entry["path"])
+    return done
+
+def clear_outputs(out_dir):
+    """Remove the results, manifest, profile and Parquet parts a previous run left in ``out_dir``."""
+    names = [MANIFEST, PROFILE] + [f"{table}.{fmt}" for table in ("stories", "acs") for fmt in FORMATS if fmt != "parquet"]
+    stale = [os.path.join(out_dir, name) for name in names]
+    for table in ("stories", "acs"):
+        stale += glob.glob(os.path.join(out_dir, table, "part-*.parquet"))
+    for path in stale:
+        if os.path.isfile(path):
+            os.remove(path)
+
+# -------- Incremental writers --------
+class _CsvSink:
+    def __init__(self, path, fmt):
+        self.path, self.fmt = path, fmt
+        self.has_rows = os.path.exists(path) and os.path.getsize(path) > 0
+
+    def write(self, df):
+        if df.empty: return
+        with open(self.path, "a", encoding="utf-8", newline="") as fh:
+            if self.fmt == "csv":
+                df.to_csv(fh, index=False, header=not self.has_rows)
+            else:
+                text = df.to_json(orient="records", lines=True, force_ascii=False)
+                fh.write(text if text.endswith("\n") else text + "\n")
+        self.has_rows = True
+
+    def close(self):
+        pass
+
+class _ParquetSink:
+    """Appends row groups to ``<dir>/part-NNNN.parquet``; each resumed run adds a new part file."""
+
+    def __init__(self, directory):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise SystemExit("Parquet output needs pyarrow (pip install pyarrow).") from exc
+        self._pa, self._pq = pa, pq
+        os.makedirs(directory, exist_ok=True)
+        part = len(glob.glob(os.path.join(directory, "part-*.parquet")))
+        self.path = os.path.join(directory, f"part-{part:04d}.parquet")
+        self._writer = None
+
+    def write(self, df):
+        if df.empty: return
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            # categorical columns arrive with per-document index widths; fix them at int32
+            pa = self._pa
+            schema = pa.schema([f.with_type(pa.dictionary(pa.int32(), f.type.value_type))
+                                if pa.types.is_dictionary(f.type) else f for f in table.schema])
+            self._writer = self._pq.ParquetWriter(self.path, schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def open_sinks(out_dir, fmt):
+    if fmt == "parquet":
+        return _ParquetSink(os.path.join(out_dir, "stories")), _ParquetSink(os.path.join(out_dir, "acs"))
+    return (_CsvSink(os.path.join(out_dir, f"stories.{fmt}"), fmt),
+            _CsvSink(os.path.join(out_dir, f"acs.{fmt}"), fmt))
+
+# -------- Main --------
+def build_parser():
+    parser = argparse.ArgumentParser(description="Extract user stories and acceptance criteria from .docx files in bulk.")
+    parser.add_argument("inputs", nargs="+", help=".docx files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="storystruct_out", help="output directory (default: %(default)s)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="csv", help="output format (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="parser processes; 1 parses in this process, 0 uses one per CPU (default: %(default)s)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="docx",
+                        help="docx = python-docx parser, stream = iterparse parser (default: %(default)s)")
+    parser.add_argument("--grammar", choices=sorted(GRAMMARS), default=DEFAULT_GRAMMAR,
+                        help="default = 'Epic 1:' / 'User Story 1.1:' text, headings = also Heading 1/2 styles, "
+                             "gherkin = 'Feature:' / 'Scenario:' (default: %(default)s)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip files the output manifest lists as done and append to the existing results "
+                             "(default: replace them)")
+    parser.add_argument("--profile", action="store_true", help=f"write per-stage parse timings and net live memory blocks to {PROFILE}")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the final summary")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = discover_inputs(args.inputs)
+    try:
+        sizes = expand_archives(paths)
+    except (OSError, zipfile.BadZipFile) as exc:
+        print(f"Cannot read archive: {exc}", file=sys.stderr)
+        return 2
+    os.makedirs(args.output, exist_ok=True)
+    skipped = 0
+    if args.resume:
+        done = load_manifest(args.output)
+        remaining = {n: size for n, size in sizes.items() if os.path.abspath(n) not in done}
+        skipped, sizes = len(sizes) - len(remaining), remaining
+    if not sizes:
+        print(f"Nothing to do ({skipped} already processed)." if skipped else "No .docx files found.")
+        return 0
+
+    if not args.resume:
+        clear_outputs(args.output)
+
+    workers = args.workers if args.workers > 0 else default_workers(len(sizes))
+    story_sink, ac_sink = open_sinks(args.output, args.format)
+    n_docs = n_failed = n_stories = n_acs = n_bytes = 0
+    profile = open(os.path.join(args.output, PROFILE), "a", encoding="utf-8") if args.profile else None
+    start = time.perf_counter()
+    try:
+        with open(os.path.join(args.output, MANIFEST), "a", encoding="utf-8") as manifest:
+            docs = iter_sources(paths, sizes)
+            for result in iter_parse_documents(docs, workers, args.engine, profile=args.profile, grammar=args.grammar):
+                size = sizes[result.name]
+                entry = {"path": os.path.abspath(result.name), "bytes": size, "seconds": round(result.seconds, 4)}
+                n_docs += 1
+                n_bytes += size
+                if result.ok:
+                    s_df, ac_df = tag_source(result.name, result.stories, result.acs)
+                    story_sink.write(s_df)
+                    ac_sink.write(ac_df)
+                    n_stories += len(s_df)
+                    n_acs += len(ac_df)
+                    entry.update(stories=len(s_df), acs=len(ac_df))
+                else:
+                    n_failed += 1
+                    entry["error"] = result.error
+                    print(f"FAILED {result.name}: {result.error}", file=sys.stderr)
+                manifest.write(json.dumps(entry) + "\n")
+                manifest.flush()
+                if profile and result.stats:
+                    profile.write(json.dumps({"path": entry["path"], "bytes": size, **result.stats.as_dict()}) + "\n")
+                if not args.quiet:
+                    print(f"[{n_docs}/{len(sizes)}] {result.name}: "
+                          + (f"{entry['stories']} stories, {entry['acs']} ACs" if result.ok else "failed"))
+    finally:
+        story_sink.close()
+        ac_sink.close()
+        if profile: profile.close()
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Processed {n_docs} docs ({n_failed} failed, {skipped} skipped) with {workers} worker(s) in {elapsed:.2f}s")
+    print(f"  {n_docs / elapsed:.2f} docs/s · {n_stories / elapsed:.1f} stories/s · "
+          f"{n_acs / elapsed:.1f} ACs/s · {n_bytes / 1e6 / elapsed:.2f} MB/s")
+    print(f"  {n_stories} stories, {n_acs} ACs -> {os.path.abspath(args.output)}")
+    return 1 if n_failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+# sections/batch_ingest.py
+"""Parse many documents at once, in-process or on a process pool.
+
+Documents are given as ``(name, source)`` pairs where ``source`` is a path or the
+raw .docx bytes (uploaded files are not picklable, their bytes are). Results come
+back in input order; a document that fails to parse is reported, not raised.
+Parsing is serial unless more than one worker is asked for. Pools are started with
+``forkserver`` (``spawn`` where that is missing), never ``fork``: forking the
+multi-threaded Streamlit server can deadlock the child.
+``engine`` picks the python-docx parser ("docx") or the iterparse one ("stream").
+``IngestQueue`` parses in the background instead, for callers that keep rendering.
+Passing ``previous`` sections (see ``revisions``) parses a document section by
+section, reusing what an earlier revision already extracted.
+Zip archives of .docx files are read member by member (``iter_archive``); members are
+named ``<archive>/<member path>`` and never written to disk.
+"""
+import io
+import multiprocessing
+import os
+import time
+import threading
+import traceback
+import weakref
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Optional
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from parsing_helpers import (
+    AC_COLUMNS, STORY_COLUMNS, ParseStats, constant_categorical, extract_user_stories_and_acs,
+)
+from revisions import extract_revision
+from stream_parser import extract_user_stories_and_acs_streaming
+
+@dataclass
+class DocumentResult:
+    name: str
+    stories: Optional[pd.DataFrame] = None
+    acs: Optional[pd.DataFrame] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    stats: Optional[ParseStats] = None
+    sections: Optional[list] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+ENGINES = {
+    "docx": extract_user_stories_and_acs,
+    "stream": extract_user_stories_and_acs_streaming,
+}
+
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+def default_workers(n_docs=None) -> int:
+    workers = os.cpu_count() or 1
+    return max(1, min(workers, n_docs)) if n_docs else workers
+
+def process_pool(max_workers):
+    """A ``ProcessPoolExecutor`` started with ``POOL_START_METHOD``."""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+
+# -------- Zip archives --------
+def is_archive(name) -> bool:
+    return str(name).lower().endswith(".zip")
+
+def _is_docx_member(info):
+    base = info.filename.rsplit("/", 1)[-1]
+    return (not info.is_dir() and info.filename.lower().endswith(".docx")
+            and not base.startswith("~$") and not info.filename.startswith("__MACOSX/"))
+
+def archive_members(archive):
+    """``ZipInfo`` of every .docx in a zip archive (a path or binary file object), in archive order.
+
+    Only the central directory is read. Folders, Word lock files and macOS metadata are skipped.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        return [info for info in zf.infolist() if _is_docx_member(info)]
+
+def iter_archive(archive, name, members=None):
+    """Yield ``(f"{name}/{member}", bytes)`` for each .docx in a zip archive, in archive order.
+
+    Members are decompressed one at a time as the caller asks for them, so only the
+    documents in flight are held in memory. ``members`` limits it to those member names.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            if _is_docx_member(info) and (members is None or info.filename in members):
+                yield f"{name}/{info.filename}", zf.read(info)
+
+class ArchiveMember:
+    """One .docx inside an uploaded zip archive, decompressed only when its bytes are asked for."""
+
+    def __init__(self, archive, info, name):
+        self.archive = archive
+        self.member = info.filename
+        self.name = name
+        self.size = info.file_size
+
+    def getvalue(self) -> bytes:
+        if hasattr(self.archive, "seek"): self.archive.seek(0)
+        with zipfile.ZipFile(self.archive) as zf:
+            return zf.read(self.member)
+
+def open_archive(archive, name):
+    """``ArchiveMember`` per .docx in an uploaded zip archive (``name`` prefixes the member paths)."""
+    return [ArchiveMember(archive, info, f"{name}/{info.filename}") for info in archive_members(archive)]
+
+def _parse_one(name, source, engine="docx", profile=False, previous=None, grammar=None):
+    """Parse one document; with ``previous`` (a list of sections, possibly empty) ``engine`` is
+    ignored and the result carries the document's sections for its next revision.
+    ``grammar`` is a grammar name or ``grammars.Grammar`` (default: ``"default"``)."""
+    start = time.perf_counter()
+    stats = ParseStats() if profile else None
+    sections = None
+    try:
+        source = io.BytesIO(source) if isinstance(source, bytes) else source
+        if previous is None:
+            stories, acs = ENGINES[engine](source, stats=stats, grammar=grammar)
+        else:
+            stories, acs, sections = extract_revision(source, previous, stats=stats, grammar=grammar)
+    except Exception as exc:
+        detail = traceback.format_exception_only(type(exc), exc)[-1].strip()
+        return DocumentResult(name, error=detail, seconds=time.perf_counter() - start)
+    return DocumentResult(name, stories, acs, seconds=time.perf_counter() - start, stats=stats, sections=sections)
+
+def _collect(name, future):
+    try:
+        return future.result()
+    except Exception as exc:  # worker died or result could not be sent back
+        return DocumentResult(name, error=f"{type(exc).__name__}: {exc}")
+
+def iter_parse_documents(docs, max_workers=None, engine="docx", window=None, profile=False, grammar=None):
+    """Yield one ``DocumentResult`` per ``(name, source)`` pair, in input order.
+
+    At most ``window`` documents (default: four per worker) are in flight, so a long
+    input iterator is consumed lazily and finished results do not pile up in memory.
+    ``max_workers`` of 1 or ``None`` parses in the calling process. With
+    ``profile=True`` each result carries a ``ParseStats``.
+    """
+    workers = max_workers or 1
+    if workers <= 1:
+        for name, source in docs:
+            yield _parse_one(name, source, engine, profile, grammar=grammar)
+        return
+    window = window or workers * 4
+    with process_pool(workers) as pool:
+        in_flight = deque()
+        for name, source in docs:
+            in_flight.append((name, pool.submit(_parse_one, name, source, engine, profile, None, grammar)))
+            if len(in_flight) >= window:
+                yield _collect(*in_flight.popleft())
+        while in_flight:
+            yield _collect(*in_flight.popleft())
+
+def parse_documents(docs, max_workers=None, engine="docx", profile=False, grammar=None):
+    """Parse ``(name, source)`` pairs and return one ``DocumentResult`` per pair, in order.
+
+    Serial unless ``max_workers`` is above 1; a single document is always parsed in the
+    calling process. ``docs`` may be a lazy iterator (e.g. ``iter_archive``): only
+    enough of it is read ahead to size the pool.
+    """
+    docs = iter(docs)
+    head = list(islice(docs, (max_workers or 1) + 1))
+    workers = 1 if len(head) <= 1 else min(max_workers or 1, len(head))
+    return list(iter_parse_documents(chain(head, docs), workers, engine, profile=profile, grammar=grammar))
+
+def tag_source(name, s_df, ac_df):
+    """Attach the ``Source File`` column to one document's frames (without modifying them)."""
+    if not s_df.empty: s_df = s_df.assign(**{"Source File": constant_categorical(name, len(s_df))})
+    if not ac_df.empty: ac_df = ac_df.assign(**{"Source File": constant_categorical(name, len(ac_df))})
+    return s_df, ac_df
+
+def concat_frames(frames, columns):
+    """Concatenate same-shaped frames; categorical columns stay categorical (categories are unioned)."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    data = {}
+    for col in frames[0].columns:
+        parts = [f[col] for f in frames]
+        if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+            data[col] = union_categoricals(parts, ignore_order=True)
+        else:
+            data[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(data)
+
+def merge_results(named_frames):
+    """Concatenate ``(name, stories_df, ac_df)`` triples, tagging rows with ``Source File``."""
+    all_stories, all_acs = [], []
+    for name, s_df, ac_df in named_frames:
+        s_df, ac_df = tag_source(name, s_df, ac_df)
+        all_stories.append(s_df)
+        all_acs.append(ac_df)
+    return (concat_frames(all_stories, STORY_COLUMNS + ["Source File"]),
+            concat_frames(all_acs, AC_COLUMNS + ["Source File"]))
+
+def ingest_documents(docs, max_workers=None, engine="docx", grammar=None):
+    """Parse documents in parallel and merge them in input order.
+
+    Returns ``(stories_df, ac_df, errors)`` where ``errors`` is a list of
+    ``(name, message)`` for documents that could not be parsed.
+    """
+    results = parse_documents(docs, max_workers, engine, grammar=grammar)
+    stories_df, ac_df = merge_results((r.name, r.stories, r.acs) for r in results if r.ok)
+    return stories_df, ac_df, [(r.name, r.error) for r in results if not r.ok]
+
+# -------- Background ingestion --------
+@dataclass
+class IngestJob:
+    name: str
+    size: int
+    future: object
+    submitted: float
+    started: Optional[float] = None
+    harvested: bool = False
+
+def _cancel_jobs(jobs):
+    for job in list(jobs.values()):
+        job.future.cancel()
+
+class IngestQueue:
+    """Parses documents on an executor while the caller keeps running.
+
+    ``submit`` returns immediately; ``drain`` hands back each finished ``DocumentResult``
+    exactly once, and ``progress`` reports per-document state for a progress display.
+    Jobs are keyed by document hash, so re-submitting a queued or finished document is
+    a no-op.
+
+    The executor (a thread pool or ``process_pool``) is not owned by the queue, so one
+    bounded executor can serve every Streamlit session. ``close`` cancels this queue's
+    jobs that have not started; so does garbage collection of the queue, e.g. when its
+    session ends.
+    """
+
+    def __init__(self, executor, engine="docx"):
+        self.executor = executor
+        self.engine = engine
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+        weakref.finalize(self, _cancel_jobs, self.jobs)
+
+    def __contains__(self, doc_hash):
+        return doc_hash in self.jobs
+
+    def submit(self, doc_hash, name, data, profile=False, previous=None, grammar=None):
+        with self._lock:
+            if doc_hash in self.jobs: return
+            future = self.executor.submit(_parse_one, name, data, self.engine, profile, previous, grammar)
+            self.jobs[doc_hash] = IngestJob(name, len(data), future, time.time())
+
+    def pending(self, hashes=None):
+        """Hashes (optionally among ``hashes``) whose parse has not finished yet."""
+        return [h for h, job in self.jobs.items() if not job.future.done() and (hashes is None or h in hashes)]
+
+    def drain(self):
+        """``(hash, DocumentResult)`` for every job finished since the last call."""
+        out = []
+        with self._lock:
+            for doc_hash, job in self.jobs.items():
+                if job.harvested or not job.future.done(): continue
+                job.harvested = True
+                out.append((doc_hash, _collect(job.name, job.future)))
+        return out
+
+    def forget(self, doc_hash):
+        """Drop a job, cancelling it if it has not started."""
+        with self._lock:
+            job = self.jobs.pop(doc_hash, None)
+        if job is not None: job.future.cancel()
+
+    def progress(self, hashes=None):
+        """``[(name, fraction, state)]`` per job; running jobs are estimated from observed throughput."""
+        now = time.time()
+        done = [(j.size, j.future.result().seconds) for j in self.jobs.values()
+                if j.future.done() and not j.future.cancelled() and j.future.exception() is None]
+        rate = sum(size for size, _ in done) / max(sum(sec for _, sec in done), 1e-6) if done else 1e6
+        out = []
+        for doc_hash, job in self.jobs.items():
+            if hashes is not None and doc_hash not in hashes: continue
+            if job.future.done():
+                out.append((job.name, 1.0, "done"))
+            elif job.future.running():
+                job.started = job.started or now
+                elapsed = now - job.started
+                out.append((job.name, min(0.95, elapsed * rate / max(job.size, 1)), f"parsing {elapsed:.1f}s"))
+            else:
+                out.append((job.name, 0.0, "queued"))
+        return out
+
+    def close(self):
+        with self._lock:
+            _cancel_jobs(self.jobs)
@@ -0,0 +1,93 @@
+# benchmarks/bench_ac_tables.py
+"""Microbenchmark for AC table handling on 200-row, 8-column tables.
+
+Run from the repo root:  python benchmarks/bench_ac_tables.py
+Compares the previous per-function row walks (each re-reading ``row.cells``) with
+the single-pass ``read_ac_table`` that reads the cell-text grid once.
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from parsing_helpers import AC_HEADER_KEYWORDS, _canon_header, read_ac_table
+
+ROWS, COLS, TABLES = 200, 8, 5
+HEADERS = ["Sr. No", "Scenario", "Given", "When", "Then", "Expected Result", "Owner", "Notes"]
+
+def build_tables(n_tables=TABLES, merged=True):
+    doc = Document()
+    for _ in range(n_tables):
+        table = doc.add_table(rows=ROWS + 1, cols=COLS)
+        for r, row in enumerate(table.rows):
+            cells = row.cells
+            for c, cell in enumerate(cells):
+                cell.text = HEADERS[c] if r == 0 else f"r{r} c{c}"
+            if merged and r and r % 10 == 0:
+                cells[6].merge(cells[7])
+    return doc.tables
+
+# -- the previous implementation, kept here as the comparison baseline --
+def legacy_looks_like_ac_table(table):
+    for hdr_idx in (0, 1):
+        if hdr_idx >= len(table.rows):
+            break
+        cells_text = " | ".join(cell.text.strip().lower() for cell in table.rows[hdr_idx].cells)
+        if any(k in cells_text for k in AC_HEADER_KEYWORDS):
+            return True, hdr_idx
+    return False, None
+
+def _legacy_row_is_empty(row):
+    return all(not (cell.text or "").strip() for cell in row.cells)
+
+def _legacy_first_data_row_index(table, header_row_index):
+    total_rows = len(table.rows)
+    data_start = header_row_index + 1
+    if data_start < total_rows and _legacy_row_is_empty(table.rows[data_start]):
+        data_start += 1
+    return min(data_start, total_rows)
+
+def legacy_count_ac_rows(table, header_row_index):
+    data_start = _legacy_first_data_row_index(table, header_row_index)
+    return sum(1 for r in range(data_start, len(table.rows)) if not _legacy_row_is_empty(table.rows[r]))
+
+def legacy_parse_rows(table, header_row_index):
+    headers = [_canon_header(c.text) for c in table.rows[header_row_index].cells]
+    idx_acnum = headers.index("AC #") if "AC #" in headers else None
+    idx_scenario = headers.index("Scenario") if "Scenario" in headers else None
+    out = []
+    for r_idx in range(_legacy_first_data_row_index(table, header_row_index), len(table.rows)):
+        row = table.rows[r_idx]
+        if _legacy_row_is_empty(row): continue
+        cells = [cell.text.strip() for cell in row.cells]
+        ac_no = cells[idx_acnum] if idx_acnum is not None else ""
+        scenario = cells[idx_scenario] if idx_scenario is not None else ""
+        if ac_no or scenario:
+            out.append({"AC #": ac_no, "Scenario": scenario})
+    return out
+
+def legacy(table):
+    is_ac, hdr_idx = legacy_looks_like_ac_table(table)
+    return legacy_count_ac_rows(table, hdr_idx), legacy_parse_rows(table, hdr_idx)
+
+def single_pass(table):
+    return read_ac_table(table._tbl)
+
+def best_of(fn, tables, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(t) for t in tables]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+def main():
+    tables = build_tables()
+    t_old, old = best_of(legacy, tables)
+    t_new, new = best_of(single_pass, tables)
+    assert old == new
+    print(f"{TABLES} tables x {ROWS} rows x {COLS} cols")
+    print(f"{'legacy':>12} {t_old * 1e3 / TABLES:>9.2f} ms/table")
+    print(f"{'single-pass':>12} {t_new * 1e3 / TABLES:>9.2f} ms/table   ({t_old / t_new:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
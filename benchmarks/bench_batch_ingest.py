@@ -0,0 +1,39 @@
+# benchmarks/bench_batch_ingest.py
+"""Speed-up of ``batch_ingest.ingest_documents`` with 1, 2, 4 and 8 workers.
+
+Run from the repo root:  python benchmarks/bench_batch_ingest.py [workers ...]
+Parses a corpus of 50 synthetic documents; 1 worker parses in-process, as the
+Streamlit loop used to. Speed-up is bounded by the number of CPU cores.
+"""
+import os, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_ingest import ingest_documents
+from bench_streaming import write_document
+
+WORKERS = (1, 2, 4, 8)
+N_DOCS = 50
+STORIES_PER_DOC = 150
+
+def main(workers=WORKERS):
+    with tempfile.TemporaryDirectory() as workdir:
+        docs = []
+        for i in range(N_DOCS):
+            path = os.path.join(workdir, f"spec_{i:02d}.docx")
+            write_document(path, STORIES_PER_DOC)
+            docs.append((os.path.basename(path), path))
+
+        print(f"{N_DOCS} docs x {STORIES_PER_DOC} stories, {os.cpu_count()} CPU(s)")
+        print(f"{'workers':>8} {'seconds':>9} {'docs/s':>8} {'speed-up':>9}")
+        baseline = None
+        for n in workers:
+            start = time.perf_counter()
+            stories, acs, errors = ingest_documents(docs, max_workers=n)
+            elapsed = time.perf_counter() - start
+            assert not errors and stories["Source File"].iloc[0] == docs[0][0]
+            baseline = baseline or elapsed
+            print(f"{n:>8} {elapsed:>9.2f} {N_DOCS / elapsed:>8.1f} {baseline / elapsed:>8.2f}x")
+
+if __name__ == "__main__":
+    main(tuple(int(a) for a in sys.argv[1:]) or WORKERS)
@@ -0,0 +1,53 @@
+# benchmarks/bench_block_walker.py
+"""Scaling benchmark for ``iter_block_items``.
+
+Run from the repo root:  python benchmarks/bench_block_walker.py
+The per-paragraph cost should stay flat as the document grows (linear walk).
+"""
+import os, sys, time
+from copy import deepcopy
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from parsing_helpers import iter_block_items
+
+SIZES = (1_000, 10_000, 100_000)
+
+def build_document(n_paragraphs, table_every=50):
+    # python-docx's add_paragraph() rescans the body on every call, so build the
+    # body from cloned template elements to keep setup linear as well.
+    doc = Document()
+    body = doc.element.body
+    p_tpl = doc.add_paragraph("Paragraph")._p
+    t_tpl = doc.add_table(rows=2, cols=2)._tbl
+    sect_pr = body.sectPr
+    for el in (p_tpl, t_tpl, sect_pr):
+        body.remove(el)
+    items = []
+    for i in range(n_paragraphs):
+        items.append(deepcopy(p_tpl))
+        if table_every and i % table_every == 0:
+            items.append(deepcopy(t_tpl))
+    body.extend(items)
+    body.append(sect_pr)
+    return doc
+
+def time_walk(doc, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in iter_block_items(doc): pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(sizes=SIZES):
+    print(f"{'paragraphs':>12} {'seconds':>10} {'us/para':>10} {'growth':>8}")
+    prev = None
+    for n in sizes:
+        elapsed = time_walk(build_document(n))
+        growth = f"{elapsed / prev[1] / (n / prev[0]):.2f}x" if prev else "-"
+        print(f"{n:>12,} {elapsed:>10.4f} {elapsed / n * 1e6:>10.2f} {growth:>8}")
+        prev = (n, elapsed)
+
+if __name__ == "__main__":
+    main(tuple(int(a) for a in sys.argv[1:]) or SIZES)
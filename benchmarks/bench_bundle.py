@@ -0,0 +1,59 @@
+# benchmarks/bench_bundle.py
+"""Reopening a large extracted corpus: results bundle vs CSV vs the SQLite corpus store.
+
+Run from the repo root:  python benchmarks/bench_bundle.py [ac-rows]
+Every path must give back frames equal to the ones written (CSV is compared after
+restoring the categorical columns, since it keeps no dtypes).
+"""
+import io, os, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from bench_pagination import frames
+from corpus_store import CorpusStore
+from exports import bundle_bytes, csv_bytes, read_bundle
+from parsing_helpers import compact_frame
+
+AC_ROWS = 300_000
+
+def timed(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(n_acs=AC_ROWS):
+    stories, acs = frames(n_acs)
+    print(f"{len(stories):,} stories, {len(acs):,} ACs")
+    print(f"{'format':<8} {'write ms':>9} {'read ms':>9} {'MB':>7}")
+
+    t_write, bundle = timed(lambda: bundle_bytes(stories, acs))
+    t_read, (s_back, ac_back) = timed(lambda: read_bundle(bundle))
+    pd.testing.assert_frame_equal(s_back, stories)
+    pd.testing.assert_frame_equal(ac_back, acs)
+    print(f"{'bundle':<8} {t_write * 1e3:>9.0f} {t_read * 1e3:>9.0f} {len(bundle) / 1e6:>7.1f}")
+
+    t_write, data = timed(lambda: (csv_bytes(stories), csv_bytes(acs)))
+    t_read, (s_back, ac_back) = timed(
+        lambda: tuple(compact_frame(pd.read_csv(io.BytesIO(d), encoding="utf-8-sig", dtype={"Story ID": str, "AC #": str}))
+                      for d in data))
+    pd.testing.assert_frame_equal(ac_back, acs, check_dtype=False, check_categorical=False)
+    print(f"{'csv':<8} {t_write * 1e3:>9.0f} {t_read * 1e3:>9.0f} {sum(map(len, data)) / 1e6:>7.1f}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = CorpusStore(os.path.join(workdir, "corpus.db"))
+        start = time.perf_counter()
+        for name in stories["Source File"].cat.categories:
+            store.upsert_document(name, name, stories[stories["Source File"] == name].drop(columns="Source File"),
+                                  acs[acs["Source File"] == name].drop(columns="Source File"))
+        t_write = time.perf_counter() - start
+        t_read, _ = timed(store.load, repeat=1)
+        size = os.path.getsize(store.path)
+        store.close()
+    print(f"{'sqlite':<8} {t_write * 1e3:>9.0f} {t_read * 1e3:>9.0f} {size / 1e6:>7.1f}")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,72 @@
+# benchmarks/bench_dedup.py
+"""Near-duplicate detection: MinHash/LSH over a whole corpus vs comparing every pair.
+
+Run from the repo root:  python benchmarks/bench_dedup.py [ac-rows]
+Scenarios are random 20-word sentences. One in ten is copied into another file, either
+verbatim or with one word replaced. Recall is measured on those planted pairs and
+against exact all-pairs Jaccard similarity on a sample. All-pairs time is extrapolated
+from the sample, since it grows with the square of the row count.
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from dedup import THRESHOLD, SignatureCache, corpus_signatures, lsh_clusters, shingle_hashes
+
+AC_ROWS = 200_000
+ROWS_PER_FILE = 2_000
+SAMPLE = 2_000
+
+def corpus(n_acs, seed=0):
+    """Scenarios with planted copies; returns the frame and the planted ``(original, copy)`` row pairs."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(2_000)], dtype=object)
+    words = vocab[rng.integers(0, len(vocab), size=(n_acs, 20))]
+    copies = rng.choice(n_acs, size=(n_acs // 10, 2), replace=False)
+    originals, targets = copies[:, 0], copies[:, 1]
+    words[targets] = words[originals]
+    reworded = targets[::2]
+    words[reworded, rng.integers(0, 20, size=len(reworded))] = "changed"
+    frame = pd.DataFrame({"Scenario": [" ".join(w) for w in words],
+                          "Source File": [f"spec_{i // ROWS_PER_FILE:03d}.docx" for i in range(n_acs)]})
+    return frame, originals, targets
+
+def jaccard_pairs(texts, threshold):
+    """Pairs (i < j) whose exact word-bigram Jaccard similarity is at least ``threshold``."""
+    hashes, offsets = shingle_hashes(texts)
+    sets = [set(hashes[offsets[i]:offsets[i + 1]].tolist()) for i in range(len(texts))]
+    return {(i, j) for i in range(len(sets)) for j in range(i + 1, len(sets))
+            if sets[i] and len(sets[i] & sets[j]) / len(sets[i] | sets[j]) >= threshold}
+
+def main(n_acs=AC_ROWS):
+    frame, originals, targets = corpus(n_acs)
+    cache = SignatureCache()
+    start = time.perf_counter()
+    sigs = corpus_signatures(frame, "Scenario", cache)
+    t_sig = time.perf_counter() - start
+    start = time.perf_counter()
+    corpus_signatures(frame, "Scenario", cache)
+    t_cached = time.perf_counter() - start
+    start = time.perf_counter()
+    labels = lsh_clusters(sigs, THRESHOLD)
+    t_lsh = time.perf_counter() - start
+    found = (labels[originals] == labels[targets]).mean()
+    print(f"{n_acs:,} ACs in {n_acs // ROWS_PER_FILE} files, threshold {THRESHOLD}")
+    print(f"{'signatures (first run)':<28} {t_sig:>8.2f} s")
+    print(f"{'signatures (cached)':<28} {t_cached:>8.2f} s")
+    print(f"{'LSH + clustering':<28} {t_lsh:>8.2f} s   planted pairs found: {found:.1%}")
+
+    sample = frame["Scenario"].iloc[np.r_[originals[:SAMPLE // 2], targets[:SAMPLE // 2]]].tolist()
+    start = time.perf_counter()
+    exact = jaccard_pairs(sample, THRESHOLD)
+    t_pairs = time.perf_counter() - start
+    sample_labels = lsh_clusters(corpus_signatures(pd.DataFrame({"Scenario": sample}), "Scenario"), THRESHOLD)
+    recall = np.mean([sample_labels[i] == sample_labels[j] for i, j in exact]) if exact else 1.0
+    full = t_pairs * (n_acs / SAMPLE) ** 2
+    print(f"{'all pairs, sample':<28} {t_pairs:>8.2f} s   {len(exact)} similar pairs, LSH recall {recall:.1%}")
+    print(f"{'all pairs, whole corpus':<28} {full:>8.0f} s   (extrapolated, {full / (t_sig + t_lsh):.0f}x)")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
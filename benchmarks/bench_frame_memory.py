@@ -0,0 +1,61 @@
+# benchmarks/bench_frame_memory.py
+"""Memory footprint of the merged stories / AC frames on a 100-document corpus.
+
+Run from the repo root:  python benchmarks/bench_frame_memory.py [docs] [stories-per-doc]
+"before" rebuilds the previous representation (one row dict per AC, plain string
+columns, ``pd.concat``); "after" is what ``merge_results`` now returns (categorical
+Module / Epic / Story ID / Source File, AC titles as codes into the story titles).
+"""
+import os, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from batch_ingest import merge_results, parse_documents
+from bench_streaming import write_document
+
+N_DOCS = 100
+STORIES_PER_DOC = 100
+
+def legacy_frames(s_df, ac_df):
+    """The per-row-dict frames ``extract_user_stories_and_acs`` used to build."""
+    plain = lambda df: df.astype({c: df[c].cat.categories.dtype for c in df.columns
+                                  if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    return pd.DataFrame(plain(s_df).to_dict("records")), pd.DataFrame(plain(ac_df).to_dict("records"))
+
+def legacy_merge(named_frames):
+    all_stories, all_acs = [], []
+    for name, s_df, ac_df in named_frames:
+        all_stories.append(s_df.assign(**{"Source File": name}))
+        all_acs.append(ac_df.assign(**{"Source File": name}))
+    return pd.concat(all_stories, ignore_index=True), pd.concat(all_acs, ignore_index=True)
+
+def mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+def main(n_docs=N_DOCS, stories_per_doc=STORIES_PER_DOC):
+    with tempfile.TemporaryDirectory() as workdir:
+        docs = []
+        for i in range(n_docs):
+            path = os.path.join(workdir, f"spec_{i:03d}.docx")
+            write_document(path, stories_per_doc)
+            docs.append((os.path.basename(path), path))
+        results = parse_documents(docs, max_workers=1)
+
+    start = time.perf_counter()
+    new_s, new_a = merge_results((r.name, r.stories, r.acs) for r in results)
+    t_new = time.perf_counter() - start
+    legacy = [(r.name, *legacy_frames(r.stories, r.acs)) for r in results]
+    start = time.perf_counter()
+    old_s, old_a = legacy_merge(legacy)
+    t_old = time.perf_counter() - start
+    pd.testing.assert_frame_equal(old_a, legacy_frames(new_s, new_a)[1])
+
+    print(f"{n_docs} docs, {len(new_s)} stories, {len(new_a)} ACs")
+    print(f"{'':>8} {'stories MB':>11} {'ACs MB':>9} {'merge s':>8}")
+    print(f"{'before':>8} {mb(old_s):>11.2f} {mb(old_a):>9.2f} {t_old:>8.3f}")
+    print(f"{'after':>8} {mb(new_s):>11.2f} {mb(new_a):>9.2f} {t_new:>8.3f}")
+    print(f"AC frame {mb(old_a) / mb(new_a):.1f}x smaller, stories {mb(old_s) / mb(new_s):.1f}x smaller")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
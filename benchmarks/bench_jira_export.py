@@ -0,0 +1,54 @@
+# benchmarks/bench_jira_export.py
+"""Throughput of ``jira_export.JiraBulkExporter`` against the local mock Jira.
+
+Run from the repo root:  python benchmarks/bench_jira_export.py [stories] [acs-per-story]
+Each response is delayed by 20 ms and every 15th request is rate-limited (429), so
+the numbers show how bulk batching and concurrency hide round trips. A second run with
+the same idempotency map must create nothing.
+"""
+import os, sys, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from jira_export import IdempotencyMap, JiraBulkExporter, JiraConfig
+from mock_jira import MockJira
+
+STORIES, ACS_PER_STORY = 200, 4
+LATENCY = 0.02
+RUNS = [("one issue per request", 1, 1), ("bulk 50, 1 worker", 50, 1),
+        ("bulk 50, 4 workers", 50, 4), ("bulk 50, 8 workers", 50, 8)]
+
+def frames(n_stories, acs_per_story):
+    stories = pd.DataFrame({
+        "Module": "Payments", "Epic": [f"{i // 25 + 1}: Epic" for i in range(n_stories)],
+        "Story ID": [f"{i // 25 + 1}.{i % 25 + 1}" for i in range(n_stories)],
+        "Story Title": [f"Story title {i}" for i in range(n_stories)],
+        "Acceptance Criteria Count": acs_per_story, "Source File": "spec.docx"})
+    acs = stories.loc[stories.index.repeat(acs_per_story), ["Module", "Epic", "Story ID", "Story Title", "Source File"]]
+    acs = acs.assign(**{"AC #": [str(i % acs_per_story + 1) for i in range(len(acs))],
+                        "Scenario": [f"Given {i} when {i} then {i}" for i in range(len(acs))]})
+    return stories, acs.reset_index(drop=True)
+
+def main(n_stories=STORIES, acs_per_story=ACS_PER_STORY):
+    stories, acs = frames(n_stories, acs_per_story)
+    total = len(stories) + len(acs)
+    print(f"{len(stories)} stories + {len(acs)} ACs = {total} issues, {LATENCY * 1e3:.0f} ms per response")
+    print(f"{'run':<24} {'seconds':>8} {'issues/s':>9} {'requests':>9} {'429s':>5}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, batch, workers in RUNS:
+            with MockJira(latency=LATENCY, rate_limit_every=15) as jira:
+                id_map = IdempotencyMap(os.path.join(workdir, f"map_{batch}_{workers}.json"))
+                config = JiraConfig(jira.url, "DEMO", batch_size=batch, concurrency=workers)
+                report = JiraBulkExporter(config, id_map).export(stories, acs)
+                assert report.created == total and not report.failed, report.failed[:3]
+                assert len(jira.issues) == total
+                print(f"{label:<24} {report.seconds:>8.2f} {report.issues_per_second:>9.0f} "
+                      f"{report.requests:>9} {report.retries:>5}")
+
+                again = JiraBulkExporter(config, IdempotencyMap(id_map.path)).export(stories, acs)
+                assert again.created == 0 and again.skipped == total and again.requests == 0
+    print("re-runs with the same idempotency map created 0 issues")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,66 @@
+# benchmarks/bench_pagination.py
+"""What a results-table rerun costs on a large corpus: whole table vs one server-sorted page.
+
+Run from the repo root:  python benchmarks/bench_pagination.py [ac-rows]
+``st.dataframe`` serializes its frame to Arrow on every rerun; that is timed with
+Streamlit's own converter, for the whole AC frame and for a 500-row page. Paging
+includes sorting the filtered rows by a text column from its precomputed order.
+Payload size matters more than server time: the browser has to receive and render it.
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+from filter_index import ACS, FilterIndex
+from parsing_helpers import compact_frame
+
+AC_ROWS = 300_000
+ACS_PER_STORY = 8
+PAGE_SIZE = 500
+
+def frames(n_acs):
+    rng = np.random.default_rng(0)
+    n_stories = n_acs // ACS_PER_STORY
+    story = np.arange(n_acs) // ACS_PER_STORY
+    ids = np.array([f"{s // 40 + 1}.{s % 40 + 1}" for s in range(n_stories)], dtype=object)
+    files = np.array([f"spec_{s // 400:03d}.docx" for s in range(n_stories)], dtype=object)
+    epics = np.array([f"{s // 40 % 12 + 1}: Epic" for s in range(n_stories)], dtype=object)
+    words = np.array("payment status audit owner trace record change shall system can".split(), dtype=object)
+    scenarios = [" ".join(w) for w in words[rng.integers(0, len(words), size=(n_acs, 8))]]
+    stories = compact_frame(pd.DataFrame({
+        "Module": "Payments", "Epic": epics, "Story ID": ids, "Story Title": [f"Story {s}" for s in range(n_stories)],
+        "Acceptance Criteria Count": ACS_PER_STORY, "Source File": files}))
+    acs = compact_frame(pd.DataFrame({
+        "Module": "Payments", "Epic": epics[story], "Story ID": ids[story],
+        "Story Title": [f"Story {s}" for s in story], "AC #": [str(i % ACS_PER_STORY + 1) for i in range(n_acs)],
+        "Scenario": scenarios, "Source File": files[story]}))
+    return stories, acs
+
+def timed(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(n_acs=AC_ROWS):
+    stories, acs = frames(n_acs)
+    findex = FilterIndex(stories, acs)
+    rows = np.arange(len(acs))
+    print(f"{len(stories):,} stories, {len(acs):,} ACs, page size {PAGE_SIZE}")
+
+    t_full, payload = timed(lambda: convert_pandas_df_to_arrow_bytes(acs))
+    print(f"{'whole table':<30} {t_full * 1e3:>8.1f} ms   {len(payload) / 1e6:>7.1f} MB to the browser")
+    t_order, _ = timed(lambda: findex.sort_order(ACS, "Scenario"), repeat=1)
+    print(f"{'sort order (once per corpus)':<30} {t_order * 1e3:>8.1f} ms")
+    for label, column in (("page, default order", None), ("page, sorted by Scenario", "Scenario")):
+        t_page, payload = timed(lambda: convert_pandas_df_to_arrow_bytes(
+            findex.page(ACS, rows, 10, PAGE_SIZE, column, descending=True)))
+        print(f"{label:<30} {t_page * 1e3:>8.1f} ms   {len(payload) / 1e6:>7.2f} MB   ({t_full / t_page:.0f}x)")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,66 @@
+# benchmarks/bench_revisions.py
+"""Re-parsing a lightly edited revision of a large spec.
+
+Run from the repo root:  python benchmarks/bench_revisions.py [edited-stories]
+A 300-story spec is parsed once, then a revision with a few edited AC tables is
+parsed three ways: from scratch with the python-docx engine, with ``extract_revision``
+and no previous sections, and with the first revision's sections (only the edited
+sections' tables are read). The story / AC diff between the revisions is timed too.
+"""
+import io, os, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+from corpus_gen import CorpusSpec, write_spec_document
+from parsing_helpers import extract_user_stories_and_acs
+from revisions import diff_revisions, extract_revision, reused_sections
+
+EDITED = 5
+SPEC = CorpusSpec(epics=10, stories_per_epic=30, acs_per_table=8, noise_paragraphs=6, noise_tables=0.3)
+
+def best_of(fn, repeat=5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def edit_revision(path, n_edits):
+    """Bytes of ``path`` with the last scenario of ``n_edits`` AC tables, spread over the document, reworded."""
+    doc = Document(path)
+    ac_tables = [t for t in doc.tables if len(t.columns) >= 5]  # noise tables have three columns
+    step = max(1, len(ac_tables) // max(n_edits, 1))
+    for table in ac_tables[::step][:n_edits]:
+        cell = table.rows[-1].cells[1]
+        cell.text = cell.text + " (revised)"
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+def main(n_edits=EDITED):
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "spec.docx")
+        write_spec_document(path, SPEC)
+        _, _, first = extract_revision(path)
+        revised = edit_revision(path, n_edits)
+        print(f"{len(first)} sections, {n_edits} edited tables, {len(revised) / 1e6:.2f} MB")
+
+        t_docx, full = best_of(lambda: extract_user_stories_and_acs(io.BytesIO(revised)))
+        t_cold, _ = best_of(lambda: extract_revision(io.BytesIO(revised)))
+        t_warm, (stories, acs, sections) = best_of(lambda: extract_revision(io.BytesIO(revised), first))
+        assert stories.astype(str).equals(full[0].astype(str)) and acs.astype(str).equals(full[1].astype(str))
+        print(f"{'docx engine':<26} {t_docx * 1e3:>8.1f} ms")
+        print(f"{'revision, no previous':<26} {t_cold * 1e3:>8.1f} ms")
+        print(f"{'revision, with previous':<26} {t_warm * 1e3:>8.1f} ms   "
+              f"({reused_sections(sections, first)} of {len(sections)} sections reused, {t_docx / t_warm:.1f}x)")
+
+        old = extract_user_stories_and_acs(path)
+        t_diff, diff = best_of(lambda: diff_revisions(old, (stories, acs)))
+        counts = diff.counts()
+        print(f"{'diff':<26} {t_diff * 1e3:>8.1f} ms   ({counts['stories']['changed']} stories, "
+              f"{counts['acs']['changed']} ACs changed)")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
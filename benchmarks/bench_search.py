@@ -0,0 +1,42 @@
+# benchmarks/bench_search.py
+"""Query latency of ``search_index.CorpusSearch`` against a ``str.contains`` scan.
+
+Run from the repo root:  python benchmarks/bench_search.py [ac_rows]
+"""
+import os, random, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from search_index import CorpusSearch
+
+AC_ROWS = 500_000
+QUERIES = ("payment", "pay upi", "login checkout refund", "w12", "w1 w2")
+
+def build_frames(n_acs, acs_per_story=10, seed=7):
+    rnd = random.Random(seed)
+    words = [f"w{i}" for i in range(5_000)] + ["payment", "payments", "upi", "login", "checkout", "refund"]
+    ac_df = pd.DataFrame({
+        "Source File": [f"spec_{i // acs_per_story % 100:03d}.docx" for i in range(n_acs)],
+        "Story ID": [str(i // acs_per_story) for i in range(n_acs)],
+        "Scenario": [" ".join(rnd.choices(words, k=8)) for _ in range(n_acs)],
+    })
+    stories_df = ac_df.drop_duplicates(["Source File", "Story ID"]).rename(columns={"Scenario": "Story Title"})
+    return stories_df.reset_index(drop=True), ac_df
+
+def main(n_acs=AC_ROWS):
+    stories_df, ac_df = build_frames(n_acs)
+    start = time.perf_counter()
+    search = CorpusSearch(stories_df, ac_df)
+    print(f"{len(stories_df):,} stories / {n_acs:,} ACs, index built in {time.perf_counter() - start:.2f}s")
+    print(f"{'query':>24} {'AC hits':>9} {'index ms':>9} {'scan ms':>9}")
+    for q in QUERIES:
+        start = time.perf_counter()
+        hits = search.search_acs(q)[0]
+        t_index = time.perf_counter() - start
+        start = time.perf_counter()
+        ac_df["Scenario"].str.contains(q, case=False, regex=False)
+        t_scan = time.perf_counter() - start
+        print(f"{q:>24} {len(hits):>9,} {t_index * 1e3:>9.1f} {t_scan * 1e3:>9.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else AC_ROWS)
@@ -0,0 +1,77 @@
+# benchmarks/bench_shared_cache.py
+"""Loading cached parse results: memory-mapped Arrow cache vs the SQLite corpus store.
+
+Run from the repo root:  python benchmarks/bench_shared_cache.py [ac-rows]
+The synthetic corpus is split into its source documents and stored in both. Every
+document is then read back, first in this process and then by four processes at once
+(several Streamlit replicas on one host). Memory is the Arrow pool growth while
+reading: the mapped files themselves live in the shared OS page cache. Last, the size
+limit is halved to show least-recently-used eviction.
+"""
+import os, sys, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pyarrow as pa
+from bench_pagination import frames
+from corpus_store import CorpusStore
+from shared_cache import ArrowFileCache
+
+AC_ROWS = 300_000
+READERS = 4
+
+def documents(n_acs):
+    stories, acs = frames(n_acs)
+    for name in stories["Source File"].cat.categories:
+        yield (name, stories[stories["Source File"] == name].drop(columns="Source File").reset_index(drop=True),
+               acs[acs["Source File"] == name].drop(columns="Source File").reset_index(drop=True))
+
+def read_all(kind, location, names):
+    """Seconds to read every document, and the Arrow memory pool growth meanwhile."""
+    source = ArrowFileCache(location, max_bytes=1 << 40) if kind == "arrow" else CorpusStore(location)
+    before, start = pa.total_allocated_bytes(), time.perf_counter()
+    held = [source.get(n) if kind == "arrow" else source.document_frames(n) for n in names]
+    assert all(h is not None for h in held)
+    return time.perf_counter() - start, pa.total_allocated_bytes() - before
+
+def main(n_acs=AC_ROWS):
+    docs = list(documents(n_acs))
+    names = [name for name, _, _ in docs]
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = ArrowFileCache(os.path.join(workdir, "cache"), max_bytes=1 << 40)
+        store = CorpusStore(os.path.join(workdir, "corpus.db"))
+        sizes = {}
+        for name, s_df, ac_df in docs:
+            before = cache.stats["bytes"]
+            cache.put(name, s_df, ac_df)
+            sizes[name] = cache.stats["bytes"] - before
+            store.upsert_document(name, name, s_df, ac_df)
+        store.close()
+        locations = {"arrow": cache.directory, "sqlite": store.path}
+        print(f"{len(docs)} documents, {n_acs:,} ACs; cache {cache.stats['bytes'] / 1e6:.1f} MB")
+        print(f"{'backend':<8} {'1 reader s':>11} {'arrow MB':>9} {f'{READERS} readers s':>12}")
+        for kind, location in locations.items():
+            seconds, allocated = read_all(kind, location, names)
+            with ProcessPoolExecutor(READERS) as pool:
+                start = time.perf_counter()
+                list(pool.map(read_all, [kind] * READERS, [location] * READERS, [names] * READERS))
+                parallel = time.perf_counter() - start
+            print(f"{kind:<8} {seconds:>11.3f} {allocated / 1e6:>9.1f} {parallel:>12.3f}")
+
+        cache.max_bytes = cache.stats["bytes"] // 2
+        # read last the newest documents that fit in the halved limit together
+        recent, total = [], 0
+        for name in reversed(names):
+            if total + sizes[name] > cache.max_bytes: break
+            recent.insert(0, name)
+            total += sizes[name]
+        for name in recent:
+            cache.get(name)
+        evicted = cache.evict()
+        assert all(name in cache for name in recent)
+        print(f"limit halved: {evicted} least recently used documents evicted, "
+              f"{cache.stats['bytes'] / 1e6:.1f} MB left, the {len(recent)} most recently read kept")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,96 @@
+# benchmarks/bench_startup.py
+"""Cold-start cost of each page: importing ``ui_components`` and rendering the page once.
+
+Run from the repo root:  python benchmarks/bench_startup.py [--importtime]
+Every page is rendered in a fresh interpreter (Streamlit bare mode, best of ``REPEAT``).
+Streamlit's own cost is paid first and reported separately: ``import streamlit``, then
+a bare-Streamlit ``BASELINE`` page using the same kinds of elements, which pays for
+Streamlit's lazy first-use work (its emoji catalog alone is 40-200 ms, depending on the
+machine). What is left, importing ``ui_components`` and rendering the page, is the cost
+this project controls. The About, User Manual and Jira pages parse nothing, so that cost
+must stay under ``TARGET_MS`` and they must not load any of ``HEAVY``; the script exits
+1 if one fails.
+``--importtime`` prints the slowest imports of the Main page (``python -X importtime``).
+"""
+import os, subprocess, sys, tempfile
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = {"Main": "render_home", "About": "render_about", "User Manual": "render_manual", "Jira": "render_jira"}
+LIGHT_PAGES = ("About", "User Manual", "Jira")
+HEAVY = ("pandas", "numpy", "pyarrow", "docx", "lxml", "requests", "xlsxwriter")
+TARGET_MS = 50
+REPEAT = 3
+
+# one of each element the pages use, emoji included, rendered by Streamlit alone
+BASELINE = """
+import streamlit as st
+st.title("📄 Baseline"); st.markdown("**ok** <div class='x'>ok</div>", unsafe_allow_html=True); st.caption("ok")
+st.info("ℹ️ ok"); st.success("✅ ok"); st.warning("⚠️ ok"); st.error("⚠️ ok"); st.code("ok", language="text")
+with st.expander("ok"): st.toggle("ok", key="_b_toggle")
+with st.form("_b_form"):
+    st.columns(2)[0].text_input("ok", key="_b_text"); st.slider("ok", 1, 9, 5, key="_b_slider")
+    st.form_submit_button("ok")
+st.tabs(["ok"]); st.progress(0.5); st.button("ok", key="_b_button")
+"""
+
+CHILD = """
+import sys, time
+start = time.perf_counter()
+import streamlit
+imported = time.perf_counter()
+exec(compile(sys.argv[2], "baseline", "exec"))
+base = time.perf_counter()
+import ui_components
+loaded = time.perf_counter()
+getattr(ui_components, sys.argv[1])()
+end = time.perf_counter()
+print((imported - start) * 1e3, (base - imported) * 1e3, (loaded - base) * 1e3, (end - loaded) * 1e3,
+      ",".join(m for m in sys.argv[3:] if m in sys.modules))
+"""
+
+def run_page(function, env, importtime=False):
+    """``(import streamlit ms, baseline ms, import ui_components ms, render ms, heavy modules loaded)``."""
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD, function, BASELINE, *HEAVY]
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    if importtime:
+        return out.stderr
+    *times, loaded = out.stdout.split("\n")[-2].split(" ")
+    return (*map(float, times), loaded)
+
+def slowest_imports(stderr, n=12):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, cumulative, name = (p.strip() for p in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:n]
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, PYTHONPATH=ROOT, STORYSTRUCT_DB=os.path.join(workdir, "corpus.db"),
+                   STORYSTRUCT_SHARED_CACHE="off", STORYSTRUCT_JIRA_MAP=os.path.join(workdir, "map.json"))
+        print(f"{'page':<12} {'streamlit ms':>13} {'baseline ms':>12} {'import ms':>10} {'render ms':>10} "
+              f"{'project ms':>11}  heavy modules loaded")
+        failed = []
+        for page, function in PAGES.items():
+            runs = [run_page(function, env) for _ in range(REPEAT)]
+            streamlit_ms, baseline_ms, import_ms, render_ms = (min(r[i] for r in runs) for i in range(4))
+            project_ms = min(r[2] + r[3] for r in runs)
+            loaded = runs[0][4]
+            if page in LIGHT_PAGES and (project_ms > TARGET_MS or loaded):
+                failed.append(page)
+            print(f"{page:<12} {streamlit_ms:>13.0f} {baseline_ms:>12.0f} {import_ms:>10.0f} {render_ms:>10.0f} "
+                  f"{project_ms:>11.0f}  {loaded or '-'}")
+        if "--importtime" in argv:
+            print("\nslowest imports of the Main page (cumulative µs):")
+            for us, name in slowest_imports(run_page(PAGES["Main"], env, importtime=True)):
+                print(f"{us:>10,}  {name}")
+    if failed:
+        print(f"\nProject cost over the {TARGET_MS} ms target or loading heavy modules: {', '.join(failed)}")
+        return 1
+    print(f"\nNon-parsing pages add at most {TARGET_MS} ms to bare Streamlit and load none of {', '.join(HEAVY)}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
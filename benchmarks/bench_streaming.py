@@ -0,0 +1,101 @@
+# benchmarks/bench_streaming.py
+"""Compare the python-docx engine with the iterparse streaming engine.
+
+Run from the repo root:  python benchmarks/bench_streaming.py [stories ...]
+For each size a document is written to a temp dir, both engines parse it in a fresh
+process (so peak RSS is per engine), and their DataFrames are checked for parity.
+"""
+import multiprocessing as mp
+import os, resource, sys, tempfile, time
+from copy import deepcopy
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from docx import Document
+
+SIZES = (200, 2_000, 5_000)
+ENGINES = {
+    "python-docx": ("parsing_helpers", "extract_user_stories_and_acs"),
+    "streaming": ("stream_parser", "extract_user_stories_and_acs_streaming"),
+}
+
+def write_document(path, n_stories, acs_per_story=8):
+    doc = Document()
+    doc.add_paragraph("Module: Benchmarks")
+    first_epic = doc.add_paragraph("Epic 1: Streaming")._p
+    story = doc.add_paragraph("User Story 1.1: Parse a large specification")._p
+    prose = doc.add_paragraph("AS A analyst I WANT large specs parsed SO THAT nothing times out.")._p
+    table = doc.add_table(rows=acs_per_story + 1, cols=3)
+    for i, h in enumerate(("Sr. No", "Scenario", "Acceptance Criteria")):
+        table.cell(0, i).text = h
+    for r in range(1, acs_per_story + 1):
+        for c, v in enumerate((f"1.{r}", f"Scenario {r}", f"Given {r} When {r} Then {r}")):
+            table.cell(r, c).text = v
+    tbl = table._tbl
+    body = doc.element.body
+    sect_pr = body.sectPr
+    for el in (story, prose, tbl, sect_pr):
+        body.remove(el)
+    for i in range(n_stories):
+        if i and i % 25 == 0:
+            epic = deepcopy(first_epic)
+            epic.xpath(".//w:t")[0].text = f"Epic {i // 25 + 1}: Streaming part {i // 25 + 1}"
+            body.append(epic)
+        title = deepcopy(story)
+        title.xpath(".//w:t")[0].text = f"User Story {i // 25 + 1}.{i % 25 + 1}: Parse a large specification, part {i}"
+        body.extend((title, deepcopy(prose), deepcopy(tbl)))
+    body.append(sect_pr)
+    doc.save(path)
+
+def _peak_rss_mb():
+    # VmHWM belongs to the current address space; ru_maxrss survives exec and would
+    # report the parent's high-water mark instead.
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _run_engine(engine, path, out):
+    import importlib
+    module, func = ENGINES[engine]
+    extract = getattr(importlib.import_module(module), func)
+    base_mb = _peak_rss_mb()
+    start = time.perf_counter()
+    stories, acs = extract(path)
+    elapsed = time.perf_counter() - start
+    peak_mb = _peak_rss_mb() - base_mb
+    stories.to_pickle(out + ".stories"); acs.to_pickle(out + ".acs")
+    with open(out, "w") as fh:
+        fh.write(f"{elapsed} {peak_mb}")
+
+def run_isolated(engine, path, workdir):
+    out = os.path.join(workdir, engine)
+    proc = mp.get_context("spawn").Process(target=_run_engine, args=(engine, path, out))
+    proc.start(); proc.join()
+    with open(out) as fh:
+        elapsed, peak_mb = map(float, fh.read().split())
+    return elapsed, peak_mb, pd.read_pickle(out + ".stories"), pd.read_pickle(out + ".acs")
+
+def main(sizes=SIZES):
+    print(f"{'stories':>8} {'MB':>7} {'engine':>12} {'seconds':>9} {'+peak RSS MB':>13}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            path = os.path.join(workdir, f"spec_{n}.docx")
+            write_document(path, n)
+            size_mb = os.path.getsize(path) / 1e6
+            results = {}
+            for engine in ENGINES:
+                elapsed, peak_mb, stories, acs = run_isolated(engine, path, workdir)
+                results[engine] = (stories, acs)
+                print(f"{n:>8,} {size_mb:>7.2f} {engine:>12} {elapsed:>9.3f} {peak_mb:>13.1f}")
+            ref, alt = results.values()
+            pd.testing.assert_frame_equal(ref[0], alt[0])
+            pd.testing.assert_frame_equal(ref[1], alt[1])
+    print("outputs identical for every size")
+
+if __name__ == "__main__":
+    main(tuple(int(a) for a in sys.argv[1:]) or SIZES)
@@ -0,0 +1,59 @@
+# benchmarks/bench_zip_ingest.py
+"""Ingesting a zip bundle of specs: read in place vs unpack to disk first.
+
+Run from the repo root:  python benchmarks/bench_zip_ingest.py [docs]
+"unpack" is the manual workflow: extract every member to a temp directory, then parse
+the files. "in place" feeds archive members to the parser one at a time. Both must
+give identical frames. Peak memory compares reading the members one at a time with
+loading them all at once (Python's traced allocations, reading only, no parsing).
+"""
+import os, sys, tempfile, time, tracemalloc, zipfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from batch_ingest import ingest_documents, iter_archive
+from corpus_gen import CorpusSpec, write_corpus
+
+DOCS = 100
+SPEC = CorpusSpec(epics=4, stories_per_epic=20, acs_per_table=6, noise_paragraphs=4)
+
+def peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main(n_docs=DOCS):
+    with tempfile.TemporaryDirectory() as workdir:
+        archive = os.path.join(workdir, "specs.zip")
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            for path, _ in write_corpus(os.path.join(workdir, "src"), n_docs, SPEC):
+                zf.write(path, f"specs/{os.path.basename(path)}")
+        print(f"{n_docs} documents, archive {os.path.getsize(archive) / 1e6:.1f} MB")
+
+        def unpack():
+            out = tempfile.mkdtemp(dir=workdir)
+            with zipfile.ZipFile(archive) as zf:
+                zf.extractall(out)
+                return [(f"specs.zip/{name}", os.path.join(out, name)) for name in zf.namelist()]
+        start = time.perf_counter()
+        s_disk, ac_disk, _ = ingest_documents(unpack())
+        t_disk = time.perf_counter() - start
+        start = time.perf_counter()
+        s_zip, ac_zip, _ = ingest_documents(iter_archive(archive, "specs.zip"))
+        t_zip = time.perf_counter() - start
+        pd.testing.assert_frame_equal(s_zip, s_disk)
+        pd.testing.assert_frame_equal(ac_zip, ac_disk)
+
+        whole = peak_bytes(lambda: [zipfile.ZipFile(archive).read(n) for n in zipfile.ZipFile(archive).namelist()])
+        streamed = peak_bytes(lambda: [len(data) for _, data in iter_archive(archive, "specs.zip")])
+        print(f"parse, unpacked to disk   {t_disk:>6.2f} s   ({n_docs} temp files)")
+        print(f"parse, read in place      {t_zip:>6.2f} s")
+        print(f"read peak, all members    {whole / 1e6:>6.2f} MB")
+        print(f"read peak, one at a time  {streamed / 1e6:>6.2f} MB")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,193 @@
+# benchmarks/corpus_gen.py
+"""Synthetic requirement documents in the format the parser expects.
+
+Each document follows the layout from the User Manual: a ``Module:`` line, ``Epic N:``
+headings, ``User Story N.M:`` headings and an AC table per story. AC tables cycle
+through the header spellings in ``HEADER_ALIASES`` (``Sr. No`` / ``AC #`` / ``ID``...,
+``Scenario`` or a free-text ``Acceptance Criteria`` column, ``Given``/``Precondition``
+...), and can carry horizontally and vertically merged cells. Prose paragraphs and
+non-AC tables can be mixed in as noise. ``headings`` switches the Epic and Story headings
+to Word heading styles (``styles``: Heading 1 / Heading 2 paragraphs without numbers) or
+Gherkin text (``gherkin``: ``Feature:`` / ``Scenario:``), for the matching parser grammars.
+
+    python benchmarks/corpus_gen.py corpus/ --docs 20 --epics 4 --stories-per-epic 25
+
+Bodies are written as raw WordprocessingML into a python-docx template, so even
+100k-paragraph documents are generated in seconds.
+"""
+import argparse
+import os
+import random
+from dataclasses import asdict, dataclass
+from xml.sax.saxutils import escape
+
+from docx import Document
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+AC_NO_HEADERS = ["Sr. No", "AC #", "ID", "No", "S No", "SNo", "AC No", "AC Number", "#"]
+TEXT_HEADERS = ["Scenario", "Scenario", "Acceptance Criteria", "Criteria"]
+GIVEN_HEADERS = ["Given", "Precondition"]
+WHEN_HEADERS = ["When", "Action"]
+EXPECTED_HEADERS = ["Expected Result", "Expected", "Result", None]
+STORY_FORMATS = ["User Story {id}: {title}", "Story {id} - {title}", "User Story {id} – {title}"]
+EPIC_FORMATS = ["Epic {n}: {title}", "Epic {n} - {title}", "Epic {n} — {title}"]
+SCENARIO_FORMATS = ["Scenario: {title}", "Scenario Outline: {title}", "Scenario:{title}"]
+HEADING_MODES = ("text", "styles", "gherkin")
+NOISE_TABLE_HEADERS = ["Field", "Type", "Description"]
+WORDS = ("the system shall record every payment request with its status and owner so that "
+         "auditors can trace each change back to the original specification document").split()
+
+@dataclass
+class CorpusSpec:
+    epics: int = 3
+    stories_per_epic: int = 10
+    acs_per_table: int = 8
+    ac_tables_per_story: int = 1
+    noise_paragraphs: int = 3     # prose paragraphs after each story heading
+    noise_tables: float = 0.1     # share of stories followed by a non-AC table
+    merged_cells: bool = True
+    seed: int = 0
+    headings: str = "text"        # one of HEADING_MODES
+
+# -------- WordprocessingML snippets --------
+def _p(text, style=None):
+    props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f'<w:p>{props}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+def _tc(text, span=1, vmerge=None):
+    props = (f'<w:gridSpan w:val="{span}"/>' if span > 1 else "") + \
+        (f'<w:vMerge w:val="{vmerge}"/>' if vmerge == "restart" else "<w:vMerge/>" if vmerge else "")
+    return f"<w:tc><w:tcPr>{props}</w:tcPr>{_p(text)}</w:tc>"
+
+def _table(rows, n_cols):
+    """``rows`` are lists of ``(text, span, vmerge)`` cells."""
+    grid = "".join('<w:gridCol w:w="1400"/>' for _ in range(n_cols))
+    body = "".join("<w:tr>" + "".join(_tc(*cell) for cell in row) + "</w:tr>" for row in rows)
+    return f'<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>{body}</w:tbl>'
+
+def _sentence(rng, n_words=14):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+def ac_table(rng, variant, story_id, n_acs, merged):
+    """XML for one AC table and the ``(AC #, Scenario)`` pairs the parser should extract."""
+    headers = [AC_NO_HEADERS[variant % len(AC_NO_HEADERS)], TEXT_HEADERS[variant % len(TEXT_HEADERS)],
+               GIVEN_HEADERS[variant % 2], WHEN_HEADERS[variant % 2], "Then"]
+    expected_header = EXPECTED_HEADERS[variant % len(EXPECTED_HEADERS)]
+    if expected_header: headers.append(expected_header)
+    n_cols = len(headers)
+    rows = [[(h, 1, None) for h in headers]]
+    if variant % 5 == 4:  # blank spacer row under the header
+        rows.append([("", 1, None)] * n_cols)
+    expected = []
+    for i in range(1, n_acs + 1):
+        ac_no, scenario = f"{story_id}.{i}", f"Scenario {i}: {_sentence(rng, 8)}"
+        expected.append((ac_no, scenario))
+        given = (f"Given precondition {i}", 1, None)
+        if merged and i > 1 and i % 3 != 1:  # Given column merged down in runs of three
+            given = ("", 1, "continue")
+        elif merged and i % 3 == 1 and i < n_acs:
+            given = (given[0], 1, "restart")
+        row = [(ac_no, 1, None), (scenario, 1, None), given, (f"When action {i}", 1, None)]
+        if expected_header and merged and i % 4 == 0:  # Then + Expected merged across
+            row.append((f"Then outcome {i}", 2, None))
+        else:
+            row.append((f"Then outcome {i}", 1, None))
+            if expected_header: row.append((f"Expected result {i}", 1, None))
+        rows.append(row)
+    return _table(rows, n_cols), expected
+
+def noise_table(rng):
+    rows = [[(h, 1, None) for h in NOISE_TABLE_HEADERS]]
+    rows += [[(f"field_{i}", 1, None), ("string", 1, None), (_sentence(rng, 6), 1, None)] for i in range(4)]
+    return _table(rows, len(NOISE_TABLE_HEADERS))
+
+# -------- Documents --------
+def document_body(spec, module="Payments", seed=None):
+    """``(xml_blocks, expected)`` for one document; ``expected`` lists stories with their ACs."""
+    rng = random.Random(spec.seed if seed is None else seed)
+    blocks = [_p(f"{module} Requirements Specification"), _p(f"Module: {module}"), _p(_sentence(rng))]
+    expected, variant = [], 0
+    for e in range(1, spec.epics + 1):
+        epic_title = f"{module} capability {e}"
+        if spec.headings == "styles":
+            blocks.append(_p(epic_title, "Heading1"))
+        elif spec.headings == "gherkin":
+            blocks.append(_p(f"Feature: {epic_title}"))
+        else:
+            blocks.append(_p(EPIC_FORMATS[e % len(EPIC_FORMATS)].format(n=e, title=epic_title)))
+        blocks.append(_p(_sentence(rng)))
+        for s in range(1, spec.stories_per_epic + 1):
+            story_id, title = f"{e}.{s}", f"{module} story {e}.{s}: {_sentence(rng, 5)[:-1]}"
+            # styled and Gherkin headings carry no number: the parser numbers them e.s in order
+            if spec.headings == "styles":
+                blocks.append(_p(title, "Heading2"))
+            elif spec.headings == "gherkin":
+                blocks.append(_p(SCENARIO_FORMATS[s % len(SCENARIO_FORMATS)].format(title=title)))
+            else:
+                blocks.append(_p(STORY_FORMATS[s % len(STORY_FORMATS)].format(id=story_id, title=title)))
+            blocks.extend(_p(_sentence(rng)) for _ in range(spec.noise_paragraphs))
+            acs = []
+            for _ in range(spec.ac_tables_per_story):
+                xml, rows = ac_table(rng, variant, story_id, spec.acs_per_table, spec.merged_cells)
+                blocks.append(xml)
+                acs.extend(rows)
+                variant += 1
+            if rng.random() < spec.noise_tables:
+                blocks.append(noise_table(rng))
+            expected.append({"Epic": f"{e}: {epic_title}", "Story ID": story_id,
+                             "Story Title": title, "ACs": acs})
+    return blocks, expected
+
+def write_spec_document(path, spec=CorpusSpec(), module="Payments", seed=None):
+    """Write one synthetic .docx to ``path`` and return its expected stories (see ``document_body``)."""
+    blocks, expected = document_body(spec, module, seed)
+    doc = Document()
+    body = doc.element.body
+    sect_pr = body.sectPr
+    body.remove(sect_pr)
+    fragment = etree.fromstring(f'<w:body xmlns:w="{W_NS}">{"".join(blocks)}</w:body>')
+    body.extend(list(fragment))
+    body.append(sect_pr)
+    doc.save(path)
+    return expected
+
+def write_corpus(directory, n_docs, spec=CorpusSpec()):
+    """Write ``n_docs`` documents (one Module each) and return ``[(path, expected), ...]``."""
+    os.makedirs(directory, exist_ok=True)
+    out = []
+    for i in range(n_docs):
+        path = os.path.join(directory, f"spec_{i:04d}.docx")
+        out.append((path, write_spec_document(path, spec, module=f"Module {i % 7}", seed=spec.seed + i)))
+    return out
+
+def add_spec_arguments(parser):
+    defaults = CorpusSpec()
+    parser.add_argument("--epics", type=int, default=defaults.epics)
+    parser.add_argument("--stories-per-epic", type=int, default=defaults.stories_per_epic)
+    parser.add_argument("--acs-per-table", type=int, default=defaults.acs_per_table)
+    parser.add_argument("--ac-tables-per-story", type=int, default=defaults.ac_tables_per_story)
+    parser.add_argument("--noise-paragraphs", type=int, default=defaults.noise_paragraphs)
+    parser.add_argument("--noise-tables", type=float, default=defaults.noise_tables)
+    parser.add_argument("--no-merged-cells", dest="merged_cells", action="store_false")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--headings", choices=HEADING_MODES, default=defaults.headings,
+                        help="text = 'Epic 1:' / 'User Story 1.1:', styles = Heading 1/2, gherkin = Feature/Scenario")
+
+def spec_from_args(args):
+    return CorpusSpec(**{k: getattr(args, k) for k in asdict(CorpusSpec())})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic corpus of requirement .docx files.")
+    parser.add_argument("directory")
+    parser.add_argument("--docs", type=int, default=10)
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+    docs = write_corpus(args.directory, args.docs, spec_from_args(args))
+    n_stories = sum(len(expected) for _, expected in docs)
+    n_acs = sum(len(s["ACs"]) for _, expected in docs for s in expected)
+    print(f"Wrote {len(docs)} docs ({n_stories} stories, {n_acs} ACs) to {os.path.abspath(args.directory)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/mock_jira.py
+"""Local stand-in for Jira's bulk issue endpoint, for exercising ``jira_export``.
+
+    with MockJira(latency=0.02, rate_limit_every=10) as jira:
+        JiraBulkExporter(JiraConfig(jira.url, "DEMO")).export(stories_df, ac_df)
+
+Implements ``POST /rest/api/2/issue/bulk`` with Jira's response shape: created issues
+in ``issues``, per-element failures in ``errors`` (HTTP 201, or 400 if nothing was
+created). Sub-tasks must name an existing parent and every issue needs a summary.
+``latency`` delays each response; every ``rate_limit_every``-th request is answered
+with 429 and ``Retry-After: <retry_after>``.
+"""
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MockJira:
+    def __init__(self, latency=0.0, rate_limit_every=0, retry_after="0.05", max_bulk=50):
+        self.latency, self.rate_limit_every, self.retry_after = latency, rate_limit_every, retry_after
+        self.max_bulk = max_bulk
+        self.issues = {}          # key -> fields
+        self.requests = 0
+        self.rate_limited = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _bulk(self, updates):
+        issues, errors = [], []
+        for i, update in enumerate(updates):
+            fields = update.get("fields", {})
+            parent = fields.get("parent", {}).get("key")
+            problem = None
+            if not fields.get("summary"):
+                problem = {"summary": "You must specify a summary of the issue."}
+            elif parent is not None and parent not in self.issues:
+                problem = {"parent": f"Could not find issue by id or key: {parent}"}
+            if problem:
+                errors.append({"status": 400, "elementErrors": {"errors": problem}, "failedElementNumber": i})
+                continue
+            n = next(self._ids)
+            key = f"{fields.get('project', {}).get('key', 'MOCK')}-{n}"
+            self.issues[key] = fields
+            issues.append({"id": str(n), "key": key, "self": f"{self.url}/rest/api/2/issue/{n}"})
+        return issues, errors
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+            wbufsize = 1 << 16  # headers and body leave in one write
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, headers=()):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path != "/rest/api/2/issue/bulk":
+                    return self._reply(404, {"errorMessages": ["Not found"]})
+                if mock.latency:
+                    time.sleep(mock.latency)
+                with mock._lock:
+                    mock.requests += 1
+                    limited = mock.rate_limit_every and mock.requests % mock.rate_limit_every == 0
+                    if limited:
+                        mock.rate_limited += 1
+                    else:
+                        updates = payload.get("issueUpdates", [])
+                        if len(updates) > mock.max_bulk:
+                            return self._reply(400, {"errorMessages": [f"at most {mock.max_bulk} issues per request"]})
+                        issues, errors = mock._bulk(updates)
+                if limited:
+                    return self._reply(429, {"errorMessages": ["Rate limit exceeded"]},
+                                       [("Retry-After", mock.retry_after)])
+                self._reply(201 if issues or not errors else 400, {"issues": issues, "errors": errors})
+
+        return Handler
@@ -0,0 +1,157 @@
+# benchmarks/run_suite.py
+"""End-to-end benchmark suite with baseline regression checks.
+
+Run from the repo root:
+    python benchmarks/run_suite.py --save-baseline     # record benchmarks/results/baseline.json
+    python benchmarks/run_suite.py                     # compare against it; exit 1 on regression
+
+A synthetic corpus (see ``corpus_gen``) is parsed with both engines, then the step-2
+pipeline is timed on the result: merging, building the search and filter indexes,
+filtered views for every Epic and File, the CSV / Excel / Parquet exports and reopening
+a results bundle (which must round-trip the frames exactly), and near-duplicate
+detection over all AC scenarios (signatures plus clustering). Each case
+reports its best time over ``--repeat`` runs. Results are written as JSON, and a
+case counts as a regression when it is slower than the baseline by more than
+``--threshold``.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_ingest import merge_results
+from dedup import corpus_signatures, duplicate_clusters
+from corpus_gen import add_spec_arguments, spec_from_args, write_corpus
+import pandas as pd
+from exports import bundle_bytes, csv_bytes, excel_bytes, parquet_bytes, read_bundle
+from filter_index import FilterIndex
+from parsing_helpers import extract_user_stories_and_acs
+from search_index import CorpusSearch
+from stream_parser import extract_user_stories_and_acs_streaming
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+QUERIES = ("payment status", "audit", "scen", "request owner trace")
+
+def best_of(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def check_counts(docs, parsed):
+    for (path, expected), (s_df, ac_df) in zip(docs, parsed):
+        n_acs = sum(len(s["ACs"]) for s in expected)
+        if len(s_df) != len(expected) or len(ac_df) != n_acs:
+            raise SystemExit(f"{path}: parsed {len(s_df)} stories / {len(ac_df)} ACs, "
+                             f"expected {len(expected)} / {n_acs}")
+
+def run_cases(docs, repeat):
+    """``{case: seconds}`` for every stage of the pipeline."""
+    results = {}
+    paths = [p for p, _ in docs]
+    for case, extract in (("extract.docx", extract_user_stories_and_acs),
+                          ("extract.stream", extract_user_stories_and_acs_streaming)):
+        results[case], parsed = best_of(lambda: [extract(p) for p in paths], repeat)
+        check_counts(docs, parsed)
+
+    named = [(os.path.basename(p), s_df, ac_df) for p, (s_df, ac_df) in zip(paths, parsed)]
+    results["merge"], (stories_df, ac_df) = best_of(lambda: merge_results(named), repeat)
+    results["index.search"], search = best_of(lambda: CorpusSearch(stories_df, ac_df), repeat)
+    results["index.filter"], findex = best_of(lambda: FilterIndex(stories_df, ac_df), repeat)
+
+    def filter_all():
+        views = 0
+        for column in ("Epic", "Source File"):
+            for value in findex.options(column):
+                findex.ac_rows(findex.story_rows(**{column: value}))
+                views += 1
+        return views
+    results["filter.views"], _ = best_of(filter_all, repeat)
+    results["search.queries"], _ = best_of(lambda: [search.story_rank(q) for q in QUERIES], repeat)
+    results["export.csv"], _ = best_of(lambda: (csv_bytes(stories_df), csv_bytes(ac_df)), repeat)
+    results["export.xlsx"], _ = best_of(lambda: (excel_bytes(stories_df, "Stories"),
+                                                 excel_bytes(ac_df, "Acceptance Criteria")), repeat)
+    results["export.parquet"], _ = best_of(lambda: (parquet_bytes(stories_df), parquet_bytes(ac_df)), repeat)
+    bundle = bundle_bytes(stories_df, ac_df)
+    results["import.bundle"], (s_back, ac_back) = best_of(lambda: read_bundle(bundle), repeat)
+    pd.testing.assert_frame_equal(s_back, stories_df)
+    pd.testing.assert_frame_equal(ac_back, ac_df)
+    results["dedup.acs"], _ = best_of(lambda: duplicate_clusters(ac_df, corpus_signatures(ac_df, "Scenario")), repeat)
+    return results, len(stories_df), len(ac_df)
+
+def compare(results, baseline, threshold):
+    """Print a comparison table and return the names of regressed cases."""
+    regressions = []
+    print(f"{'case':<16} {'seconds':>9} {'baseline':>9} {'ratio':>7}")
+    for case, seconds in results.items():
+        base = baseline.get(case)
+        if base is None:
+            print(f"{case:<16} {seconds:>9.4f} {'-':>9} {'-':>7}")
+            continue
+        ratio = seconds / base if base > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(case)
+            flag = "  REGRESSION"
+        print(f"{case:<16} {seconds:>9.4f} {base:>9.4f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction, filtering and exports on a synthetic corpus.")
+    parser.add_argument("--docs", type=int, default=20)
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best is kept (default: %(default)s)")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline as well")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown over the baseline before a case is flagged (default: %(default)s)")
+    args = parser.parse_args(argv)
+    spec = spec_from_args(args)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        docs = write_corpus(workdir, args.docs, spec)
+        corpus_mb = sum(os.path.getsize(p) for p, _ in docs) / 1e6
+        results, n_stories, n_acs = run_cases(docs, args.repeat)
+
+    report = {
+        "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                 "platform": platform.platform(), "cpus": os.cpu_count(), "docs": args.docs,
+                 "corpus_mb": round(corpus_mb, 2), "stories": n_stories, "acs": n_acs, "spec": asdict(spec)},
+        "results": results,
+    }
+    print(f"{args.docs} docs ({corpus_mb:.1f} MB), {n_stories} stories, {n_acs} ACs, best of {args.repeat}")
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        compare(results, {}, args.threshold)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if baseline["meta"].get("spec") != report["meta"]["spec"] or baseline["meta"].get("docs") != args.docs:
+            print("warning: baseline was recorded with a different corpus shape", file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.threshold)
+    else:
+        compare(results, {}, args.threshold)
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# sections/corpus_store.py
+"""Persistent SQLite store of extracted stories and ACs, keyed by document hash.
+
+Parsed documents survive app restarts: an upload whose bytes were seen before is read
+back from the store instead of being parsed again, and a user's saved corpus can be
+opened without any .docx at hand.
+
+Parse results are shared by hash (whoever has a document's bytes may read its frames),
+but every document is also linked to the owners who saved it, and ``load``,
+``documents`` and ``len`` only see the store's own ``owner``. Removing a document
+unlinks it from that owner; it is deleted once no owner is left. At most
+``max_documents`` documents are kept, the least recently saved going first.
+"""
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from parsing_helpers import AC_COLUMNS, PARSER_VERSION, STORY_COLUMNS, compact_frame
+
+DEFAULT_DB_PATH = os.environ.get("STORYSTRUCT_DB", "storystruct.db")
+DEFAULT_MAX_DOCUMENTS = int(os.environ.get("STORYSTRUCT_DB_MAX_DOCS", "1000"))
+
+# DataFrame column -> SQL column
+_STORY_SQL = {"Module": "module", "Epic": "epic", "Story ID": "story_id", "Story Title": "story_title",
+              "Acceptance Criteria Count": "ac_count"}
+_AC_SQL = {"Module": "module", "Epic": "epic", "Story ID": "story_id", "Story Title": "story_title",
+           "AC #": "ac_no", "Scenario": "scenario"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_hash       TEXT PRIMARY KEY,
+    source_file    TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    story_count    INTEGER NOT NULL,
+    ac_count       INTEGER NOT NULL,
+    ingested_at    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document_owners (
+    doc_hash TEXT NOT NULL REFERENCES documents(doc_hash) ON DELETE CASCADE,
+    owner    TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (owner, doc_hash)
+);
+CREATE TABLE IF NOT EXISTS stories (
+    doc_hash    TEXT NOT NULL REFERENCES documents(doc_hash) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    source_file TEXT NOT NULL,
+    module TEXT, epic TEXT, story_id TEXT, story_title TEXT, ac_count INTEGER,
+    PRIMARY KEY (doc_hash, seq)
+);
+CREATE TABLE IF NOT EXISTS acs (
+    doc_hash    TEXT NOT NULL REFERENCES documents(doc_hash) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    source_file TEXT NOT NULL,
+    module TEXT, epic TEXT, story_id TEXT, story_title TEXT, ac_no TEXT, scenario TEXT,
+    PRIMARY KEY (doc_hash, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_document_owners_hash ON document_owners(doc_hash);
+"""
+
+class CorpusStore:
+    def __init__(self, path=DEFAULT_DB_PATH, owner="", max_documents=DEFAULT_MAX_DOCUMENTS):
+        self.path = path
+        self.owner = owner
+        self.max_documents = max_documents
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    # -------- Documents --------
+    def has_document(self, doc_hash) -> bool:
+        row = self._conn.execute("SELECT 1 FROM documents WHERE doc_hash = ? AND parser_version = ?",
+                                 (doc_hash, PARSER_VERSION)).fetchone()
+        return row is not None
+
+    def documents(self) -> pd.DataFrame:
+        """This owner's documents, in the order they were saved."""
+        return pd.read_sql_query(
+            "SELECT d.source_file AS 'Source File', d.doc_hash AS 'Hash', d.story_count AS 'Stories', "
+            "d.ac_count AS 'ACs', o.saved_at AS 'Saved' FROM documents d "
+            "JOIN document_owners o ON o.doc_hash = d.doc_hash WHERE o.owner = ? ORDER BY o.saved_at, d.rowid",
+            self._conn, params=[self.owner])
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM document_owners WHERE owner = ?", (self.owner,)).fetchone()[0]
+
+    def upsert_document(self, doc_hash, source_file, stories_df, ac_df, replaces=()):
+        """Store one document for this owner, replacing what was stored for ``doc_hash``.
+
+        ``replaces`` names the older revisions this document supersedes; they are removed
+        for this owner. Other documents are kept even when they share ``source_file``
+        (same-named files from different folders, or the same file parsed under another grammar).
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.execute("DELETE FROM stories WHERE doc_hash = ?", (doc_hash,))
+            self._conn.execute("DELETE FROM acs WHERE doc_hash = ?", (doc_hash,))
+            # REPLACE would delete the row and, through the foreign keys, its owner links
+            self._conn.execute(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(doc_hash) DO UPDATE SET "
+                "source_file = excluded.source_file, parser_version = excluded.parser_version, "
+                "story_count = excluded.story_count, ac_count = excluded.ac_count, ingested_at = excluded.ingested_at",
+                (doc_hash, source_file, PARSER_VERSION, len(stories_df), len(ac_df), now))
+            self._conn.execute("INSERT OR REPLACE INTO document_owners VALUES (?, ?, ?)", (doc_hash, self.owner, now))
+            self._insert_rows("stories", _STORY_SQL, doc_hash, source_file, stories_df)
+            self._insert_rows("acs", _AC_SQL, doc_hash, source_file, ac_df)
+            self._unlink([h for h in replaces if h != doc_hash])
+            self._evict()
+
+    def _insert_rows(self, table, mapping, doc_hash, source_file, df):
+        if df.empty: return
+        cols = list(mapping)
+        rows = ((doc_hash, seq, source_file, *values)
+                for seq, values in enumerate(df[cols].itertuples(index=False, name=None)))
+        placeholders = ", ".join("?" * (len(cols) + 3))
+        self._conn.executemany(
+            f"INSERT INTO {table} (doc_hash, seq, source_file, {', '.join(mapping.values())}) VALUES ({placeholders})",
+            rows)
+
+    def _unlink(self, hashes):
+        """Remove ``hashes`` from this owner's corpus and delete the documents nobody owns any more."""
+        if not hashes: return
+        marks = ", ".join("?" * len(hashes))
+        self._conn.execute(f"DELETE FROM document_owners WHERE owner = ? AND doc_hash IN ({marks})",
+                           [self.owner, *hashes])
+        self._conn.execute(f"DELETE FROM documents WHERE doc_hash IN ({marks}) AND doc_hash NOT IN "
+                           f"(SELECT doc_hash FROM document_owners)", list(hashes))
+
+    def _evict(self):
+        """Delete the least recently saved documents beyond ``max_documents``, for every owner."""
+        if self.max_documents is None: return
+        self._conn.execute(
+            "DELETE FROM documents WHERE doc_hash IN (SELECT doc_hash FROM documents "
+            "ORDER BY ingested_at DESC, rowid DESC LIMIT -1 OFFSET ?)", (self.max_documents,))
+
+    def link_document(self, doc_hash) -> bool:
+        """Add an already stored document to this owner's corpus; ``False`` if it is not stored."""
+        with self._conn:
+            cur = self._conn.execute("INSERT OR REPLACE INTO document_owners SELECT doc_hash, ?, ? FROM documents "
+                                     "WHERE doc_hash = ? AND parser_version = ?",
+                                     (self.owner, time.time(), doc_hash, PARSER_VERSION))
+        return cur.rowcount > 0
+
+    def remove_document(self, doc_hash):
+        """Remove one document from this owner's corpus."""
+        with self._conn:
+            self._unlink([doc_hash])
+
+    def document_frames(self, doc_hash):
+        """``(stories_df, ac_df)`` for one document, shaped like ``extract_user_stories_and_acs`` output."""
+        stories = self._query("stories", _STORY_SQL, "WHERE t.doc_hash = ?", [doc_hash])
+        acs = self._query("acs", _AC_SQL, "WHERE t.doc_hash = ?", [doc_hash])
+        if stories.empty and acs.empty:
+            return pd.DataFrame(columns=STORY_COLUMNS), pd.DataFrame(columns=AC_COLUMNS)
+        return stories, acs
+
+    # -------- Corpus --------
+    def _query(self, table, mapping, where="", params=(), with_source=False):
+        select = [f"t.{sql} AS \"{col}\"" for col, sql in mapping.items()]
+        if with_source:
+            select.append("t.source_file AS \"Source File\"")
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(select)} FROM {table} t JOIN documents d ON d.doc_hash = t.doc_hash "
+            f"{where} ORDER BY d.rowid, t.seq",
+            self._conn, params=list(params))
+        if "Acceptance Criteria Count" in df:
+            df["Acceptance Criteria Count"] = df["Acceptance Criteria Count"].astype("int64")
+        return compact_frame(df)
+
+    def load(self):
+        """``(stories_df, ac_df)`` of this owner's whole corpus, with ``Source File``."""
+        where = "JOIN document_owners o ON o.doc_hash = t.doc_hash WHERE o.owner = ?"
+        return (self._query("stories", _STORY_SQL, where, [self.owner], with_source=True),
+                self._query("acs", _AC_SQL, where, [self.owner], with_source=True))
+
+def open_corpus_store(owner, path=None):
+    """Corpus store at ``path`` (default: ``$STORYSTRUCT_DB``) seen as ``owner``.
+
+    ``STORYSTRUCT_DB=off`` keeps the store in memory, so nothing is written to disk and
+    nothing outlives the session.
+    """
+    path = DEFAULT_DB_PATH if path is None else path
+    return CorpusStore(":memory:" if path.lower() == "off" else path, owner=owner)
@@ -0,0 +1,194 @@
+# sections/dedup.py
+"""Near-duplicate stories and ACs across the corpus, with MinHash signatures and LSH.
+
+Each text (a Story Title or a Scenario) is reduced to its word bigrams, hashed
+stably (CRC-32 per word, so signatures mean the same thing in every process).
+``NUM_PERM`` multiply-shift hash functions then turn it into a MinHash signature,
+computed for large batches of rows at once with numpy. The fraction of equal
+signature slots estimates the Jaccard similarity of two texts' bigram sets.
+
+LSH splits signatures into ``BANDS`` bands; rows that agree on a whole band land in
+the same bucket. Each bucket member is compared with the bucket's first row, and
+pairs at or above the threshold are joined into clusters (connected components), so
+no all-pairs comparison is ever made. Signatures are cached per document, keyed by a
+fingerprint of its texts, and only new documents are hashed again.
+"""
+import hashlib
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from search_index import tokenize
+
+NUM_PERM = 64
+BANDS = 16                 # 16 bands of 4 rows: pairs at 0.7 similarity collide in some band 99% of the time
+THRESHOLD = 0.7
+EMPTY = np.uint32(0xFFFFFFFF)  # signature of a text without words; never clustered
+_BATCH_SHINGLES = 1 << 17
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd multipliers
+_B = _rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+
+@lru_cache(maxsize=1 << 16)
+def _word_hash(word):
+    return zlib.crc32(word.encode("utf-8"))
+
+def shingle_hashes(texts):
+    """``(hashes, offsets)``: uint64 word-bigram hashes of every text, text ``i`` owning
+    ``hashes[offsets[i]:offsets[i + 1]]``. A one-word text is its single word."""
+    words, lengths = [], []
+    for text in texts:
+        tokens = tokenize(text) if isinstance(text, str) else []
+        words.extend(map(_word_hash, tokens))
+        lengths.append(len(tokens))
+    tok = np.fromiter(words, dtype=np.uint64, count=len(words))
+    lengths = np.asarray(lengths, dtype=np.int64)
+    ends = np.cumsum(lengths)
+    is_last = np.zeros(len(tok), dtype=bool)
+    is_last[ends[lengths > 0] - 1] = True
+    keep = ~is_last
+    keep[ends[lengths == 1] - 1] = True
+    with np.errstate(over="ignore"):
+        pairs = tok * _MIX + np.roll(tok, -1)
+    hashes = np.where(is_last, tok, pairs)[keep]
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(np.maximum(lengths - 1, lengths > 0), out=offsets[1:])
+    return hashes, offsets
+
+def minhash(texts):
+    """``(len(texts), NUM_PERM)`` uint32 MinHash signatures; rows without words are all ``EMPTY``."""
+    hashes, offsets = shingle_hashes(texts)
+    n = len(offsets) - 1
+    sigs = np.full((n, NUM_PERM), EMPTY, dtype=np.uint32)
+    start = 0
+    while start < n:
+        # rows whose shingles fit in one batch (always at least one row)
+        stop = max(start + 1, int(np.searchsorted(offsets, offsets[start] + _BATCH_SHINGLES, side="right")) - 1)
+        stop = min(stop, n)
+        lo = offsets[start]
+        x = hashes[lo:offsets[stop]]
+        rows = np.arange(start, stop)[offsets[start + 1:stop + 1] > offsets[start:stop]]
+        if len(rows):
+            with np.errstate(over="ignore"):
+                values = ((_A[:, None] * x[None, :] + _B[:, None]) >> np.uint64(32)).astype(np.uint32)
+            sigs[rows] = np.minimum.reduceat(values, offsets[rows] - lo, axis=1).T
+        start = stop
+    return sigs
+
+def text_fingerprint(texts):
+    h = hashlib.blake2b(digest_size=16)
+    for text in texts:
+        h.update(text.encode("utf-8") if isinstance(text, str) else b"\x00")
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+class SignatureCache:
+    """LRU map of ``text fingerprint -> signatures`` for per-document text columns."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, texts):
+        texts = list(texts)
+        key = text_fingerprint(texts)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        sigs = self._entries[key] = minhash(texts)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return sigs
+
+    def __len__(self):
+        return len(self._entries)
+
+def corpus_signatures(frame, column, cache=None):
+    """Signatures of ``frame[column]``, computed (or fetched from ``cache``) one Source File at a time."""
+    if "Source File" not in frame or frame.empty:
+        return cache.get(frame[column]) if cache is not None else minhash(frame[column])
+    sigs = np.full((len(frame), NUM_PERM), EMPTY, dtype=np.uint32)
+    texts = frame[column]
+    for rows in frame.groupby("Source File", observed=True, sort=False).indices.values():
+        group = texts.iloc[rows]
+        sigs[rows] = cache.get(group) if cache is not None else minhash(group)
+    return sigs
+
+# -------- LSH clustering --------
+def _band_keys(band):
+    """One uint64 per row for a ``(rows, r)`` band of signature values."""
+    key = np.zeros(len(band), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(band.shape[1]):
+            key = (key ^ band[:, j].astype(np.uint64)) * _MIX
+    return key
+
+def _components(n, u, v):
+    """Connected-component label (the smallest member row) of every row, by label propagation."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[u], labels[v])
+        new = labels.copy()
+        np.minimum.at(new, u, low)
+        np.minimum.at(new, v, low)
+        new = new[new]  # pointer jumping shortens long chains
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+def lsh_clusters(sigs, threshold=THRESHOLD, bands=BANDS):
+    """Cluster label per row (the cluster's first row; a row on its own is its own label)."""
+    n = len(sigs)
+    rows = np.flatnonzero(~(sigs == EMPTY).all(axis=1))
+    r = sigs.shape[1] // bands
+    us, vs = [], []
+    for b in range(bands):
+        keys = _band_keys(sigs[rows, b * r:(b + 1) * r])
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        first = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        leader = order[np.flatnonzero(first)][np.cumsum(first) - 1]  # bucket's first row, per member
+        member = ~first
+        us.append(rows[order[member]])
+        vs.append(rows[leader[member]])
+    if not us or not sum(map(len, us)):
+        return np.arange(n)
+    pairs = np.unique(np.stack([np.concatenate(us), np.concatenate(vs)], axis=1), axis=0)
+    u, v = pairs[:, 0], pairs[:, 1]
+    similar = (sigs[u] == sigs[v]).mean(axis=1) >= threshold
+    return _components(n, u[similar], v[similar])
+
+def duplicate_clusters(frame, sigs, threshold=THRESHOLD, bands=BANDS):
+    """Rows of ``frame`` that have near-duplicates, grouped into clusters.
+
+    Adds ``Cluster`` (1 = largest), ``Size`` and ``Similarity`` (estimated Jaccard
+    similarity to the cluster's first row, which scores 1.0) in front of the frame's columns.
+    """
+    labels = lsh_clusters(sigs, threshold, bands)
+    sizes = np.bincount(labels, minlength=len(labels))
+    rows = np.flatnonzero(sizes[labels] > 1)
+    columns = ["Cluster", "Size", "Similarity"] + list(frame.columns)
+    if not len(rows):
+        return pd.DataFrame(columns=columns)
+    leaders = labels[rows]
+    similarity = (sigs[rows] == sigs[leaders]).mean(axis=1)
+    # clusters numbered largest first, ties in corpus order
+    uniq = np.unique(leaders)
+    rank = np.empty(len(labels), dtype=np.int64)
+    rank[uniq[np.lexsort((uniq, -sizes[uniq]))]] = np.arange(1, len(uniq) + 1)
+    order = np.lexsort((rows, rank[leaders]))
+    rows, leaders, similarity = rows[order], leaders[order], similarity[order]
+    out = frame.iloc[rows].reset_index(drop=True)
+    out.insert(0, "Similarity", np.round(similarity, 3))
+    out.insert(0, "Size", sizes[leaders])
+    out.insert(0, "Cluster", rank[leaders])
+    return out
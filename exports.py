@@ -0,0 +1,170 @@
+# sections/exports.py
+"""On-demand CSV / Excel / Parquet exports, and results bundles.
+
+Download buttons get a zero-argument callable instead of ready-made bytes, so nothing
+is serialized until someone actually clicks. Built files are cached per filter state.
+Excel files are written row by row with xlsxwriter's ``constant_memory`` mode, so the
+workbook never holds more than one row of cells in memory.
+
+Parquet keeps the frames' dtypes: categorical columns are written dictionary-encoded
+and come back as categoricals. A results bundle is a zip of ``stories.parquet``,
+``acs.parquet`` and a small manifest; ``read_bundle`` turns one back into the
+``(stories_df, ac_df)`` pair the step-2 view shows, with no .docx involved.
+"""
+import io
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+
+import pandas as pd
+
+from parsing_helpers import AC_COLUMNS, PARSER_VERSION, STORY_COLUMNS, compact_frame
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PARQUET_MIME = "application/vnd.apache.parquet"
+EXCEL_MAX_ROWS = 1_048_576  # per worksheet, including the header row
+_CHUNK_ROWS = 10_000
+
+def csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+def write_excel(df: pd.DataFrame, path, sheet_name="Sheet1"):
+    """Stream ``df`` into an .xlsx file at ``path``.
+
+    Rows beyond Excel's per-sheet limit continue on ``"<sheet_name> (2)"`` and so on.
+    """
+    import xlsxwriter
+
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+    n_sheets = max(1, -(-len(df) // rows_per_sheet))
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        header_fmt = workbook.add_format({"bold": True})
+        columns = [str(c) for c in df.columns]
+        for sheet_idx in range(n_sheets):
+            name = sheet_name if sheet_idx == 0 else f"{sheet_name[:26]} ({sheet_idx + 1})"
+            worksheet = workbook.add_worksheet(name[:31])
+            worksheet.write_row(0, 0, columns, header_fmt)
+            first, last = sheet_idx * rows_per_sheet, min(len(df), (sheet_idx + 1) * rows_per_sheet)
+            excel_row = 1
+            for start in range(first, last, _CHUNK_ROWS):
+                chunk = df.iloc[start:min(start + _CHUNK_ROWS, last)]
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+                for values in chunk.itertuples(index=False, name=None):
+                    worksheet.write_row(excel_row, 0, values)
+                    excel_row += 1
+    finally:
+        workbook.close()
+
+def excel_bytes(df: pd.DataFrame, sheet_name="Sheet1") -> bytes:
+    """Excel export of ``df``; the workbook is built in a temp file, not in memory."""
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        write_excel(df, path, sheet_name)
+        with open(path, "rb") as fh:
+            return fh.read()
+    finally:
+        os.remove(path)
+
+# -------- Parquet and results bundles --------
+DICTIONARY_COLUMNS = ["Module", "Epic", "Source File"]  # always dictionary-encoded, whatever their dtype
+BUNDLE_FORMAT, BUNDLE_VERSION = "storystruct-bundle", 1
+BUNDLE_MANIFEST = "bundle.json"
+BUNDLE_TABLES = {"stories": STORY_COLUMNS + ["Source File"], "acs": AC_COLUMNS + ["Source File"]}
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).") from exc
+    return pa, pq
+
+def arrow_table(df: pd.DataFrame):
+    """``df`` as a pyarrow Table with categorical / ``DICTIONARY_COLUMNS`` dictionary-encoded.
+
+    Categories no row uses are dropped: a filtered slice would otherwise carry the
+    dictionaries of the whole corpus.
+    """
+    pa, _ = _pyarrow()
+    plain = [c for c in DICTIONARY_COLUMNS if c in df and not isinstance(df[c].dtype, pd.CategoricalDtype)]
+    df = df.astype({c: "category" for c in plain})
+    df = df.assign(**{c: df[c].cat.remove_unused_categories()
+                      for c in df if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # code widths follow each frame's category count; fix them so every file shares one schema
+    schema = pa.schema([f.with_type(pa.dictionary(pa.int32(), f.type.value_type))
+                        if pa.types.is_dictionary(f.type) else f for f in table.schema], metadata=table.schema.metadata)
+    return table.cast(schema)
+
+def parquet_bytes(df: pd.DataFrame) -> bytes:
+    pa, pq = _pyarrow()
+    sink = pa.BufferOutputStream()
+    pq.write_table(arrow_table(df), sink, compression="zstd")
+    return sink.getvalue().to_pybytes()
+
+def bundle_bytes(stories_df: pd.DataFrame, ac_df: pd.DataFrame) -> bytes:
+    """Zip of both frames as Parquet plus a manifest; reopen it with ``read_bundle``."""
+    manifest = {"format": BUNDLE_FORMAT, "version": BUNDLE_VERSION, "parser_version": PARSER_VERSION,
+                "stories": len(stories_df), "acs": len(ac_df)}
+    buf = io.BytesIO()
+    # Parquet pages are compressed already, so members are stored as-is
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr(BUNDLE_MANIFEST, json.dumps(manifest))
+        for name, df in (("stories", stories_df), ("acs", ac_df)):
+            zf.writestr(f"{name}.parquet", parquet_bytes(df))
+    return buf.getvalue()
+
+def read_bundle(source):
+    """``(stories_df, ac_df)`` from a results bundle given as bytes, a path or a binary file object.
+
+    Raises ``ValueError`` if ``source`` is not a bundle this version can read.
+    """
+    pa, pq = _pyarrow()
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    try:
+        with zipfile.ZipFile(source) as zf:
+            manifest = json.loads(zf.read(BUNDLE_MANIFEST))
+            if not isinstance(manifest, dict) or manifest.get("format") != BUNDLE_FORMAT:
+                raise ValueError("not a StoryStruct results bundle")
+            if manifest.get("version", 0) > BUNDLE_VERSION:
+                raise ValueError(f"bundle version {manifest['version']} is newer than this app supports")
+            frames = []
+            for name, columns in BUNDLE_TABLES.items():
+                df = pq.read_table(pa.BufferReader(zf.read(f"{name}.parquet"))).to_pandas()
+                missing = [c for c in columns if c not in df]
+                if missing and not df.empty:
+                    raise ValueError(f"{name}.parquet is missing column(s): {', '.join(missing)}")
+                frames.append(compact_frame(df) if not df.empty else pd.DataFrame(columns=columns))
+    except (zipfile.BadZipFile, KeyError, json.JSONDecodeError, pa.ArrowException) as exc:
+        raise ValueError(f"not a StoryStruct results bundle ({exc})") from exc
+    return tuple(frames)
+
+class ExportCache:
+    """Small LRU of built export files, keyed by whatever identifies the filter state."""
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        data = build()
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def lazy(self, key, build):
+        """Zero-argument callable for ``st.download_button(data=...)``."""
+        return lambda: self.get(key, build)
@@ -0,0 +1,175 @@
+# sections/filter_index.py
+"""Precomputed filter indexes for the step-2 results view.
+
+Built once per corpus: each filter column maps its values to sorted story row positions,
+and every story / AC row gets an integer code for its ``(Source File, Story ID)`` key.
+A filter combination is then a couple of ``np.intersect1d`` calls, and the ACs of the
+selected stories are a boolean lookup on those key codes. Filtered views (frames plus
+their metric cards) are memoized per filter tuple.
+
+Large views are shown a page at a time. Each column's ascending row order over the
+whole stories / AC frame is computed once; sorting a filtered view is then a boolean
+mask over that order, and only the requested page is sliced into a frame.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ["Source File", "Story ID"]
+STORIES, ACS = "stories", "acs"
+
+def ascending_order(series):
+    """Row positions of ``series`` in stable ascending order, missing values last.
+
+    Categories are in first-seen order, so categoricals are sorted on the lexical rank
+    of each code rather than on the codes themselves.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cats = series.cat.categories
+        rank = np.empty(len(cats) + 1, dtype=np.int64)
+        rank[cats.argsort()] = np.arange(len(cats))
+        rank[-1] = len(cats)  # code -1 (missing) sorts last
+        return np.argsort(rank[series.cat.codes.to_numpy()], kind="stable")
+    return series.argsort(kind="stable").to_numpy()
+
+def descending_order(series):
+    """Row positions of ``series`` in descending order, ties kept in row order and missing values last.
+
+    Matches ``sort_values(ascending=False, kind="stable", na_position="last")``, which
+    reversing the ascending order would not: that puts missing values first and reverses ties.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cats, codes = series.cat.categories, series.cat.codes.to_numpy()
+        rank = np.empty(len(cats), dtype=np.int64)
+        rank[cats.argsort()] = np.arange(len(cats))
+        present = np.flatnonzero(codes != -1)
+        order = present[np.argsort(-rank[codes[present]], kind="stable")]
+        return np.concatenate([order, np.flatnonzero(codes == -1)])
+    return series.reset_index(drop=True).sort_values(ascending=False, kind="stable",
+                                                     na_position="last").index.to_numpy()
+
+class FilteredView:
+    __slots__ = ("stories", "acs", "story_rows", "ac_rows", "story_metrics", "ac_metrics")
+
+    def __init__(self, stories, acs, story_rows=None, ac_rows=None):
+        self.stories, self.acs = stories, acs
+        self.story_rows, self.ac_rows = story_rows, ac_rows  # positions in the unfiltered frames
+        self.story_metrics = [
+            ("Stories", len(stories)),
+            ("Epics", stories["Epic"].nunique()),
+            ("ACs", len(acs)),
+            ("Modules", stories["Module"].nunique()),
+            ("Avg ACs/Story", f"{(len(acs) / len(stories)) if len(stories) > 0 else 0:.2f}"),
+        ]
+        self.ac_metrics = [
+            ("ACs", len(acs)),
+            ("Epics", acs["Epic"].nunique()),
+            ("Stories", acs["Story ID"].nunique()),
+            ("Modules", acs["Module"].nunique()),
+            ("Files", acs["Source File"].nunique()),
+        ]
+
+class FilterIndex:
+    """Value -> row-position indexes over one ``(stories_df, ac_df)`` pair."""
+
+    def __init__(self, stories_df, ac_df, columns=("Epic", "Source File"), max_views=16):
+        self.stories_df, self.ac_df = stories_df, ac_df
+        self.n_stories = len(stories_df)
+        self._positions = {col: {k: np.sort(v) for k, v in stories_df.groupby(col, observed=True, sort=False).indices.items()}
+                           for col in columns if col in stories_df}
+        self._options = {col: sorted(index) for col, index in self._positions.items()}
+
+        # (Source File, Story ID) join key shared by stories and ACs
+        story_keys = pd.MultiIndex.from_frame(stories_df[KEY_COLUMNS].astype(object)) \
+            if self.n_stories and all(c in stories_df for c in KEY_COLUMNS) else None
+        if story_keys is not None:
+            self.story_key, self.keys = pd.factorize(story_keys)
+            self.key_code = {k: i for i, k in enumerate(self.keys)}
+            ac_keys = pd.MultiIndex.from_frame(ac_df[KEY_COLUMNS].astype(object)) \
+                if not ac_df.empty and all(c in ac_df for c in KEY_COLUMNS) else None
+            self.ac_key = self.keys.get_indexer(ac_keys) if ac_keys is not None else np.empty(0, dtype=np.int64)
+        else:
+            self.story_key, self.keys, self.key_code = np.empty(0, dtype=np.int64), [], {}
+            self.ac_key = np.full(len(ac_df), -1, dtype=np.int64)
+        self.max_views = max_views
+        self._views = OrderedDict()
+        self._orders = {}
+
+    def options(self, column):
+        """Sorted distinct values of ``column`` across stories (computed once)."""
+        return self._options.get(column, [])
+
+    def story_rows(self, **filters):
+        """Story row positions matching every ``column=value`` filter (``None`` = no filter)."""
+        rows = None
+        for column, value in filters.items():
+            if value is None: continue
+            hits = self._positions[column].get(value, np.empty(0, dtype=np.int64))
+            rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+        return np.arange(self.n_stories) if rows is None else rows
+
+    def rank_rows(self, rows, rank):
+        """Keep the ``rows`` whose story key is in ``rank`` (``{(Source File, Story ID): rank}``), best first."""
+        by_code = np.full(len(self.keys), -1, dtype=np.int64)
+        for key, r in rank.items():
+            code = self.key_code.get(key)
+            if code is not None: by_code[code] = r
+        ranks = by_code[self.story_key[rows]]
+        keep = ranks >= 0
+        rows, ranks = rows[keep], ranks[keep]
+        return rows[np.lexsort((rows, ranks))]
+
+    def ac_rows(self, story_rows):
+        """AC row positions belonging to the given stories, in corpus order."""
+        if not len(self.keys) or not len(story_rows):
+            return np.empty(0, dtype=np.int64)
+        selected = np.zeros(len(self.keys) + 1, dtype=bool)  # last slot: ACs with no matching story
+        selected[self.story_key[story_rows]] = True
+        return np.flatnonzero(selected[self.ac_key])
+
+    def view(self, filter_key, story_rows):
+        """Memoized ``FilteredView`` for ``filter_key``; ``story_rows()`` is only called on a miss."""
+        if filter_key in self._views:
+            self._views.move_to_end(filter_key)
+            return self._views[filter_key]
+        rows = story_rows()
+        ac_rows = self.ac_rows(rows)
+        view = FilteredView(self.stories_df.iloc[rows], self.ac_df.iloc[ac_rows], rows, ac_rows)
+        self._views[filter_key] = view
+        while len(self._views) > self.max_views:
+            self._views.popitem(last=False)
+        return view
+
+    # -------- Server-side sorting and paging --------
+    def _frame(self, table):
+        return self.stories_df if table == STORIES else self.ac_df
+
+    def sort_order(self, table, column, descending=False):
+        """Positions of every row of the ``STORIES`` or ``ACS`` frame in ``column`` order, missing values last."""
+        key = (table, column, descending)
+        if key not in self._orders:
+            series = self._frame(table)[column]
+            self._orders[key] = descending_order(series) if descending else ascending_order(series)
+        return self._orders[key]
+
+    def sorted_rows(self, table, rows, column=None, descending=False):
+        """``rows`` reordered by ``column``; without a column they keep their order (e.g. search rank),
+        reversed when ``descending``."""
+        if column is None:
+            return rows[::-1] if descending else rows
+        order = self.sort_order(table, column, descending)
+        selected = np.zeros(len(order), dtype=bool)
+        selected[rows] = True
+        return order[selected[order]]
+
+    def page(self, table, rows, page, page_size, column=None, descending=False):
+        """Frame holding page ``page`` (0-based) of ``rows`` after sorting; only that slice is built.
+
+        Unused categories are dropped, or every page would carry the corpus-wide dictionaries.
+        """
+        rows = self.sorted_rows(table, rows, column, descending)
+        start = page * page_size
+        frame = self._frame(table).iloc[rows[start:start + page_size]]
+        return frame.assign(**{c: frame[c].cat.remove_unused_categories()
+                               for c in frame if isinstance(frame[c].dtype, pd.CategoricalDtype)})
@@ -0,0 +1,238 @@
+# sections/grammars.py
+"""Document grammars: how Epic and Story headings are recognised.
+
+A ``Grammar`` lists, per heading kind, text patterns and Word paragraph style IDs
+(``w:pStyle``, e.g. ``Heading1``). ``classifier()`` compiles it for one document:
+all text patterns become a single alternation anchored at the paragraph start, one
+named group per pattern, so a paragraph costs one ``re.match`` and ``lastgroup``
+tells which pattern matched. Before that, a paragraph whose first letter no pattern
+can start with (``first_chars``, read off the parsed patterns) is rejected with one
+set lookup; most paragraphs are prose, so most never reach the regex. Paragraphs no
+pattern matches fall back to a dict lookup
+of their style ID. Each pattern's group names are prefixed with its own ``r<i>_``, so
+patterns may reuse names; numbered backreferences are refused. A pattern's
+``(?P<id>...)`` and ``(?P<title>...)`` groups give the heading's number and title; headings without a number (style-only or Gherkin ones)
+go on from the previous heading's number (after "Epic 7" comes Epic 8, after "Story
+7.9" Story 7.10), Stories starting at ``<epic>.1`` in each Epic, skipping numbers the
+document already used.
+
+``GRAMMARS`` holds the built-in grammars; ``register_grammar`` adds one. Parsers take
+a grammar name or a ``Grammar`` (which pickles, so it can be sent to worker processes).
+"""
+import re
+try:
+    from re import _parser as _sre  # Python 3.11+
+except ImportError:
+    import sre_parse as _sre
+from dataclasses import dataclass
+from functools import cached_property
+
+from parsing_helpers import EPIC, STORY
+
+_SEP = r"\s*[:\-–—]\s*"
+EPIC_TEXT = rf"Epic\s+(?P<id>\d+){_SEP}(?P<title>.+)"
+STORY_TEXT = rf"(?:User\s+)?Story\s+(?P<id>\d+(?:\.\d+)*){_SEP}(?P<title>.+)"
+# a named group, named backreference or named conditional, not preceded by an escaping backslash
+_GROUP_RE = re.compile(r"(?<!\\)((?:\\\\)*)\(\?(P<|P=|\()([A-Za-z_]\w*)")
+_LAST_NUMBER_RE = re.compile(r"(.*?)(\d+)$")
+_REPEATS = {_sre.MAX_REPEAT, _sre.MIN_REPEAT, getattr(_sre, "POSSESSIVE_REPEAT", _sre.MAX_REPEAT)}
+
+def _subpatterns(av):
+    """The parsed subpatterns nested anywhere in an opcode's argument."""
+    if isinstance(av, _sre.SubPattern):
+        yield av
+    elif isinstance(av, (tuple, list)):
+        for item in av:
+            yield from _subpatterns(item)
+
+def _group_refs(items):
+    """Group numbers referred to by backreferences and conditionals in parsed regex ``items``."""
+    for op, av in items:
+        if op is _sre.GROUPREF:
+            yield av
+        elif op is _sre.GROUPREF_EXISTS:
+            yield av[0]
+        for sub in _subpatterns(av):
+            yield from _group_refs(sub)
+
+def _scoped(pattern, prefix):
+    """``pattern`` with every group name ``<name>`` renamed ``<prefix><name>``, so it can sit
+    in one alternation with other patterns using the same names.
+
+    Numbered backreferences (``\\1``, ``(?(1)...)``) would point at another pattern's groups
+    there, so they are refused: use a named group and ``(?P=name)`` instead.
+    """
+    # named references follow their group when a capturing group is put in front; numbered ones do not
+    shifted = list(_group_refs(_sre.parse("()" + pattern)))
+    if any(a == b for a, b in zip(_group_refs(_sre.parse(pattern)), shifted)):
+        raise ValueError(f"numbered backreferences cannot be combined with other patterns, "
+                         f"use (?P<name>...) and (?P=name): {pattern!r}")
+    scoped = _GROUP_RE.sub(lambda m: f"{m.group(1)}(?{m.group(2)}{prefix}{m.group(3)}", pattern)
+    names = _sre.parse(pattern).state.groupdict
+    if _sre.parse(scoped).state.groupdict != {prefix + name: n for name, n in names.items()}:
+        raise ValueError(f"could not rename the groups of {pattern!r}")
+    return scoped
+
+def _first_chars(items):
+    """``(chars, nullable)`` for parsed regex ``items``: the characters a match can start with
+    (``None`` if that is not a small known set) and whether the items can match nothing."""
+    chars = set()
+    for op, av in items:
+        if op is _sre.AT:  # zero-width anchor
+            continue
+        if op is _sre.LITERAL:
+            return chars | {chr(av)}, False
+        if op is _sre.IN:
+            for item_op, item in av:
+                if item_op is _sre.LITERAL:
+                    chars.add(chr(item))
+                elif item_op is _sre.RANGE and item[1] - item[0] < 64:
+                    chars.update(map(chr, range(item[0], item[1] + 1)))
+                else:  # negated sets, \s, \w... match too many characters to be worth listing
+                    return None, False
+            return chars, False
+        if op is _sre.SUBPATTERN:
+            first, nullable = _first_chars(av[-1])
+        elif op is _sre.BRANCH:
+            branches = [_first_chars(branch) for branch in av[1]]
+            if any(first is None for first, _ in branches):
+                return None, False
+            first = set().union(*(first for first, _ in branches))
+            nullable = any(nullable for _, nullable in branches)
+        elif op in _REPEATS:
+            first, nullable = _first_chars(av[2])
+            nullable = nullable or av[0] == 0
+        else:
+            return None, False
+        if first is None:
+            return None, False
+        chars |= first
+        if not nullable:
+            return chars, False
+    return chars, True
+
+@dataclass(frozen=True)
+class Grammar:
+    name: str
+    epic_patterns: tuple = ()
+    story_patterns: tuple = ()
+    epic_styles: frozenset = frozenset()
+    story_styles: frozenset = frozenset()
+
+    def _rules(self):
+        return [(EPIC, p) for p in self.epic_patterns] + [(STORY, p) for p in self.story_patterns]
+
+    @cached_property
+    def regex(self):
+        """One case-insensitive alternation of every pattern, Epic patterns first; ``None`` if there are none."""
+        alternatives = []
+        for i, (_, pattern) in enumerate(self._rules()):
+            # group names must be unique across the alternation: id -> r<i>_id, title -> r<i>_title...
+            alternatives.append(f"(?P<r{i}>{_scoped(pattern, f'r{i}_')})")
+        return re.compile(rf"\s*(?:{'|'.join(alternatives)})\s*$", re.IGNORECASE) if alternatives else None
+
+    @cached_property
+    def rule_kinds(self):
+        """``{group name: (kind, id group or None, title group or None)}`` per pattern."""
+        rules = {}
+        for i, (kind, pattern) in enumerate(self._rules()):
+            names = _sre.parse(pattern).state.groupdict
+            rules[f"r{i}"] = (kind, f"r{i}_id" if "id" in names else None, f"r{i}_title" if "title" in names else None)
+        return rules
+
+    @cached_property
+    def first_chars(self):
+        """Lower-cased first letters of every text pattern, or ``None`` if some pattern can start
+        with any character or a non-ASCII one (then every paragraph goes through the regex)."""
+        chars = set()
+        for _, pattern in self._rules():
+            first, nullable = _first_chars(_sre.parse(pattern))
+            if first is None or nullable or not "".join(first).isascii():
+                return None
+            chars.update(c.lower() for c in first)
+        return frozenset(chars)
+
+    @cached_property
+    def styles(self):
+        return {**{s: STORY for s in self.story_styles}, **{s: EPIC for s in self.epic_styles}}
+
+    @property
+    def uses_styles(self) -> bool:
+        return bool(self.epic_styles or self.story_styles)
+
+    def classifier(self):
+        return Classifier(self)
+
+class Classifier:
+    """Classifies the paragraphs of one document, numbering headings that carry no number."""
+
+    def __init__(self, grammar):
+        self._match = grammar.regex.match if grammar.regex is not None else (lambda line: None)
+        self._first = grammar.first_chars
+        self._rules = grammar.rule_kinds
+        self._styles = grammar.styles
+        self.uses_styles = grammar.uses_styles
+        self._epic_id = None
+        self._story_id = None  # previous Story ID within the current Epic
+        self._used = {EPIC: set(), STORY: set()}
+
+    def _next(self, kind, previous, prefix):
+        """The number after ``previous`` (``<prefix>1`` if there is none) that the document has not used yet."""
+        m = _LAST_NUMBER_RE.match(previous) if previous else None
+        prefix, n = (m.group(1), int(m.group(2))) if m else (prefix, 0)
+        while f"{prefix}{n + 1}" in self._used[kind]:
+            n += 1
+        return f"{prefix}{n + 1}"
+
+    def classify(self, line, style=None):
+        """``(kind, number, title)`` for a stripped, non-empty paragraph, or ``(None, None, None)``.
+
+        Non-ASCII first letters still go through the regex, which folds case more widely.
+        """
+        head = line[0]
+        first = self._first
+        m = self._match(line) if first is None or head.lower() in first or not head.isascii() else None
+        if m is not None:
+            kind, id_group, title_group = self._rules[m.lastgroup]
+            number = m.group(id_group).strip() if id_group else None
+            title = m.group(title_group).strip() if title_group else line
+        else:
+            kind = self._styles.get(style) if style else None
+            if kind is None:
+                return None, None, None
+            number, title = None, line
+        if kind == EPIC:  # == rather than is: the grammar may have been unpickled in a worker
+            self._epic_id = number or self._next(EPIC, self._epic_id, "")
+            self._used[EPIC].add(self._epic_id)
+            self._story_id = None
+            return EPIC, self._epic_id, title
+        number = number or self._next(STORY, self._story_id, f"{self._epic_id}." if self._epic_id else "")
+        self._story_id = number
+        self._used[STORY].add(number)
+        return STORY, number, title
+
+DEFAULT_GRAMMAR = "default"
+GRAMMARS = {}
+
+def register_grammar(grammar):
+    """Make ``grammar`` available by name (to the UI, ``batch_cli --grammar`` and ``get_grammar``)."""
+    GRAMMARS[grammar.name] = grammar
+    return grammar
+
+def get_grammar(grammar=None):
+    """The ``Grammar`` for a name (default: ``DEFAULT_GRAMMAR``) or a ``Grammar`` passed through."""
+    if isinstance(grammar, Grammar):
+        return grammar
+    try:
+        return GRAMMARS[grammar or DEFAULT_GRAMMAR]
+    except KeyError:
+        raise ValueError(f"unknown grammar {grammar!r} (known: {', '.join(sorted(GRAMMARS))})") from None
+
+# "Epic 1: ..." / "User Story 1.2: ..." paragraphs, as described in the User Manual
+register_grammar(Grammar(DEFAULT_GRAMMAR, (EPIC_TEXT,), (STORY_TEXT,)))
+# Heading 1 = Epic, Heading 2 = Story; numbered text headings still win and keep their numbers
+register_grammar(Grammar("headings", (EPIC_TEXT,), (STORY_TEXT,),
+                         frozenset({"Heading1"}), frozenset({"Heading2"})))
+# Gherkin: "Feature: ..." = Epic, "Scenario: ..." / "Scenario Outline: ..." = Story
+register_grammar(Grammar("gherkin", (r"Feature\s*:\s*(?P<title>.+)",),
+                         (r"Scenario(?:\s+Outline)?\s*:\s*(?P<title>.+)",)))
@@ -0,0 +1,255 @@
+# sections/jira_export.py
+"""Bulk export of extracted stories and ACs to Jira.
+
+Stories become issues and their ACs become sub-tasks, created through Jira's bulk
+endpoint (``POST /rest/api/2/issue/bulk``, up to 50 issues per request). Batches are
+sent concurrently over one pooled HTTP session. A 429 or 503 pauses every worker for
+the server's ``Retry-After`` (or an exponential backoff with jitter) before the batch is
+retried. An ``IdempotencyMap`` records the Jira key created for every story / AC, so a
+re-run only creates what is missing.
+"""
+import bisect
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+BULK_PATH = "/rest/api/2/issue/bulk"
+MAX_BULK = 50  # Jira's limit per bulk request
+RETRY_STATUS = {429, 503}
+DEFAULT_MAP_PATH = os.environ.get("STORYSTRUCT_JIRA_MAP", "storystruct_jira_map.json")
+
+class JiraError(RuntimeError):
+    pass
+
+@dataclass
+class JiraConfig:
+    base_url: str
+    project_key: str
+    email: str = ""
+    api_token: str = ""
+    story_type: str = "Story"
+    subtask_type: str = "Sub-task"
+    batch_size: int = MAX_BULK
+    concurrency: int = 4
+    max_retries: int = 6
+    backoff: float = 0.5      # first retry delay when the server sends no Retry-After
+    max_backoff: float = 30.0
+    timeout: float = 30.0
+
+@dataclass
+class ExportReport:
+    created: int = 0
+    skipped: int = 0
+    failed: list = field(default_factory=list)  # (local key, message)
+    requests: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def issues_per_second(self):
+        return self.created / self.seconds if self.seconds else 0.0
+
+class IdempotencyMap:
+    """Local story / AC key -> Jira issue key, persisted as JSON after every batch."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._keys = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                self._keys = json.load(fh)
+
+    def __contains__(self, local_key):
+        return local_key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, local_key):
+        return self._keys.get(local_key)
+
+    def update(self, pairs):
+        with self._lock:
+            self._keys.update(pairs)
+            if not self.path: return
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self._keys, fh)
+            os.replace(tmp, self.path)
+
+# -------- Issue payloads --------
+def _rows(df, columns):
+    return df.reindex(columns=columns).itertuples(index=False, name=None)
+
+def story_key(project, source_file, story_id, occurrence=1):
+    """Local key of a story; a story ID repeated within one file gets its occurrence (2, 3...) appended."""
+    key = f"{project}|story|{source_file}|{story_id}"
+    return key if occurrence == 1 else f"{key}|{occurrence}"
+
+def ac_key(project, source_file, story_id, seq):
+    return f"{project}|ac|{source_file}|{story_id}|{seq}"
+
+def _text(value):
+    return "" if value is None or value != value else str(value)  # NaN -> ""
+
+def story_issues(config, stories_df):
+    """``[(local key, fields)]`` for every story."""
+    out, seen = [], {}
+    for module, epic, story_id, title, source in _rows(
+            stories_df, ["Module", "Epic", "Story ID", "Story Title", "Source File"]):
+        description = f"Module: {_text(module)}\nEpic: {_text(epic)}\nSource: {_text(source)}"
+        source, story_id = _text(source), _text(story_id)
+        n = seen[source, story_id] = seen.get((source, story_id), 0) + 1
+        out.append((story_key(config.project_key, source, story_id, n), {
+            "project": {"key": config.project_key},
+            "issuetype": {"name": config.story_type},
+            "summary": f"{story_id}: {_text(title)}"[:255],
+            "description": description,
+        }))
+    return out
+
+def _ac_bounds(stories_df):
+    """``{(source, story ID): [last AC seq of occurrence 1, of occurrence 2, ...]}`` from the AC counts."""
+    bounds = {}
+    if stories_df is None: return bounds
+    for story_id, count, source in _rows(stories_df, ["Story ID", "Acceptance Criteria Count", "Source File"]):
+        ends = bounds.setdefault((_text(source), _text(story_id)), [])
+        ends.append((ends[-1] if ends else 0) + (int(count) if count == count else 0))
+    return bounds
+
+def ac_issues(config, ac_df, id_map, stories_df=None):
+    """``([(local key, fields)], orphans)``; orphans are ACs whose story has no Jira key.
+
+    ACs follow their story in document order, so when a story ID repeats within a file the
+    stories' AC counts (from ``stories_df``) tell which occurrence each AC belongs to.
+    """
+    out, orphans, seq = [], [], {}
+    bounds = _ac_bounds(stories_df)
+    for story_id, ac_no, scenario, source in _rows(ac_df, ["Story ID", "AC #", "Scenario", "Source File"]):
+        source, story_id = _text(source), _text(story_id)
+        n = seq[source, story_id] = seq.get((source, story_id), 0) + 1
+        local = ac_key(config.project_key, source, story_id, n)
+        ends = bounds.get((source, story_id), [])
+        occurrence = min(bisect.bisect_left(ends, n), len(ends) - 1) + 1 if ends else 1
+        parent = id_map.get(story_key(config.project_key, source, story_id, occurrence))
+        if parent is None:
+            orphans.append(local)
+            continue
+        label = f"AC {_text(ac_no)}: " if _text(ac_no) else "AC: "
+        out.append((local, {
+            "project": {"key": config.project_key},
+            "parent": {"key": parent},
+            "issuetype": {"name": config.subtask_type},
+            "summary": (label + _text(scenario).replace("\n", " "))[:255],
+            "description": _text(scenario),
+        }))
+    return out, orphans
+
+# -------- Exporter --------
+class JiraBulkExporter:
+    def __init__(self, config, id_map=None, session=None):
+        self.config = config
+        self.id_map = id_map if id_map is not None else IdempotencyMap()
+        self.session = session or self._make_session()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _make_session(self):
+        import requests  # not at module level: the Jira page renders without it
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.config.concurrency))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if self.config.email or self.config.api_token:
+            session.auth = (self.config.email, self.config.api_token)
+        session.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
+        return session
+
+    def _wait_for_rate_limit(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0: time.sleep(delay)
+
+    def _post_bulk(self, fields_list, report):
+        """POST one bulk request, retrying on 429/503; returns the decoded JSON body."""
+        url = self.config.base_url.rstrip("/") + BULK_PATH
+        payload = {"issueUpdates": [{"fields": f} for f in fields_list]}
+        for attempt in range(self.config.max_retries + 1):
+            self._wait_for_rate_limit()
+            resp = self.session.post(url, json=payload, timeout=self.config.timeout)
+            with self._lock:
+                report.requests += 1
+            if resp.status_code not in RETRY_STATUS:
+                break
+            if attempt == self.config.max_retries:
+                raise JiraError(f"HTTP {resp.status_code} after {attempt} retries")
+            retry_after = resp.headers.get("Retry-After")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = min(self.config.max_backoff, self.config.backoff * 2 ** attempt) * (0.5 + random.random())
+            with self._lock:
+                report.retries += 1
+                # every worker holds off until the server is ready again
+                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+        try:
+            body = resp.json()
+        except ValueError:
+            body = None
+        # a bulk request where every issue failed comes back as 400 with per-element errors
+        if not isinstance(body, dict) or (resp.status_code >= 400 and not body.get("errors")):
+            raise JiraError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+        return body
+
+    def _send_batch(self, batch, report):
+        """Create one batch; returns ``(created {local: jira key}, failed [(local, message)])``."""
+        body = self._post_bulk([fields for _, fields in batch], report)
+        errors = {e.get("failedElementNumber"): e for e in body.get("errors", [])}
+        ok = [local for i, (local, _) in enumerate(batch) if i not in errors]
+        created = {local: issue["key"] for local, issue in zip(ok, body.get("issues", []))}
+        failed = [(batch[i][0], json.dumps(e.get("elementErrors", e))[:300]) for i, e in errors.items()
+                  if isinstance(i, int) and i < len(batch)]
+        return created, failed
+
+    def _create(self, items, report, progress=None, done=0, total=0):
+        import requests
+        todo = [item for item in items if item[0] not in self.id_map]
+        report.skipped += len(items) - len(todo)
+        size = max(1, min(self.config.batch_size, MAX_BULK))
+        batches = [todo[i:i + size] for i in range(0, len(todo), size)]
+        done += len(items) - len(todo)
+        with ThreadPoolExecutor(max_workers=max(1, self.config.concurrency)) as pool:
+            futures = {pool.submit(self._send_batch, batch, report): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    created, failed = future.result()
+                except (JiraError, requests.RequestException) as exc:
+                    created, failed = {}, [(local, str(exc)) for local, _ in batch]
+                self.id_map.update(created)
+                report.created += len(created)
+                report.failed.extend(failed)
+                done += len(batch)
+                if progress: progress(done, total)
+        return done
+
+    def export(self, stories_df, ac_df, progress=None):
+        """Create every story, then every AC as a sub-task of its story.
+
+        ``progress(done, total)`` is called from the calling thread after each batch.
+        """
+        start = time.perf_counter()
+        report = ExportReport()
+        stories = story_issues(self.config, stories_df)
+        total = len(stories) + len(ac_df)
+        done = self._create(stories, report, progress, 0, total)
+        acs, orphans = ac_issues(self.config, ac_df, self.id_map, stories_df)
+        report.failed.extend((local, "story was not created") for local in orphans)
+        self._create(acs, report, progress, done + len(orphans), total)
+        report.seconds = time.perf_counter() - start
+        return report
@@ -1,5 +1,5 @@
 import streamlit as st
-from ui_components import render_home, render_about, render_manual, render_jira_placeholder
+from ui_components import render_home, render_about, render_manual, render_jira
 
 
 
@@ -19,4 +19,4 @@ elif section == "ℹ️ About":
 elif section == "📘 User Manual":
     render_manual()
 elif section == "🚀 Jira Integration":
-    render_jira_placeholder()
+    render_jira()
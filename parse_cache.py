@@ -0,0 +1,83 @@
+# sections/parse_cache.py
+"""Content-addressed LRU cache for parse results.
+
+Entries are keyed by the SHA-256 of the file bytes plus ``PARSER_VERSION``, so a
+re-uploaded or renamed file is a hit and a parser change invalidates everything.
+"""
+import hashlib
+from collections import OrderedDict
+
+from parsing_helpers import PARSER_VERSION, extract_user_stories_and_acs
+
+def _digest_stream(fh):
+    h = hashlib.sha256()
+    for chunk in iter(lambda: fh.read(1 << 20), b""):
+        h.update(chunk)
+    return h.hexdigest()
+
+def file_digest(file) -> str:
+    """SHA-256 hex digest of an uploaded file, a binary file object or a path."""
+    if hasattr(file, "getvalue"):
+        return hashlib.sha256(file.getvalue()).hexdigest()
+    if hasattr(file, "read"):
+        pos = file.tell()
+        file.seek(0)
+        digest = _digest_stream(file)
+        file.seek(pos)
+        return digest
+    with open(file, "rb") as fh:
+        return _digest_stream(fh)
+
+class ParseCache:
+    """LRU map of ``(digest, parser version) -> (stories_df, ac_df)``.
+
+    Cached frames are shared between reruns; callers must not modify them in place.
+    """
+
+    def __init__(self, max_entries=64, parse=extract_user_stories_and_acs):
+        self.max_entries = max_entries
+        self.parse = parse
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _key(self, digest):
+        return (digest, PARSER_VERSION)
+
+    def get(self, file, digest=None, **parse_kwargs):
+        """Return the parse result for ``file``, parsing (with ``parse_kwargs``) only on a cache miss."""
+        key = self._key(digest or file_digest(file))
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if hasattr(file, "seek"):
+            file.seek(0)
+        result = self.parse(file, **parse_kwargs)
+        self.put(key[0], result)
+        return result
+
+    def put(self, digest, result):
+        """Store a result parsed outside ``get`` (e.g. by a worker pool); counts as a miss."""
+        self.misses += 1
+        key = self._key(digest)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def evict(self, digest):
+        self._entries.pop(self._key(digest), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __contains__(self, digest):
+        return self._key(digest) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
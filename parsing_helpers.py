@@ -1,13 +1,21 @@
 # sections/parsing_helpers.py
 import re
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from itertools import islice
+import numpy as np
 import pandas as pd
-from docx import Document
-from docx.oxml.table import CT_Tbl
-from docx.oxml.text.paragraph import CT_P
+
+# Bump whenever extraction output can change; cached parse results are keyed on it.
+PARSER_VERSION = "1"
 
 # -------- REGEX patterns --------
 EPIC_RE = re.compile(r"^\s*Epic\s+(\d+)\s*[:\-\u2013\u2014]\s*(.+)\s*$", re.IGNORECASE)
 STORY_RE = re.compile(r"^\s*(?:User\s+)?Story\s+(\d+(?:\.\d+)*)\s*[:\-\u2013\u2014]\s*(.+)\s*$", re.IGNORECASE)
+MODULE_RE = re.compile(r"Module\s*[:\-\u2013\u2014]\s*(.+)", re.IGNORECASE)
 
 HEADER_ALIASES = {
     "scenario": "Scenario", "given": "Given", "precondition": "Given",
@@ -17,116 +25,370 @@ HEADER_ALIASES = {
     "#": "AC #", "no": "AC #", "id": "AC #", "sr no": "AC #", "s no": "AC #",
     "sno": "AC #", "srno": "AC #", "ac #": "AC #", "ac no": "AC #", "ac number": "AC #",
 }
+STORY_COLUMNS = ["Module", "Epic", "Story ID", "Story Title", "Acceptance Criteria Count"]
+AC_COLUMNS = ["Module", "Epic", "Story ID", "Story Title", "AC #", "Scenario"]
+# Low-cardinality columns kept as pandas categoricals (plus "Story Title" in AC frames)
+CATEGORY_COLUMNS = ["Module", "Epic", "Story ID", "Source File"]
+AC_HEADER_KEYWORDS = {"acceptance", "criteria", "scenario", "given", "when", "then", "expected", "result"}
 
 # -------- Helpers --------
 def iter_block_items(parent):
-    """Yield paragraphs and tables from a Word document in order."""
-    xml_children = list(parent.element.body.iterchildren())
-    table_idx = 0
-    for idx, child in enumerate(xml_children):
+    """Yield paragraphs and tables from a Word document in order.
+
+    Single pass over the body: each CT_P/CT_Tbl is wrapped as it is reached
+    instead of being looked up in ``parent.paragraphs``/``parent.tables``.
+    """
+    from docx.oxml.table import CT_Tbl
+    from docx.oxml.text.paragraph import CT_P
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+    container = getattr(parent, "_body", parent)
+    for child in parent.element.body.iterchildren():
         if isinstance(child, CT_P):
-            p_count = sum(1 for c in xml_children[: idx + 1] if isinstance(c, CT_P))
-            yield ("p", parent.paragraphs[p_count - 1])
+            yield ("p", Paragraph(child, container))
         elif isinstance(child, CT_Tbl):
-            if table_idx < len(parent.tables):
-                yield ("t", parent.tables[table_idx])
-            table_idx += 1
+            yield ("t", Table(child, container))
 
+_HEADER_JUNK_RE = re.compile(r"[^\w#]+")
+
+@lru_cache(maxsize=4096)
 def _canon_header(text: str) -> str:
+    # header spellings repeat across every AC table, so results are memoized
     raw = (text or "").strip()
-    t = raw.lower()
-    t = re.sub(r"[^\w#]+", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
+    t = _HEADER_JUNK_RE.sub(" ", raw.lower()).strip()
     return HEADER_ALIASES.get(t, raw if raw else "")
 
-def looks_like_ac_table(table):
-    keywords = {"acceptance", "criteria", "scenario", "given", "when", "then", "expected", "result"}
+# -------- Paragraph classification --------
+EPIC, STORY = "epic", "story"
+
+class ModuleFinder:
+    """First ``MODULE_RE`` match over the newline-joined non-empty paragraphs, fed one at a time.
+
+    A match can run over at most three consecutive paragraphs, so only the last three
+    are kept, and the regex only runs while one of them mentions "module".
+    """
+
+    def __init__(self):
+        self.module = None
+        self._recent = deque(maxlen=3)
+        self._hot = 0
+
+    def feed(self, line):
+        self._recent.append(line)
+        if "module" in line.lower():
+            self._hot = 3
+        if not self._hot:
+            return False
+        self._hot -= 1
+        m = MODULE_RE.search("\n".join(self._recent))
+        if m:
+            self.module = m.group(1).strip()
+        return m is not None
+
+# -------- XML text helpers --------
+# Read text straight from w:p / w:tbl elements with the same rules python-docx uses
+# (runs and hyperlinks, tabs, line breaks, gridSpan and vMerge cells), without
+# building Paragraph/_Cell proxies. Work on CT_P/CT_Tbl and on plain lxml elements.
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+def _w(tag):
+    return f"{{{W_NS}}}{tag}"
+
+W_BODY, W_P, W_TBL, W_TR, W_TC = _w("body"), _w("p"), _w("tbl"), _w("tr"), _w("tc")
+W_R, W_HYPERLINK, W_T, W_BR, W_VAL = _w("r"), _w("hyperlink"), _w("t"), _w("br"), _w("val")
+W_TCPR, W_TRPR, W_GRIDSPAN, W_GRIDBEFORE, W_VMERGE = _w("tcPr"), _w("trPr"), _w("gridSpan"), _w("gridBefore"), _w("vMerge")
+W_PPR, W_PSTYLE = _w("pPr"), _w("pStyle")
+
+# Run children that carry text, mapped to their plain-text equivalent (w:t and w:br handled apart).
+_RUN_CHAR = {_w("tab"): "\t", _w("ptab"): "\t", _w("cr"): "\n", _w("noBreakHyphen"): "-"}
+
+def _run_text(r):
+    parts = []
+    for e in r:
+        tag = e.tag
+        if tag == W_T:
+            parts.append(e.text or "")
+        elif tag == W_BR:
+            if e.get(_w("type"), "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_CHAR:
+            parts.append(_RUN_CHAR[tag])
+    return "".join(parts)
+
+def paragraph_text(p):
+    """Text of a ``w:p`` element, equivalent to python-docx ``Paragraph.text``."""
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(W_R))
+    return "".join(parts)
+
+def paragraph_style(p):
+    """Style ID of a ``w:p`` element (``w:pPr/w:pStyle/@w:val``, e.g. ``Heading1``), or ``None``."""
+    ppr = p.find(W_PPR)
+    style = ppr.find(W_PSTYLE) if ppr is not None else None
+    return style.get(W_VAL) if style is not None else None
+
+def _int_prop(parent, prop_tag, child_tag, default):
+    pr = parent.find(prop_tag)
+    el = pr.find(child_tag) if pr is not None else None
+    return int(el.get(W_VAL)) if el is not None and el.get(W_VAL) is not None else default
+
+def _vmerge(tc):
+    tc_pr = tc.find(W_TCPR)
+    el = tc_pr.find(W_VMERGE) if tc_pr is not None else None
+    return None if el is None else el.get(W_VAL, "continue")
+
+def iter_row_texts(tbl):
+    """Yield the cell texts of each row of a ``w:tbl`` element, as python-docx ``row.cells`` gives them.
+
+    A cell spanning several grid columns is repeated once per column, and a vertically
+    merged continuation cell repeats the text of the cell it continues.
+    """
+    above = None
+    for tr in tbl.iterchildren(W_TR):
+        offset = _int_prop(tr, W_TRPR, W_GRIDBEFORE, 0)
+        row, starts = [], {}
+        for tc in tr.iterchildren(W_TC):
+            span = _int_prop(tc, W_TCPR, W_GRIDSPAN, 1)
+            if _vmerge(tc) == "continue":
+                if above is None or offset not in above:
+                    raise ValueError("vertically merged cell has no cell above it")
+                text, width = above[offset]
+            else:
+                text, width = "\n".join(paragraph_text(p) for p in tc.iterchildren(W_P)), span
+            starts[offset] = (text, width)
+            row.extend([text] * width)
+            offset += span
+        yield row
+        above = starts
+
+def table_text_grid(table):
+    """All cell texts of a python-docx ``Table`` (or ``w:tbl`` element), row by row."""
+    return list(iter_row_texts(getattr(table, "_tbl", table)))
+
+# -------- AC table detection & parsing --------
+# Tables are read once into a grid of raw cell texts (one entry per layout-grid
+# cell); header detection, row counting and extraction all run on that grid.
+def looks_like_ac_grid(grid):
     for hdr_idx in (0, 1):
-        if hdr_idx >= len(table.rows):
+        if hdr_idx >= len(grid):
             break
-        cells_text = " | ".join(cell.text.strip().lower() for cell in table.rows[hdr_idx].cells)
-        if any(k in cells_text for k in keywords):
+        cells_text = " | ".join(t.strip().lower() for t in grid[hdr_idx])
+        if any(k in cells_text for k in AC_HEADER_KEYWORDS):
             return True, hdr_idx
     return False, None
 
-def _row_is_empty(row) -> bool:
-    return all(not (cell.text or "").strip() for cell in row.cells)
+def parse_ac_grid(grid, header_row_index):
+    """Return ``(ac_count, entries)`` for an AC grid in a single pass over its rows.
 
-def _first_data_row_index(table, header_row_index):
-    total_rows = len(table.rows)
+    ``ac_count`` is the number of non-empty data rows; ``entries`` only holds rows
+    that have an AC number or a scenario.
+    """
+    headers = [_canon_header(t) for t in grid[header_row_index]]
+    idx_acnum = headers.index("AC #") if "AC #" in headers else None
+    idx_scenario = headers.index("Scenario") if "Scenario" in headers else None
+    idx_free_ac = headers.index("Acceptance Criteria") if "Acceptance Criteria" in headers else None
+
+    total_rows = len(grid)
     data_start = header_row_index + 1
-    if data_start < total_rows and _row_is_empty(table.rows[data_start]):
+    if data_start < total_rows and all(not (t or "").strip() for t in grid[data_start]):
         data_start += 1
-    return min(data_start, total_rows)
+
+    count, out = 0, []
+    for r_idx in range(data_start, total_rows):
+        cells = [(t or "").strip() for t in grid[r_idx]]
+        if not any(cells): continue
+        count += 1
+        ac_no = cells[idx_acnum] if idx_acnum is not None and idx_acnum < len(cells) else ""
+        scenario = cells[idx_scenario] if idx_scenario is not None and idx_scenario < len(cells) else ""
+        if not scenario and idx_free_ac is not None and idx_free_ac < len(cells):
+            scenario = cells[idx_free_ac]
+        if ac_no or scenario:
+            out.append({"AC #": ac_no, "Scenario": scenario})
+    return count, out
+
+def read_ac_table(tbl):
+    """Single pass over a ``w:tbl``: ``(ac_count, entries)`` if it is an AC table, else ``None``.
+
+    Only the two candidate header rows are read for tables that turn out not to be AC tables.
+    """
+    rows = iter_row_texts(tbl)
+    grid = list(islice(rows, 2))
+    is_ac, hdr_idx = looks_like_ac_grid(grid)
+    if not is_ac:
+        return None
+    grid.extend(rows)
+    return parse_ac_grid(grid, hdr_idx)
+
+# Table-object API, kept for callers that hold python-docx tables.
+def looks_like_ac_table(table):
+    return looks_like_ac_grid(table_text_grid(table)[:2])
 
 def count_ac_rows(table, header_row_index):
-    total_rows = len(table.rows)
-    data_start = _first_data_row_index(table, header_row_index)
-    count = sum(1 for r in range(data_start, total_rows) if not _row_is_empty(table.rows[r]))
-    return max(count, 0)
+    return parse_ac_grid(table_text_grid(table), header_row_index)[0]
 
 def parse_ac_table_rows_minimal(table, header_row_index):
-    header_cells = table.rows[header_row_index].cells
-    headers = [_canon_header(c.text) for c in header_cells]
+    return parse_ac_grid(table_text_grid(table), header_row_index)[1]
 
-    def _find_idx(names):
-        for i, h in enumerate(headers):
-            if h in names: return i
-        return None
+# -------- Compact frame building --------
+def constant_categorical(value, n):
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [value])
 
-    idx_acnum = _find_idx({"AC #"})
-    idx_scenario = _find_idx({"Scenario"})
-    idx_free_ac = _find_idx({"Acceptance Criteria"})
-
-    data_start = _first_data_row_index(table, header_row_index)
-    out = []
-    for r_idx in range(data_start, len(table.rows)):
-        row = table.rows[r_idx]
-        if _row_is_empty(row): continue
-        cells = [cell.text.strip() for cell in row.cells]
-        ac_no = cells[idx_acnum].strip() if idx_acnum is not None and idx_acnum < len(cells) else ""
-        scenario = cells[idx_scenario].strip() if idx_scenario is not None and idx_scenario < len(cells) else ""
-        if not scenario and idx_free_ac is not None and idx_free_ac < len(cells):
-            scenario = cells[idx_free_ac].strip()
-        if ac_no or scenario:
-            out.append({"AC #": ac_no, "Scenario": scenario})
-    return out
+def compact_frame(df):
+    """Convert the repeated-string columns of a stories or AC frame to categoricals."""
+    cols = [c for c in CATEGORY_COLUMNS if c in df]
+    if "Scenario" in df and "Story Title" in df: cols.append("Story Title")
+    return df.astype({c: "category" for c in cols}) if cols and not df.empty else df
 
-def extract_user_stories_and_acs(docx_file):
-    doc = Document(docx_file)
-    paragraphs = doc.paragraphs
-    if len(paragraphs) == 0:
-        return pd.DataFrame(columns=["Module","Epic","Story ID","Story Title","Acceptance Criteria Count"]), \
-               pd.DataFrame(columns=["Module","Epic","Story ID","Story Title","AC #","Scenario"])
+class FrameBuilder:
+    """Column-oriented accumulator for one document's stories and ACs.
+
+    AC rows only record the position of their story. Epic, Story ID and Story Title are
+    attached at the end as categorical codes over the story values, so each string is
+    stored once per document rather than once per AC row.
+    """
+
+    def __init__(self):
+        self.epics, self.story_ids, self.titles, self.ac_counts = [], [], [], []
+        self.ac_story, self.ac_nos, self.scenarios = [], [], []
+
+    def __bool__(self):
+        return bool(self.titles)
+
+    def add_story(self, epic, story_id, title):
+        self.epics.append(epic)
+        self.story_ids.append(story_id)
+        self.titles.append(title)
+        self.ac_counts.append(0)
 
-    paragraphs_nonempty = [p.text.strip() for p in paragraphs if p.text.strip()]
-    full_text = "\n".join(paragraphs_nonempty)
-    module_match = re.search(r"Module\s*[:\-\u2013\u2014]\s*(.+)", full_text, flags=re.IGNORECASE)
-    module = module_match.group(1).strip() if module_match else "Unknown"
+    def add_ac_table(self, count, entries):
+        """Attach one parsed AC table to the most recent story."""
+        story = len(self.titles) - 1
+        self.ac_counts[story] += count
+        for entry in entries:
+            self.ac_story.append(story)
+            self.ac_nos.append(entry["AC #"])
+            self.scenarios.append(entry["Scenario"])
+
+    def frames(self, module):
+        if not self.titles:
+            return pd.DataFrame(columns=STORY_COLUMNS), pd.DataFrame(columns=AC_COLUMNS)
+        epic_codes, epics = pd.factorize(pd.Series(self.epics))
+        id_codes, ids = pd.factorize(pd.Series(self.story_ids))
+        stories = pd.DataFrame({
+            "Module": constant_categorical(module, len(self.titles)),
+            "Epic": pd.Categorical.from_codes(epic_codes, epics),
+            "Story ID": pd.Categorical.from_codes(id_codes, ids),
+            "Story Title": pd.Series(self.titles),
+            "Acceptance Criteria Count": pd.Series(self.ac_counts, dtype="int64"),
+        })
+        if not self.ac_story:
+            return stories, pd.DataFrame(columns=AC_COLUMNS)
+        story = np.asarray(self.ac_story, dtype=np.int64)
+        title_codes, titles = pd.factorize(stories["Story Title"])
+        acs = pd.DataFrame({
+            "Module": constant_categorical(module, len(story)),
+            "Epic": pd.Categorical.from_codes(epic_codes[story], epics),
+            "Story ID": pd.Categorical.from_codes(id_codes[story], ids),
+            "Story Title": pd.Categorical.from_codes(title_codes[story], titles),
+            "AC #": pd.Series(self.ac_nos),
+            "Scenario": pd.Series(self.scenarios),
+        })
+        return stories, acs
+
+# -------- Instrumentation --------
+STAGES = ("load", "module", "walk", "classify", "tables", "frames")
+
+@dataclass
+class ParseStats:
+    """Per-document profile, filled in when passed as ``stats=`` to an extractor.
+
+    ``seconds`` and ``net_blocks`` are per stage: load = opening the package, module =
+    Module detection, walk = block iteration and paragraph text, classify = Epic/Story
+    matching, tables = AC table reading, frames = DataFrame construction.
+
+    ``net_blocks`` is the change in ``sys.getallocatedblocks()`` over the stage: blocks
+    still alive at its end minus those alive at its start. It is not an allocation count
+    (memory freed during the stage cancels out) and is negative when a stage frees more
+    than it keeps.
+    """
+    engine: str = ""
+    seconds: dict = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+    net_blocks: dict = field(default_factory=lambda: dict.fromkeys(STAGES, 0))
+    total_seconds: float = 0.0
+    paragraphs: int = 0
+    tables: int = 0
+    ac_tables: int = 0
+    stories: int = 0
+    acs: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+class StageClock:
+    """Charges the time and net live blocks since the previous ``lap`` to a stage of ``stats``."""
+
+    def __init__(self, stats, engine):
+        self.stats = stats
+        stats.engine = engine
+        self.start = self.t = time.perf_counter()
+        self.blocks = sys.getallocatedblocks()
+
+    def lap(self, stage, counter=None):
+        now, blocks = time.perf_counter(), sys.getallocatedblocks()
+        self.stats.seconds[stage] += now - self.t
+        self.stats.net_blocks[stage] += blocks - self.blocks
+        self.t, self.blocks = now, blocks
+        if counter: setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def finish(self, result):
+        self.lap("frames")
+        self.stats.total_seconds = self.t - self.start
+        self.stats.stories, self.stats.acs = len(result[0]), len(result[1])
+        return result
+
+def extract_user_stories_and_acs(docx_file, stats=None, grammar=None):
+    """``(stories_df, ac_df)`` for one .docx; pass a ``ParseStats`` as ``stats`` to profile the parse.
+
+    ``grammar`` (a name or a ``grammars.Grammar``, default ``"default"``) decides which
+    paragraphs are Epic and Story headings.
+    """
+    from docx import Document  # imported on first parse: python-docx is only needed by the parser
+    from grammars import get_grammar
+    classifier = get_grammar(grammar).classifier()
+    clock = StageClock(stats, "docx") if stats is not None else None
+    doc = Document(docx_file)
+    if clock: clock.lap("load")
 
-    stories, ac_rows = [], []
-    current_epic, current_story = None, None
+    frames = FrameBuilder()
+    modules = ModuleFinder()
+    current_epic = None
 
     for kind, obj in iter_block_items(doc):
         if kind == "p":
             line = (obj.text or "").strip()
+            if clock: clock.lap("walk", "paragraphs")
             if not line: continue
-            em = EPIC_RE.match(line)
-            if em:
-                current_epic = f"{em.group(1)}: {em.group(2).strip()}"
-                continue
-            sm = STORY_RE.match(line)
-            if sm:
-                current_story = {"Module": module, "Epic": current_epic or "Unknown",
-                                 "Story ID": sm.group(1).strip(), "Story Title": sm.group(2).strip(),
-                                 "Acceptance Criteria Count": 0}
-                stories.append(current_story)
-        elif kind == "t" and current_story:
-            is_ac, hdr_idx = looks_like_ac_table(obj)
-            if not is_ac: continue
-            current_story["Acceptance Criteria Count"] += count_ac_rows(obj, hdr_idx)
-            for entry in parse_ac_table_rows_minimal(obj, hdr_idx):
-                ac_rows.append({"Module": current_story["Module"], "Epic": current_story["Epic"],
-                                "Story ID": current_story["Story ID"], "Story Title": current_story["Story Title"],
-                                **entry})
-    return pd.DataFrame(stories), pd.DataFrame(ac_rows)
+            if modules.module is None:
+                modules.feed(line)
+                if clock: clock.lap("module")
+            style = paragraph_style(obj._p) if classifier.uses_styles else None
+            heading, number, title = classifier.classify(line, style)
+            if heading == EPIC:
+                current_epic = f"{number}: {title}"
+            elif heading == STORY:
+                frames.add_story(current_epic or "Unknown", number, title)
+            if clock: clock.lap("classify")
+        elif kind == "t":
+            if clock: clock.lap("walk", "tables")
+            if not frames: continue
+            ac_table = read_ac_table(obj._tbl)
+            if clock: clock.lap("tables", "ac_tables" if ac_table else None)
+            if ac_table is None: continue
+            frames.add_ac_table(*ac_table)
+    # Module is found anywhere in the document, so it is only known once the walk is done.
+    result = frames.frames(modules.module or "Unknown")
+    return clock.finish(result) if clock else result
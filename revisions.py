@@ -0,0 +1,197 @@
+# sections/revisions.py
+"""Incremental re-parse of document revisions, and story / AC diffs between them.
+
+A document is cut into sections at every Epic / Story heading: the heading paragraph
+and the blocks up to the next heading (text before the first heading is a section
+too). A section's fingerprint covers its heading and the XML of its tables, which is
+all extraction reads from it. Parsing a new revision with the previous revision's
+sections reuses the AC tables of every section whose fingerprint is unchanged; only
+edited sections have their tables read again. Hashing a table's XML costs a fraction
+of reading it, and reading tables is the larger part of a parse.
+"""
+import difflib
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+from parsing_helpers import (
+    EPIC, STORY, FrameBuilder, ModuleFinder, StageClock, iter_block_items, paragraph_style, read_ac_table,
+)
+from grammars import get_grammar
+
+@dataclass(frozen=True)
+class Section:
+    fingerprint: str
+    kind: Optional[str]  # EPIC, STORY, or None for the text before the first heading
+    number: str
+    title: str
+    tables: tuple        # (ac_count, entries) per AC table, as read_ac_table returns them
+
+def _section(heading, attached, tables, known):
+    """Close one section; its AC tables are reused from ``known`` when the fingerprint matches."""
+    from lxml import etree
+    h = hashlib.blake2b(repr((heading, attached)).encode(), digest_size=16)
+    for tbl in tables:
+        h.update(etree.tostring(tbl))
+    fingerprint = h.hexdigest()
+    prior = known.get(fingerprint)
+    if prior is not None:
+        ac_tables = prior.tables
+    elif attached:
+        ac_tables = tuple(t for t in map(read_ac_table, tables) if t is not None)
+    else:  # tables before the first story are dropped by extraction, so they are not read
+        ac_tables = ()
+    return Section(fingerprint, *heading, ac_tables)
+
+def _frames(sections, module):
+    frames, epic = FrameBuilder(), None
+    for s in sections:
+        # compared with == because sections may have been pickled across processes
+        if s.kind == EPIC:
+            epic = f"{s.number}: {s.title}"
+        elif s.kind == STORY:
+            frames.add_story(epic or "Unknown", s.number, s.title)
+        for table in s.tables:
+            frames.add_ac_table(*table)
+    return frames.frames(module)
+
+def extract_revision(docx_file, previous=(), stats=None, grammar=None):
+    """``(stories_df, ac_df, sections)`` for one .docx, reusing unchanged sections of ``previous``.
+
+    ``previous`` is the ``sections`` list returned for an earlier revision of the same
+    document (or empty), parsed with the same ``grammar``. The frames equal
+    ``extract_user_stories_and_acs`` output.
+    """
+    from docx import Document
+    classifier = get_grammar(grammar).classifier()
+    clock = StageClock(stats, "revision") if stats is not None else None
+    doc = Document(docx_file)
+    if clock: clock.lap("load")
+
+    known = {s.fingerprint: s for s in previous}
+    modules = ModuleFinder()
+    sections, heading, tables, story_seen = [], (None, "", ""), [], False
+
+    for kind, obj in iter_block_items(doc):
+        if kind == "t":
+            tables.append(obj._tbl)
+            if clock: clock.lap("walk", "tables")
+            continue
+        line = (obj.text or "").strip()
+        if clock: clock.lap("walk", "paragraphs")
+        if not line: continue
+        if modules.module is None:
+            modules.feed(line)
+            if clock: clock.lap("module")
+        found, number, title = classifier.classify(line, paragraph_style(obj._p) if classifier.uses_styles else None)
+        if clock: clock.lap("classify")
+        if found is None: continue
+        sections.append(_section(heading, story_seen, tables, known))
+        if clock: clock.lap("tables")
+        heading, tables = (found, number, title), []
+        story_seen = story_seen or found == STORY
+    sections.append(_section(heading, story_seen, tables, known))
+    if clock:
+        clock.lap("tables")
+        clock.stats.ac_tables = sum(len(s.tables) for s in sections)
+    result = _frames(sections, modules.module or "Unknown")
+    return (*(clock.finish(result) if clock else result), sections)
+
+def reused_sections(sections, previous):
+    """How many of ``sections`` were carried over unchanged from ``previous``."""
+    known = {s.fingerprint for s in previous}
+    return sum(s.fingerprint in known for s in sections)
+
+# -------- Revision diff --------
+STORY_DIFF_COLUMNS = ["Change", "Epic", "Story ID", "Story Title", "Before", "Details"]
+AC_DIFF_COLUMNS = ["Change", "Story ID", "AC #", "Scenario", "Before"]
+ADDED, REMOVED, CHANGED = "added", "removed", "changed"
+
+@dataclass
+class RevisionDiff:
+    stories: pd.DataFrame
+    acs: pd.DataFrame
+
+    def counts(self):
+        """``{"stories": {change: n}, "acs": {change: n}}`` for every change kind."""
+        return {name: {c: int((df["Change"] == c).sum()) for c in (ADDED, REMOVED, CHANGED)}
+                for name, df in (("stories", self.stories), ("acs", self.acs))}
+
+    def __bool__(self):
+        return not (self.stories.empty and self.acs.empty)
+
+def _story_records(df):
+    """``{(story id, occurrence): (epic, title, ac count)}`` in document order."""
+    out, seen = {}, {}
+    for epic, sid, title, count in df.reindex(
+            columns=["Epic", "Story ID", "Story Title", "Acceptance Criteria Count"]).itertuples(index=False, name=None):
+        n = seen[sid] = seen.get(sid, 0) + 1
+        out[sid, n] = (epic, title, count)
+    return out
+
+def _ac_lists(df):
+    """``{story id: [(AC #, scenario), ...]}``; ACs of stories sharing an ID are compared as one list."""
+    out = {}
+    for sid, ac_no, scenario in df.reindex(columns=["Story ID", "AC #", "Scenario"]).itertuples(index=False, name=None):
+        out.setdefault(sid, []).append((ac_no, scenario))
+    return out
+
+def _diff_acs(sid, old, new, rows):
+    """Append AC change rows for one story ID; returns ``{change: n}``."""
+    counts = dict.fromkeys((ADDED, REMOVED, CHANGED), 0)
+    # aligned on scenario text: ACs renumbered around an insertion or removal are not changes
+    matcher = difflib.SequenceMatcher(None, [s for _, s in old], [s for _, s in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal": continue
+        paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for k in range(paired):
+            (_, before), (ac_no, scenario) = old[i1 + k], new[j1 + k]
+            rows.append((CHANGED, sid, ac_no, scenario, before))
+        for ac_no, scenario in old[i1 + paired:i2]:
+            rows.append((REMOVED, sid, ac_no, scenario, ""))
+        for ac_no, scenario in new[j1 + paired:j2]:
+            rows.append((ADDED, sid, ac_no, scenario, ""))
+        counts[CHANGED] += paired
+        counts[REMOVED] += i2 - i1 - paired
+        counts[ADDED] += j2 - j1 - paired
+    return counts
+
+def diff_revisions(old, new):
+    """Stories and ACs added, removed or changed between two ``(stories_df, ac_df)`` revisions.
+
+    Stories are matched on Story ID (the n-th story with an ID matches the n-th one in the
+    other revision); the scenarios under each Story ID are aligned as sequences, so an
+    inserted AC shows up as one addition rather than as every later (renumbered) AC changing.
+    """
+    old_stories, new_stories = _story_records(old[0]), _story_records(new[0])
+    old_acs, new_acs = _ac_lists(old[1]), _ac_lists(new[1])
+
+    ac_rows, ac_changes = [], {}
+    for sid in dict.fromkeys([*new_acs, *old_acs]):
+        before, after = old_acs.get(sid, []), new_acs.get(sid, [])
+        if [s for _, s in before] != [s for _, s in after]:
+            ac_changes[sid] = _diff_acs(sid, before, after, ac_rows)
+
+    story_rows = []
+    for key, (epic, title, count) in new_stories.items():
+        if key not in old_stories:
+            story_rows.append((ADDED, epic, key[0], title, "", f"{count} AC(s)"))
+            continue
+        old_epic, old_title, old_count = old_stories[key]
+        details = []
+        if epic != old_epic: details.append(f"epic was {old_epic}")
+        if count != old_count: details.append(f"AC count {old_count} → {count}")
+        # AC edits are reported on the first story with the ID
+        ac = ac_changes.get(key[0]) if key[1] == 1 else None
+        if ac: details.append(" ".join(f"{n} {c}" for c, n in ac.items() if n) + " AC(s)")
+        if title != old_title or details:
+            story_rows.append((CHANGED, epic, key[0], title, old_title if title != old_title else "",
+                               "; ".join(details) or "title"))
+    for key, (epic, title, count) in old_stories.items():
+        if key not in new_stories:
+            story_rows.append((REMOVED, epic, key[0], title, "", f"{count} AC(s)"))
+
+    return RevisionDiff(pd.DataFrame(story_rows, columns=STORY_DIFF_COLUMNS),
+                        pd.DataFrame(ac_rows, columns=AC_DIFF_COLUMNS))
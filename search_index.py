@@ -0,0 +1,129 @@
+# sections/search_index.py
+"""In-memory inverted index over story titles and AC scenarios.
+
+Built once per parsed corpus, then every keystroke in the search box is a handful of
+numpy set operations instead of a regex scan over every row:
+
+- terms are lower-cased word tokens; every query term is also a prefix ("pay" matches
+  "payment", "payments"),
+- all query terms must match (AND),
+- results are ranked by summed tf-idf of the matched terms.
+"""
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+class InvertedIndex:
+    """Token -> (row positions, term frequencies) for one column of texts."""
+
+    def __init__(self, texts):
+        postings = defaultdict(dict)
+        n_rows = 0
+        for row, text in enumerate(texts):
+            n_rows += 1
+            if not isinstance(text, str): continue
+            for token in tokenize(text):
+                tf = postings[token]
+                tf[row] = tf.get(row, 0) + 1
+        self.n_rows = n_rows
+        self.vocab = sorted(postings)
+        self._rows, self._weights = {}, {}
+        for token in self.vocab:
+            tf = postings[token]
+            idf = np.log1p(n_rows / len(tf))
+            self._rows[token] = np.fromiter(tf.keys(), dtype=np.int64, count=len(tf))
+            self._weights[token] = np.fromiter(tf.values(), dtype=np.float64, count=len(tf)) * idf
+
+    def _expand(self, prefix):
+        """Vocabulary terms starting with ``prefix``."""
+        start = bisect_left(self.vocab, prefix)
+        end = bisect_left(self.vocab, prefix + "\U0010ffff")
+        return self.vocab[start:end]
+
+    def term_scores(self, prefix):
+        """Dense per-row score of the terms starting with ``prefix`` (0 where none occurs)."""
+        terms = self._expand(prefix)
+        if len(terms) == 1:
+            scores = np.zeros(self.n_rows)
+            scores[self._rows[terms[0]]] = self._weights[terms[0]]
+            return scores
+        if not terms:
+            return np.zeros(self.n_rows)
+        rows = np.concatenate([self._rows[t] for t in terms])
+        weights = np.concatenate([self._weights[t] for t in terms])
+        return np.bincount(rows, weights=weights, minlength=self.n_rows)
+
+    def search(self, query):
+        """Rows matching every query term, as ``(rows, scores)`` sorted by descending score.
+
+        Returns ``None`` when the query has no word tokens. Scores are kept as dense
+        per-row vectors, so the cost is bounded by the row count even for short prefixes.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+        total = None
+        for term in dict.fromkeys(terms):
+            scores = self.term_scores(term)
+            total = scores if total is None else np.where((scores > 0) & (total > 0), total + scores, 0.0)
+        rows = np.flatnonzero(total)
+        scores = total[rows]
+        order = np.lexsort((rows, -scores))
+        return rows[order], scores[order]
+
+class CorpusSearch:
+    """Title and scenario indexes for one ``(stories_df, ac_df)`` pair.
+
+    ``search_stories`` matches a story if its title matches the query or one of its ACs'
+    scenarios does (ACs are tied to stories by ``(Source File, Story ID)``).
+    """
+
+    def __init__(self, stories_df, ac_df):
+        self.titles = InvertedIndex(stories_df["Story Title"].tolist() if "Story Title" in stories_df else [])
+        self.scenarios = InvertedIndex(ac_df["Scenario"].tolist() if "Scenario" in ac_df else [])
+        key_cols = [c for c in ("Source File", "Story ID") if c in stories_df]
+        self.story_keys = list(stories_df[key_cols].itertuples(index=False, name=None))
+        self._ac_story = None
+        if key_cols and all(c in ac_df for c in key_cols) and not ac_df.empty:
+            positions = dict(zip(self.story_keys, range(len(self.story_keys))))
+            self._ac_story = np.fromiter(
+                (positions.get(k, -1) for k in ac_df[key_cols].itertuples(index=False, name=None)),
+                dtype=np.int64, count=len(ac_df))
+
+    def search_acs(self, query):
+        return self.scenarios.search(query)
+
+    def search_stories(self, query):
+        """Story row positions matching ``query``, best match first, or ``None`` for an empty query."""
+        title_hits = self.titles.search(query)
+        if title_hits is None:
+            return None
+        rows, scores = title_hits
+        ac_hits = self.scenarios.search(query) if self._ac_story is not None else None
+        if ac_hits is not None and ac_hits[0].size:
+            ac_rows = self._ac_story[ac_hits[0]]
+            keep = ac_rows >= 0
+            rows = np.concatenate([rows, ac_rows[keep]])
+            scores = np.concatenate([scores, ac_hits[1][keep]])
+            rows, inverse = np.unique(rows, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+            order = np.lexsort((rows, -scores))
+            rows = rows[order]
+        return rows
+
+    def story_rank(self, query):
+        """``{(Source File, Story ID): rank}`` for stories matching ``query`` (0 = best), or ``None``."""
+        rows = self.search_stories(query)
+        if rows is None:
+            return None
+        rank = {}
+        for r in rows.tolist():
+            rank.setdefault(self.story_keys[r], len(rank))
+        return rank
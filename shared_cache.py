@@ -0,0 +1,172 @@
+# sections/shared_cache.py
+"""Parse results shared by every session and process on a host (or on a shared volume).
+
+``ArrowFileCache`` stores each parsed document as two Arrow IPC files,
+``<hash>-p<PARSER_VERSION>.stories.arrow`` and ``.acs.arrow``. Files are written under
+a temp name and renamed into place, so readers never see a partial entry. Reads
+memory-map the files, so every process shares the same OS page cache. Categorical
+codes point into the mapping; string columns do too with pandas 3's Arrow-backed
+strings, while pandas 2 copies them into Python objects on read. Reading
+an entry touches its mtime, which serves as its last-access time; once the directory
+holds more than ``max_bytes``, the least recently used entries are deleted.
+
+``ResultCache`` is the interface. ``open_shared_cache`` picks the backend from
+``STORYSTRUCT_SHARED_CACHE``: a directory (default ``storystruct_cache``), ``off``,
+or ``package.module:factory`` for a custom backend (a factory returning a ``ResultCache``).
+"""
+import abc
+import importlib
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from exports import arrow_table
+from parsing_helpers import AC_COLUMNS, PARSER_VERSION, STORY_COLUMNS
+
+DEFAULT_CACHE_DIR = "storystruct_cache"
+DEFAULT_MAX_MB = 2048
+TABLES = {"stories": STORY_COLUMNS, "acs": AC_COLUMNS}
+_STALE_TMP_SECONDS = 3600  # temp files this old were left by a writer that died
+_FACTORY_RE = re.compile(r"^[A-Za-z_][\w.]*:[A-Za-z_]\w*$")
+
+class ResultCache(abc.ABC):
+    """``(stories_df, ac_df)`` per document hash, readable by every session and process.
+
+    ``put`` is best-effort: a backend that cannot store an entry returns ``False`` rather
+    than raising, so a full or unreachable cache never breaks parsing.
+    """
+
+    @abc.abstractmethod
+    def get(self, doc_hash):
+        """The cached frames, or ``None``."""
+
+    @abc.abstractmethod
+    def put(self, doc_hash, stories_df, ac_df) -> bool:
+        """Store the frames; ``False`` if the entry could not be stored."""
+
+    def __contains__(self, doc_hash):
+        return self.get(doc_hash) is not None
+
+class ArrowFileCache(ResultCache):
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1_000_000):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, doc_hash, table):
+        return os.path.join(self.directory, f"{doc_hash}-p{PARSER_VERSION}.{table}.arrow")
+
+    def __contains__(self, doc_hash):
+        return all(os.path.exists(self._path(doc_hash, t)) for t in TABLES)
+
+    @staticmethod
+    def _read(path, columns):
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        # the table's buffers keep the mapping alive after the file handle is closed
+        return table.to_pandas() if table.num_rows else pd.DataFrame(columns=columns)
+
+    def get(self, doc_hash):
+        paths = [self._path(doc_hash, t) for t in TABLES]
+        try:
+            frames = tuple(self._read(path, columns) for path, columns in zip(paths, TABLES.values()))
+            now = time.time()
+            for path in paths:
+                os.utime(path, (now, now))
+        except FileNotFoundError:  # not cached, or evicted by another process mid-read
+            self.misses += 1
+            return None
+        except (OSError, pa.ArrowException):  # unreadable entry: drop it, the document gets parsed again
+            self.remove(doc_hash)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return frames
+
+    def put(self, doc_hash, stories_df, ac_df) -> bool:
+        try:
+            for table, df in zip(TABLES, (stories_df, ac_df)):
+                path = self._path(doc_hash, table)
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                data = arrow_table(df)
+                try:
+                    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, data.schema) as writer:
+                        writer.write_table(data)
+                    os.replace(tmp, path)
+                finally:
+                    if os.path.exists(tmp): os.remove(tmp)
+        except (OSError, pa.ArrowException):
+            return False
+        self.evict()
+        return True
+
+    def remove(self, doc_hash):
+        for table in TABLES:
+            try:
+                os.remove(self._path(doc_hash, table))
+            except OSError:
+                pass
+
+    def _entries(self):
+        """``{doc_hash: [bytes, last access]}`` for every entry of this parser version."""
+        entries, suffix, now = {}, f"-p{PARSER_VERSION}", time.time()
+        with os.scandir(self.directory) as it:
+            for e in it:
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                if e.name.endswith(".tmp"):
+                    if now - st.st_mtime > _STALE_TMP_SECONDS:
+                        try: os.remove(e.path)
+                        except OSError: pass
+                    continue
+                table = next((t for t in TABLES if e.name.endswith(f".{t}.arrow")), None)
+                if table is None: continue
+                key = e.name[:-len(f".{table}.arrow")]
+                if not key.endswith(suffix):  # written by another parser version: never read again
+                    try: os.remove(e.path)
+                    except OSError: pass
+                    continue
+                entry = entries.setdefault(key[:-len(suffix)], [0, 0.0])
+                entry[0] += st.st_size
+                entry[1] = max(entry[1], st.st_mtime)
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``; returns how many."""
+        entries = self._entries()
+        total = sum(size for size, _ in entries.values())
+        evicted = 0
+        for doc_hash, (size, _) in sorted(entries.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes: break
+            self.remove(doc_hash)  # POSIX readers that mapped the files keep their data
+            total -= size
+            evicted += 1
+        return evicted
+
+    @property
+    def stats(self):
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for size, _ in entries.values()),
+                "hits": self.hits, "misses": self.misses}
+
+def open_shared_cache(spec=None):
+    """Shared cache configured by ``spec`` (default: ``$STORYSTRUCT_SHARED_CACHE``); ``None`` when off.
+
+    The size limit of the directory backend comes from ``$STORYSTRUCT_SHARED_CACHE_MB``.
+    """
+    spec = os.environ.get("STORYSTRUCT_SHARED_CACHE", DEFAULT_CACHE_DIR) if spec is None else spec
+    if not spec or spec.lower() == "off":
+        return None
+    if _FACTORY_RE.match(spec):
+        module, _, factory = spec.partition(":")
+        return getattr(importlib.import_module(module), factory)()
+    max_mb = float(os.environ.get("STORYSTRUCT_SHARED_CACHE_MB", DEFAULT_MAX_MB))
+    return ArrowFileCache(spec, int(max_mb * 1_000_000))
@@ -0,0 +1,92 @@
+# sections/stream_parser.py
+"""Streaming extraction engine.
+
+Reads ``word/document.xml`` straight out of the .docx zip with ``lxml.etree.iterparse``
+and applies the Epic/Story/AC rules from ``parsing_helpers`` to each top-level
+paragraph or table as it closes, then clears it. No python-docx object model is
+built, so peak memory depends on the largest single table rather than the document.
+
+Text is read with the same rules python-docx uses (runs and hyperlinks, tabs, line
+breaks, merged cells), so the DataFrames match ``extract_user_stories_and_acs``.
+"""
+import posixpath
+import zipfile
+
+from lxml import etree
+
+from parsing_helpers import (
+    EPIC, STORY, W_BODY, W_P, W_TBL, FrameBuilder, ModuleFinder, StageClock, paragraph_style, paragraph_text,
+    read_ac_table,
+)
+from grammars import get_grammar
+
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+# -------- Zip / XML streaming --------
+def _main_document_part(zf):
+    """Zip member name of the main document part, resolved through ``_rels/.rels``."""
+    try:
+        rels = etree.fromstring(zf.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iterchildren(f"{{{REL_NS}}}Relationship"):
+        if rel.get("Type") == OFFICE_DOCUMENT_REL:
+            return posixpath.normpath(rel.get("Target").lstrip("/"))
+    return "word/document.xml"
+
+def iter_body_blocks(docx_file):
+    """Yield ``("p", w:p)`` and ``("t", w:tbl)`` for each top-level block of the body, in order.
+
+    Each element is complete when yielded and is cleared (and dropped from the tree)
+    as soon as the consumer asks for the next one.
+    """
+    with zipfile.ZipFile(docx_file) as zf, zf.open(_main_document_part(zf)) as xml:
+        for _, el in etree.iterparse(xml, events=("end",), tag=(W_P, W_TBL),
+                                     resolve_entities=False, huge_tree=True):
+            parent = el.getparent()
+            if parent is None or parent.tag != W_BODY:
+                continue
+            yield ("p" if el.tag == W_P else "t", el)
+            el.clear(keep_tail=True)
+            while el.getprevious() is not None:
+                del parent[0]
+
+# -------- Extraction --------
+def extract_user_stories_and_acs_streaming(docx_file, stats=None, grammar=None):
+    """Streaming counterpart of ``extract_user_stories_and_acs`` with identical output.
+
+    No separate "load" stage here: the package is read as the walk proceeds.
+    """
+    classifier = get_grammar(grammar).classifier()
+    clock = StageClock(stats, "stream") if stats is not None else None
+    frames = FrameBuilder()
+    modules = ModuleFinder()
+    current_epic = None
+
+    for kind, obj in iter_body_blocks(docx_file):
+        if kind == "p":
+            line = paragraph_text(obj).strip()
+            if clock: clock.lap("walk", "paragraphs")
+            if not line: continue
+            if modules.module is None:
+                modules.feed(line)
+                if clock: clock.lap("module")
+            style = paragraph_style(obj) if classifier.uses_styles else None
+            heading, number, title = classifier.classify(line, style)
+            if heading == EPIC:
+                current_epic = f"{number}: {title}"
+            elif heading == STORY:
+                frames.add_story(current_epic or "Unknown", number, title)
+            if clock: clock.lap("classify")
+        elif kind == "t":
+            if clock: clock.lap("walk", "tables")
+            if not frames: continue
+            ac_table = read_ac_table(obj)
+            if clock: clock.lap("tables", "ac_tables" if ac_table else None)
+            if ac_table is None: continue
+            frames.add_ac_table(*ac_table)
+
+    # Module is found anywhere in the document, so it is only known once the walk is done.
+    result = frames.frames(modules.module or "Unknown")
+    return clock.finish(result) if clock else result
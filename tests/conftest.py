@@ -0,0 +1,64 @@
+# tests/conftest.py
+"""Shared fixtures: the repo root on ``sys.path``, a builder for small .docx files and the
+engine parity check."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+HEADER = ["Sr. No", "Scenario", "Acceptance Criteria"]  # header row of an AC table
+
+def p(text, style=None):
+    """One ``w:p`` with a single run (``text`` is inserted as-is, so it may hold markup)."""
+    props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f'<w:p>{props}<w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+def tc(content, span=1, vmerge=None):
+    props = (f'<w:gridSpan w:val="{span}"/>' if span > 1 else "") + \
+        (f'<w:vMerge w:val="{vmerge}"/>' if vmerge == "restart" else "<w:vMerge/>" if vmerge else "")
+    body = content if content.startswith("<") else p(content)
+    return f"<w:tc><w:tcPr>{props}</w:tcPr>{body}</w:tc>"
+
+def tbl(*rows, cols=3):
+    """A ``w:tbl``; each row is a list of ``tc`` strings (or plain texts)."""
+    grid = "".join('<w:gridCol w:w="1400"/>' for _ in range(cols))
+    trs = "".join("<w:tr>" + "".join(c if c.startswith("<w:tc>") else tc(c) for c in row) + "</w:tr>"
+                  for row in rows)
+    return f"<w:tbl><w:tblPr/><w:tblGrid>{grid}</w:tblGrid>{trs}</w:tbl>"
+
+@pytest.fixture
+def make_docx(tmp_path):
+    """``make_docx(*blocks)`` writes a .docx whose body is the given XML blocks and returns its path."""
+    from docx import Document
+    from lxml import etree
+
+    def make(*blocks, name="doc.docx"):
+        doc = Document()
+        body = doc.element.body
+        sect_pr = body.sectPr
+        body.remove(sect_pr)
+        fragment = etree.fromstring(f'<w:body xmlns:w="{W_NS}">{"".join(blocks)}</w:body>')
+        body.extend(list(fragment))
+        body.append(sect_pr)
+        path = tmp_path / name
+        doc.save(path)
+        return str(path)
+    return make
+
+def assert_parity(path, grammar=None):
+    """Frames of the python-docx engine, checked equal to the streaming engine's and
+    ``extract_revision``'s; returns ``(stories_df, ac_df)``."""
+    import pandas as pd
+    from parsing_helpers import extract_user_stories_and_acs
+    from revisions import extract_revision
+    from stream_parser import extract_user_stories_and_acs_streaming
+
+    expected = extract_user_stories_and_acs(path, grammar=grammar)
+    for actual in (extract_user_stories_and_acs_streaming(path, grammar=grammar),
+                   extract_revision(path, grammar=grammar)[:2]):
+        for e, a in zip(expected, actual):
+            pd.testing.assert_frame_equal(a, e)
+    return expected
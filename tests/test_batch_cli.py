@@ -0,0 +1,44 @@
+"""A fresh batch run replaces earlier results; only ``--resume`` appends to them."""
+import json
+
+import pandas as pd
+import pytest
+
+from batch_cli import MANIFEST, main
+from conftest import HEADER, p, tbl
+
+@pytest.fixture
+def corpus(make_docx, tmp_path):
+    make_docx(p("Epic 1: One"), p("User Story 1.1: First"), tbl(HEADER, ["1", "A", "Given a"]), name="a.docx")
+    make_docx(p("Epic 2: Two"), p("User Story 2.1: Second"), tbl(HEADER, ["1", "B", "Given b"], ["2", "C", "Given c"]),
+              name="b.docx")
+    return tmp_path
+
+def manifest_paths(out):
+    with open(out / MANIFEST, encoding="utf-8") as fh:
+        return [json.loads(line)["path"] for line in fh if line.strip()]
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_rerun_replaces_previous_results(corpus, tmp_path, fmt):
+    out = tmp_path / "out"
+    for _ in range(2):
+        assert main([str(corpus / "a.docx"), str(corpus / "b.docx"), "-o", str(out), "-f", fmt, "-q", "-j", "1"]) == 0
+    read = pd.read_csv if fmt == "csv" else lambda path: pd.read_json(path, lines=True)
+    assert len(read(out / f"stories.{fmt}")) == 2
+    assert len(read(out / f"acs.{fmt}")) == 3
+    assert len(manifest_paths(out)) == 2
+
+def test_rerun_replaces_parquet_parts(corpus, tmp_path):
+    out = tmp_path / "out"
+    args = [str(corpus / "a.docx"), str(corpus / "b.docx"), "-o", str(out), "-f", "parquet", "-q", "-j", "1"]
+    main(args)
+    main(args)
+    assert sorted(f.name for f in (out / "stories").iterdir()) == ["part-0000.parquet"]
+    assert len(pd.read_parquet(out / "acs")) == 3
+
+def test_resume_appends_only_new_files(corpus, tmp_path):
+    out = tmp_path / "out"
+    main([str(corpus / "a.docx"), "-o", str(out), "-q", "-j", "1"])
+    main([str(corpus / "a.docx"), str(corpus / "b.docx"), "-o", str(out), "-q", "-j", "1", "--resume"])
+    assert list(pd.read_csv(out / "stories.csv")["Story ID"].astype(str)) == ["1.1", "2.1"]
+    assert len(manifest_paths(out)) == 2
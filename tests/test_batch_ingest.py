@@ -0,0 +1,63 @@
+# tests/test_batch_ingest.py
+"""Parsing several documents: serial by default, the same results on a process pool, and
+background queues sharing one executor."""
+import pandas as pd
+
+from batch_ingest import POOL_START_METHOD, IngestQueue, ingest_documents, parse_documents, process_pool
+from conftest import HEADER, p, tbl
+
+def docs(make_docx):
+    paths = [make_docx(p(f"Epic {i}: E{i}"), p(f"User Story {i}.1: S{i}"), tbl(HEADER, ["1", f"A{i}", "Given"]),
+                       name=f"d{i}.docx") for i in range(1, 4)]
+    return [(f"d{i}.docx", path) for i, path in enumerate(paths, 1)] + [("broken.docx", b"not a docx")]
+
+def test_pools_never_fork():
+    assert POOL_START_METHOD in ("forkserver", "spawn")
+    with process_pool(1) as pool:
+        assert pool._mp_context.get_start_method() == POOL_START_METHOD
+
+def test_serial_by_default_and_pool_gives_the_same_results(make_docx):
+    serial = ingest_documents(docs(make_docx))
+    pooled = ingest_documents(docs(make_docx), max_workers=2)
+    for a, b in zip(serial[:2], pooled[:2]):
+        pd.testing.assert_frame_equal(a, b)
+    assert list(serial[0]["Source File"]) == ["d1.docx", "d2.docx", "d3.docx"]
+    assert [name for name, _ in serial[2]] == [name for name, _ in pooled[2]] == ["broken.docx"]
+
+def test_results_keep_input_order(make_docx):
+    results = parse_documents(docs(make_docx))
+    assert [r.name for r in results] == ["d1.docx", "d2.docx", "d3.docx", "broken.docx"]
+    assert [r.ok for r in results] == [True, True, True, False]
+
+def test_ingest_queue_shares_an_executor_it_does_not_own(make_docx):
+    from concurrent.futures import ThreadPoolExecutor
+    (name, path), *_ = docs(make_docx)
+    with open(path, "rb") as fh:
+        data = fh.read()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first, second = IngestQueue(executor), IngestQueue(executor)
+        first.submit("h1", name, data)
+        first.submit("h1", name, data)  # already queued: a no-op
+        second.submit("h2", name, data)
+        first.jobs["h1"].future.result()
+        second.jobs["h2"].future.result()
+        assert [(h, r.ok) for h, r in first.drain()] == [("h1", True)]
+        assert first.drain() == []
+        first.close()
+        assert executor.submit(len, "still open").result() == 10
+        assert [h for h, _ in second.drain()] == ["h2"]
+
+def test_queued_jobs_are_cancelled_when_the_queue_goes_away(make_docx):
+    import gc
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    release = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(release.wait)  # keep the only worker busy
+        queue = IngestQueue(executor)
+        queue.submit("h", "x.docx", b"not a docx")
+        future = queue.jobs["h"].future
+        del queue  # e.g. its Streamlit session ended
+        gc.collect()
+        assert future.cancelled()
+        release.set()
@@ -0,0 +1,62 @@
+"""Results bundles must round-trip the merged stories / AC frames the step-2 view shows."""
+import pandas as pd
+import pytest
+
+from batch_ingest import merge_results
+from conftest import HEADER, p, tbl
+from exports import bundle_bytes, parquet_bytes, read_bundle
+from parsing_helpers import AC_COLUMNS, STORY_COLUMNS, extract_user_stories_and_acs
+
+@pytest.fixture
+def corpus(make_docx):
+    a = make_docx(p("Module: Payments"), p("Epic 1: Payments"), p("User Story 1.1: Add UPI"),
+                  tbl(HEADER, ["1", "Navigate", "Given x"], ["2", "Add", "Given y"]),
+                  p("User Story 1.2: Remove UPI"), tbl(HEADER, ["1", "Remove", "Given z"]), name="a.docx")
+    b = make_docx(p("Module: Reports"), p("Epic 2: Reports"), p("User Story 2.1: Export"),
+                  tbl(HEADER, ["1", "Export", "Given w"]), p("User Story 2.2: No ACs"), name="b.docx")
+    return merge_results((name, *extract_user_stories_and_acs(path)) for name, path in (("a.docx", a), ("b.docx", b)))
+
+def pruned(df):
+    """``df`` as a bundle returns it: a fresh index and only the categories some row uses."""
+    df = df.reset_index(drop=True)
+    return df.assign(**{c: df[c].cat.remove_unused_categories()
+                        for c in df if isinstance(df[c].dtype, pd.CategoricalDtype)})
+
+def test_round_trip_keeps_values_and_dtypes(corpus):
+    stories, acs = corpus
+    s_back, ac_back = read_bundle(bundle_bytes(stories, acs))
+    pd.testing.assert_frame_equal(s_back, stories)
+    # Story 2.2 has no ACs, so its ID is not among the AC frame's categories any more
+    pd.testing.assert_frame_equal(ac_back, pruned(acs))
+    for df in (s_back, ac_back):
+        for column in ("Module", "Epic", "Source File"):
+            assert isinstance(df[column].dtype, pd.CategoricalDtype), column
+    assert s_back["Acceptance Criteria Count"].dtype == "int64"
+    assert list(s_back["Acceptance Criteria Count"]) == [2, 1, 1, 0]
+
+def test_round_trip_of_a_filtered_slice(corpus):
+    stories, acs = corpus
+    s_slice, ac_slice = stories[stories["Source File"] == "b.docx"], acs[acs["Module"] == "Reports"]
+    s_back, ac_back = read_bundle(bundle_bytes(s_slice, ac_slice))
+    pd.testing.assert_frame_equal(s_back, pruned(s_slice))
+    pd.testing.assert_frame_equal(ac_back, pruned(ac_slice))
+    assert list(s_back["Source File"].cat.categories) == ["b.docx"]
+
+def test_round_trip_of_empty_frames():
+    stories = pd.DataFrame(columns=STORY_COLUMNS + ["Source File"])
+    acs = pd.DataFrame(columns=AC_COLUMNS + ["Source File"])
+    s_back, ac_back = read_bundle(bundle_bytes(stories, acs))
+    assert s_back.empty and list(s_back.columns) == list(stories.columns)
+    assert ac_back.empty and list(ac_back.columns) == list(acs.columns)
+
+def test_plain_string_columns_come_back_categorical(corpus):
+    stories, acs = corpus
+    plain = stories.astype({c: object for c in ("Module", "Epic", "Story ID", "Source File")})
+    s_back, _ = read_bundle(bundle_bytes(plain, acs))
+    pd.testing.assert_frame_equal(s_back, stories, check_categorical=False)
+    assert isinstance(s_back["Module"].dtype, pd.CategoricalDtype)
+
+@pytest.mark.parametrize("data", [b"not a zip", parquet_bytes(pd.DataFrame({"a": [1]}))])
+def test_other_files_are_rejected(data):
+    with pytest.raises(ValueError, match="not a StoryStruct results bundle"):
+        read_bundle(data)
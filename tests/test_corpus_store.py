@@ -0,0 +1,87 @@
+"""Corpus store: documents are replaced by hash or explicit revision link, never by file name,
+and each owner only sees the documents they saved."""
+import pandas as pd
+import pytest
+
+from corpus_store import CorpusStore, open_corpus_store
+from parsing_helpers import AC_COLUMNS, STORY_COLUMNS
+
+def frames(story_id, title):
+    stories = pd.DataFrame([["M", "Epic 1", story_id, title, 1]], columns=STORY_COLUMNS)
+    acs = pd.DataFrame([["M", "Epic 1", story_id, title, "1", f"{title} scenario"]], columns=AC_COLUMNS)
+    return stories, acs
+
+@pytest.fixture
+def store(tmp_path):
+    store = CorpusStore(str(tmp_path / "corpus.db"), owner="alice")
+    yield store
+    store.close()
+
+def test_same_named_documents_both_survive(store):
+    store.upsert_document("hash-a", "spec.docx", *frames("1.1", "From folder A"))
+    store.upsert_document("hash-b", "spec.docx", *frames("2.1", "From folder B"))
+    store.upsert_document("hash-a-headings", "spec.docx", *frames("1.1", "From folder A"))
+    assert len(store) == 3
+    stories, acs = store.load()
+    assert list(stories["Story Title"]) == ["From folder A", "From folder B", "From folder A"]
+    assert len(acs) == 3
+
+def test_revision_replaces_only_the_documents_it_names(store):
+    store.upsert_document("v1", "spec.docx", *frames("1.1", "First draft"))
+    store.upsert_document("other", "spec.docx", *frames("9.1", "Unrelated"))
+    store.upsert_document("v2", "spec.docx", *frames("1.1", "Second draft"), replaces=("v1",))
+    assert not store.has_document("v1")
+    assert store.has_document("other") and store.has_document("v2")
+    assert sorted(store.load()[0]["Story Title"]) == ["Second draft", "Unrelated"]
+
+def test_upsert_same_hash_replaces_rows(store):
+    store.upsert_document("h", "spec.docx", *frames("1.1", "Old"))
+    store.upsert_document("h", "spec.docx", *frames("1.1", "New"), replaces=("h",))
+    assert len(store) == 1
+    assert list(store.load()[1]["Scenario"]) == ["New scenario"]
+
+def test_owners_only_see_their_own_documents(store):
+    bob = CorpusStore(store.path, owner="bob")
+    store.upsert_document("shared", "spec.docx", *frames("1.1", "Shared"))
+    store.upsert_document("private", "notes.docx", *frames("2.1", "Alice only"))
+    bob.upsert_document("shared", "spec.docx", *frames("1.1", "Shared"))
+    assert len(store) == 2 and len(bob) == 1
+    assert list(bob.load()[0]["Story Title"]) == ["Shared"]
+    assert list(bob.documents()["Source File"]) == ["spec.docx"]
+    assert bob.has_document("private")  # parse results stay shared by hash
+    bob.close()
+
+def test_remove_and_replace_only_affect_this_owner(store):
+    bob = CorpusStore(store.path, owner="bob")
+    store.upsert_document("v1", "spec.docx", *frames("1.1", "First draft"))
+    bob.upsert_document("v1", "spec.docx", *frames("1.1", "First draft"))
+    store.upsert_document("v2", "spec.docx", *frames("1.1", "Second draft"), replaces=("v1",))
+    assert list(bob.load()[0]["Story Title"]) == ["First draft"]
+    bob.remove_document("v1")
+    assert len(bob) == 0 and not store.has_document("v1")  # nobody owns it any more
+    store.remove_document("v2")
+    assert len(store) == 0 and not store.has_document("v2")
+    bob.close()
+
+def test_link_document_adds_a_stored_document(store):
+    bob = CorpusStore(store.path, owner="bob")
+    store.upsert_document("h", "spec.docx", *frames("1.1", "Shared"))
+    assert bob.link_document("h") and not bob.link_document("missing")
+    assert list(bob.load()[1]["Scenario"]) == ["Shared scenario"]
+    bob.close()
+
+def test_oldest_documents_are_evicted_beyond_the_limit(tmp_path):
+    store = CorpusStore(str(tmp_path / "corpus.db"), owner="alice", max_documents=2)
+    for n in range(3):
+        store.upsert_document(f"h{n}", f"spec{n}.docx", *frames(f"{n}.1", f"Doc {n}"))
+    assert [store.has_document(f"h{n}") for n in range(3)] == [False, True, True]
+    assert list(store.documents()["Source File"]) == ["spec1.docx", "spec2.docx"]
+    store.close()
+
+def test_off_keeps_the_store_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = open_corpus_store("alice", path="off")
+    store.upsert_document("h", "spec.docx", *frames("1.1", "Kept in memory"))
+    assert len(store) == 1 and store.path == ":memory:"
+    assert list(tmp_path.iterdir()) == []
+    store.close()
@@ -0,0 +1,57 @@
+"""Near-duplicate detection: planted duplicates cluster, unrelated text does not, and only
+changed documents are hashed again."""
+import numpy as np
+import pandas as pd
+
+from dedup import EMPTY, SignatureCache, corpus_signatures, duplicate_clusters, minhash
+
+def sentence(seed, n=20):
+    rng = np.random.default_rng(seed)
+    return " ".join(f"w{i}" for i in rng.integers(0, 5_000, size=n))
+
+def reworded(text, position=10):
+    words = text.split()
+    words[position] = "changed"
+    return " ".join(words)
+
+def corpus():
+    base = [sentence(i) for i in range(6)]
+    scenarios = {
+        "a.docx": [base[0], base[1], base[2], ""],
+        "b.docx": [base[3], base[0], reworded(base[1])],  # a verbatim and a one-word-changed copy
+        "c.docx": [base[4], base[5], ""],
+    }
+    return pd.DataFrame([(name, s) for name, texts in scenarios.items() for s in texts],
+                        columns=["Source File", "Scenario"])
+
+def test_planted_duplicates_cluster_and_unrelated_rows_do_not():
+    frame = corpus()
+    clusters = duplicate_clusters(frame, corpus_signatures(frame, "Scenario"))
+    groups = clusters.groupby("Cluster")["Scenario"].apply(set).tolist()
+    assert groups == [{frame["Scenario"][0]}, {frame["Scenario"][1], frame["Scenario"][6]}]
+    assert list(clusters["Size"]) == [2, 2, 2, 2]
+    exact = clusters[clusters["Cluster"] == 1]["Similarity"]
+    assert list(exact) == [1.0, 1.0]
+    near = clusters[clusters["Cluster"] == 2]["Similarity"].iloc[1]
+    assert 0.7 <= near < 1.0
+    assert "" not in set(clusters["Scenario"])  # rows without words are never clustered
+
+def test_signatures_are_deterministic_and_empty_text_is_empty():
+    texts = [sentence(1), "", None]
+    sigs = minhash(texts)
+    assert np.array_equal(sigs, minhash(texts))
+    assert (sigs[1:] == EMPTY).all() and not (sigs[0] == EMPTY).any()
+
+def test_editing_one_document_rehashes_only_that_document():
+    frame = corpus()
+    cache = SignatureCache()
+    first = corpus_signatures(frame, "Scenario", cache)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    edited = frame.copy()
+    edited.loc[edited["Source File"] == "c.docx", "Scenario"] = [sentence(99), sentence(98), ""]
+    second = corpus_signatures(edited, "Scenario", cache)
+    assert (cache.hits, cache.misses) == (2, 4)
+    unchanged = (edited["Source File"] != "c.docx").to_numpy()
+    assert np.array_equal(second[unchanged], first[unchanged])
+    assert np.array_equal(second, corpus_signatures(edited, "Scenario"))
@@ -0,0 +1,31 @@
+"""Server-side sorting must order rows like pandas ``sort_values``, missing values last both ways."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_index import ACS, STORIES, FilterIndex
+from parsing_helpers import AC_COLUMNS, STORY_COLUMNS
+
+TITLES = ["b", None, "a", "b", "c", None, "a"]
+
+@pytest.fixture
+def findex():
+    stories = pd.DataFrame({"Module": "M", "Epic": "1: Epic", "Story ID": [f"1.{i}" for i in range(len(TITLES))],
+                            "Story Title": TITLES, "Acceptance Criteria Count": [3, 1, 3, 2, 3, 1, 2]},
+                           columns=STORY_COLUMNS)
+    return FilterIndex(stories.astype({"Story Title": "category"}), pd.DataFrame(columns=AC_COLUMNS))
+
+@pytest.mark.parametrize("column", ["Story Title", "Acceptance Criteria Count"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_rows_match_pandas(findex, column, descending):
+    rows = np.array([0, 1, 3, 4, 5, 6])
+    expected = findex.stories_df[column].iloc[rows].reset_index(drop=True).sort_values(
+        ascending=not descending, kind="stable", na_position="last").index
+    assert list(findex.sorted_rows(STORIES, rows, column, descending)) == list(rows[expected])
+
+def test_descending_keeps_missing_values_last_and_ties_in_row_order(findex):
+    rows = np.arange(len(TITLES))
+    assert list(findex.sorted_rows(STORIES, rows, "Story Title", descending=True)) == [4, 0, 3, 2, 6, 1, 5]
+
+def test_without_a_column_descending_reverses_the_given_order(findex):
+    assert list(findex.sorted_rows(ACS, np.array([2, 0, 1]), descending=True)) == [1, 0, 2]
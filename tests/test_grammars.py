@@ -0,0 +1,106 @@
+"""Document grammars: the classifier's first-letter check and heading detection.
+
+Every grammar must give the same frames through the python-docx engine, the streaming
+engine and the revision parser.
+"""
+import pandas as pd
+import pytest
+
+from conftest import HEADER, assert_parity, p, tbl
+from grammars import EPIC, STORY, Grammar, get_grammar
+from parsing_helpers import extract_user_stories_and_acs
+
+def stories_of(stories):
+    return list(stories[["Epic", "Story ID", "Story Title"]].itertuples(index=False, name=None))
+
+@pytest.mark.parametrize("name, chars", [("default", "esu"), ("headings", "esu"), ("gherkin", "fs")])
+def test_first_chars_are_read_off_the_patterns(name, chars):
+    assert get_grammar(name).first_chars == frozenset(chars)
+
+@pytest.mark.parametrize("patterns", [
+    (r"\s*Epic (?P<title>.+)",),          # starts with a character class
+    (r"(?:Epic )?(?P<title>.+)",),        # optional prefix, then anything
+    (r"Épica (?P<title>.+)",),            # non-ASCII letters fold onto ASCII ones
+])
+def test_patterns_without_a_small_first_letter_set_disable_the_check(patterns):
+    assert Grammar("x", patterns).first_chars is None
+
+def test_first_letter_check_keeps_every_heading():
+    classify = get_grammar().classifier().classify
+    assert classify("epic 2 - Lower case") == (EPIC, "2", "Lower case")
+    assert classify("STORY 2.1: Upper case") == (STORY, "2.1", "Upper case")
+    assert classify("The user story 2.2: is prose") == (None, None, None)
+    assert classify("Such prose starts with s") == (None, None, None)
+
+def test_non_ascii_first_letters_still_reach_the_regex():
+    # the Kelvin sign folds onto "k" and the long s onto "s" under re.IGNORECASE
+    grammar = Grammar("k", story_patterns=(r"Key\s+(?P<id>\d+)\s*:\s*(?P<title>.+)",))
+    assert grammar.first_chars == frozenset("k")
+    assert grammar.classifier().classify("\u212aey 7: Kelvin") == (STORY, "7", "Kelvin")
+    assert get_grammar().classifier().classify("\u017ftory 1.1: Long s")[0] == STORY
+
+def test_custom_patterns_may_reuse_group_names_and_named_backreferences():
+    grammar = Grammar("quoted",
+                      (r"(?P<kind>Epic|Theme)\s+(?P<id>\d+)\s*:\s*(?P<title>.+)",),
+                      (r"(?P<kind>Story)\s+(?P<id>[\d.]+)\s*:\s*(?P<q>[\"'])(?P<title>.+)(?P=q)",
+                       r"(?P<q>\*\*)(?P<kind>Task)\s*:\s*(?P<title>.+)(?P=q)"))
+    classify = grammar.classifier().classify
+    assert classify("Theme 3: Billing") == (EPIC, "3", "Billing")
+    assert classify('Story 3.1: "Pay by card"') == (STORY, "3.1", "Pay by card")
+    assert classify("Story 3.2: 'Mismatched\"") == (None, None, None)
+    assert classify("**Task: Refund**") == (STORY, "3.2", "Refund")
+
+@pytest.mark.parametrize("pattern", [r"(Story)\s+\1:\s*(?P<title>.+)", r"(\*)?Story(?(1)\*)\s*(?P<title>.+)"])
+def test_numbered_backreferences_are_refused(pattern):
+    with pytest.raises(ValueError, match="numbered backreferences"):
+        Grammar("x", story_patterns=(pattern,)).classifier()
+
+# -------- Heading detection, through every engine --------
+def test_heading_styles_are_numbered_in_order(make_docx):
+    path = make_docx(
+        p("Module: Payments"), p("Overview", "Heading2"),  # a Story before any Epic
+        p("Payments", "Heading1"), p("Add UPI", "Heading2"), tbl(HEADER, ["1", "Navigate", "Given x"]),
+        p("Remove UPI", "Heading2"), tbl(HEADER, ["1", "Remove", "Given y"], ["2", "Undo", "Given z"]),
+        p("Reports", "Heading1"), p("Export", "Heading2"), p("Plain prose", "Normal"))
+    stories, acs = assert_parity(path, "headings")
+    assert stories_of(stories) == [("Unknown", "1", "Overview"), ("1: Payments", "1.1", "Add UPI"),
+                                   ("1: Payments", "1.2", "Remove UPI"), ("2: Reports", "2.1", "Export")]
+    assert list(stories["Acceptance Criteria Count"]) == [0, 1, 2, 0]
+    assert list(acs["Story ID"]) == ["1.1", "1.2", "1.2"]
+
+def test_numbered_text_headings_keep_their_numbers_under_heading_styles(make_docx):
+    path = make_docx(
+        p("Epic 7: Numbered", "Heading1"), p("Styled story", "Heading2"),
+        p("User Story 7.9: Numbered story"), p("Next styled", "Heading2"), p("Styled epic", "Heading1"),
+        p("Its story", "Heading2"))
+    stories, _ = assert_parity(path, "headings")
+    # numbered headings win over the style and keep their number; unnumbered ones go on from it
+    assert stories_of(stories) == [("7: Numbered", "7.1", "Styled story"), ("7: Numbered", "7.9", "Numbered story"),
+                                   ("7: Numbered", "7.10", "Next styled"), ("8: Styled epic", "8.1", "Its story")]
+
+def test_generated_numbers_skip_ids_already_used():
+    classify = get_grammar("headings").classifier().classify
+    headings = [("Epic 2: Explicit", None), ("Story 2.2: Explicit", None), ("Story 2.1: Explicit", None),
+                ("Styled", "Heading2"), ("Epic 1: Explicit", None), ("Styled", "Heading1"), ("Styled", "Heading2")]
+    assert [classify(line, style)[1] for line, style in headings] == ["2", "2.2", "2.1", "2.3", "1", "3", "3.1"]
+
+def test_default_grammar_ignores_heading_styles(make_docx):
+    path = make_docx(p("Payments", "Heading1"), p("Add UPI", "Heading2"), p("User Story 1.1: Text"))
+    stories, _ = assert_parity(path, "default")
+    assert stories_of(stories) == [("Unknown", "1.1", "Text")]
+
+def test_gherkin_features_and_scenarios(make_docx):
+    path = make_docx(
+        p("Feature: Login"), p("Scenario: Valid password"), tbl(HEADER, ["1", "Log in", "Given a user"]),
+        p("Scenario Outline: Locked accounts"), tbl(HEADER, ["1", "Lock", "Given &lt;n&gt; failures"]),
+        p("Scenarios are listed below."), p("feature : Logout"), p("scenario outline:Idle timeout"))
+    stories, acs = assert_parity(path, "gherkin")
+    assert stories_of(stories) == [("1: Login", "1.1", "Valid password"), ("1: Login", "1.2", "Locked accounts"),
+                                   ("2: Logout", "2.1", "Idle timeout")]
+    assert list(acs["Story ID"]) == ["1.1", "1.2"]
+
+def test_grammar_objects_work_like_names(make_docx):
+    path = make_docx(p("Feature: Login"), p("Scenario: Valid password"))
+    by_name = extract_user_stories_and_acs(path, grammar="gherkin")
+    stories, _ = assert_parity(path, get_grammar("gherkin"))
+    pd.testing.assert_frame_equal(stories, by_name[0])
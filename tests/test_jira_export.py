@@ -0,0 +1,90 @@
+"""Jira bulk export against the local mock Jira (``benchmarks/mock_jira.py``)."""
+import pandas as pd
+import pytest
+
+from benchmarks.mock_jira import MockJira
+from jira_export import IdempotencyMap, JiraBulkExporter, JiraConfig, ac_key, story_key
+
+def frames(n_stories=4, acs_per_story=3):
+    stories = pd.DataFrame({
+        "Module": "Payments", "Epic": "1: Epic",
+        "Story ID": [f"1.{i + 1}" for i in range(n_stories)],
+        "Story Title": [f"Story {i + 1}" for i in range(n_stories)],
+        "Acceptance Criteria Count": acs_per_story, "Source File": "spec.docx"})
+    acs = stories.loc[stories.index.repeat(acs_per_story), ["Module", "Epic", "Story ID", "Story Title", "Source File"]]
+    acs = acs.assign(**{"AC #": [str(i % acs_per_story + 1) for i in range(len(acs))],
+                        "Scenario": [f"Scenario {i}" for i in range(len(acs))]})
+    return stories, acs.reset_index(drop=True)
+
+def export(jira, stories, acs, id_map=None, **config):
+    config = JiraConfig(jira.url, "DEMO", **{"batch_size": 5, "concurrency": 2, **config})
+    return JiraBulkExporter(config, id_map if id_map is not None else IdempotencyMap()).export(stories, acs)
+
+@pytest.mark.parametrize("retry_after", ["0.01", ""])  # "" falls back to exponential backoff
+def test_rate_limited_batches_are_retried(retry_after):
+    stories, acs = frames()
+    with MockJira(rate_limit_every=2, retry_after=retry_after) as jira:
+        report = export(jira, stories, acs, backoff=0.01)
+        assert report.created == len(stories) + len(acs) and not report.failed
+        assert report.retries == jira.rate_limited > 0
+        assert len(jira.issues) == report.created
+
+def test_retries_give_up_after_max_retries():
+    stories, acs = frames(n_stories=2, acs_per_story=1)
+    with MockJira(rate_limit_every=1, retry_after="0") as jira:
+        report = export(jira, stories, acs, max_retries=2)
+    assert report.created == 0 and not jira.issues
+    assert len(report.failed) == 4
+    assert any("HTTP 429 after 2 retries" in message for _, message in report.failed)
+
+def test_per_element_errors_fail_only_their_issue():
+    stories, acs = frames(n_stories=2)
+    id_map = IdempotencyMap()
+    # story 1.1 points at a Jira issue that does not exist, so only its ACs are rejected
+    id_map.update({story_key("DEMO", "spec.docx", "1.1"): "DEMO-999"})
+    with MockJira() as jira:
+        report = export(jira, stories, acs, id_map=id_map, batch_size=50, concurrency=1)
+        assert report.created == 1 + 3 and report.skipped == 1
+        assert sorted(local for local, _ in report.failed) == [ac_key("DEMO", "spec.docx", "1.1", n) for n in (1, 2, 3)]
+        assert all("Could not find issue" in message for _, message in report.failed)
+        for n in (1, 2, 3):  # created keys are matched to the right ACs around the failed elements
+            fields = jira.issues[id_map.get(ac_key("DEMO", "spec.docx", "1.2", n))]
+            assert fields["summary"] == f"AC {n}: Scenario {n + 2}"
+            assert fields["parent"]["key"] == id_map.get(story_key("DEMO", "spec.docx", "1.2"))
+
+def test_acs_without_a_story_are_reported_as_orphans():
+    stories, acs = frames(n_stories=2, acs_per_story=2)
+    with MockJira() as jira:
+        report = export(jira, stories.iloc[:1], acs)
+    assert report.created == 1 + 2
+    assert sorted(report.failed) == [(ac_key("DEMO", "spec.docx", "1.2", n), "story was not created") for n in (1, 2)]
+
+def test_rerun_with_the_same_map_creates_nothing(tmp_path):
+    stories, acs = frames()
+    path = str(tmp_path / "map.json")
+    with MockJira() as jira:
+        first = export(jira, stories.iloc[:2], acs, id_map=IdempotencyMap(path))
+        assert first.created == 2 + 6 and len(first.failed) == 6  # ACs of stories 1.3 and 1.4 are orphans
+        second = export(jira, stories, acs, id_map=IdempotencyMap(path))
+        assert second.skipped == 8 and second.created == 2 + 6 and not second.failed
+        third = export(jira, stories, acs, id_map=IdempotencyMap(path))
+        assert third.created == 0 and third.skipped == len(stories) + len(acs) and third.requests == 0
+        assert len(jira.issues) == len(stories) + len(acs)
+
+def test_repeated_story_ids_get_their_own_keys(tmp_path):
+    stories, acs = frames(n_stories=3, acs_per_story=2)
+    stories["Story ID"] = acs["Story ID"] = "1.1"  # the same ID typed three times in one file
+    stories["Acceptance Criteria Count"] = [2, 0, 4]
+    acs["Story Title"] = ["Story 1"] * 2 + ["Story 3"] * 4
+    path = str(tmp_path / "map.json")
+    with MockJira() as jira:
+        report = export(jira, stories, acs, id_map=IdempotencyMap(path))
+        assert report.created == 3 + 6 and not report.failed
+        id_map = IdempotencyMap(path)
+        parents = [story_key("DEMO", "spec.docx", "1.1", n) for n in (1, 2, 3)]
+        assert len({id_map.get(key) for key in parents}) == 3
+        for seq, parent in zip(range(1, 7), [1, 1, 3, 3, 3, 3]):
+            fields = jira.issues[id_map.get(ac_key("DEMO", "spec.docx", "1.1", seq))]
+            assert fields["parent"]["key"] == id_map.get(parents[parent - 1])
+        rerun = export(jira, stories, acs, id_map=IdempotencyMap(path))
+        assert rerun.created == 0 and len(jira.issues) == 3 + 6
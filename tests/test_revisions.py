@@ -0,0 +1,82 @@
+"""Incremental re-parse of revisions and the story / AC diff between them."""
+import pandas as pd
+
+from conftest import HEADER, p, tbl
+from parsing_helpers import AC_COLUMNS, STORY_COLUMNS, extract_user_stories_and_acs
+from revisions import ADDED, CHANGED, REMOVED, diff_revisions, extract_revision, reused_sections
+
+def frames(*stories):
+    """``(stories_df, ac_df)`` from ``(story id, title, [scenarios])`` tuples, all in Epic 1."""
+    s_rows = [("M", "1: Epic", sid, title, len(acs)) for sid, title, acs in stories]
+    ac_rows = [("M", "1: Epic", sid, title, str(n), scenario)
+               for sid, title, acs in stories for n, scenario in enumerate(acs, 1)]
+    return pd.DataFrame(s_rows, columns=STORY_COLUMNS), pd.DataFrame(ac_rows, columns=AC_COLUMNS)
+
+def rows(df, *columns):
+    return list(df[list(columns)].itertuples(index=False, name=None))
+
+def test_identical_revisions_have_no_diff():
+    old = frames(("1.1", "Pay", ["a", "b"]))
+    diff = diff_revisions(old, frames(("1.1", "Pay", ["a", "b"])))
+    assert not diff
+    assert diff.counts() == {"stories": {ADDED: 0, REMOVED: 0, CHANGED: 0}, "acs": {ADDED: 0, REMOVED: 0, CHANGED: 0}}
+
+def test_added_removed_and_changed_stories():
+    old = frames(("1.1", "Pay", ["a"]), ("1.2", "Refund", ["b"]), ("1.3", "Cancel", []))
+    new = frames(("1.1", "Pay by card", ["a"]), ("1.3", "Cancel", []), ("1.4", "Export", ["c", "d"]))
+    diff = diff_revisions(old, new)
+    assert rows(diff.stories, "Change", "Story ID", "Story Title", "Before", "Details") == [
+        (CHANGED, "1.1", "Pay by card", "Pay", "title"),
+        (ADDED, "1.4", "Export", "", "2 AC(s)"),
+        (REMOVED, "1.2", "Refund", "", "1 AC(s)"),
+    ]
+    assert rows(diff.acs, "Change", "Story ID", "Scenario") == [(ADDED, "1.4", "c"), (ADDED, "1.4", "d"),
+                                                                (REMOVED, "1.2", "b")]
+
+def test_ac_inserted_mid_list_is_one_addition():
+    old = frames(("1.1", "Pay", ["a", "b", "c"]))
+    new = frames(("1.1", "Pay", ["a", "inserted", "b", "c"]))
+    diff = diff_revisions(old, new)
+    assert rows(diff.acs, "Change", "AC #", "Scenario") == [(ADDED, "2", "inserted")]
+    assert rows(diff.stories, "Change", "Details") == [(CHANGED, "AC count 3 → 4; 1 added AC(s)")]
+
+def test_ac_replaced_in_place_is_a_change():
+    old = frames(("1.1", "Pay", ["a", "b", "c"]))
+    new = frames(("1.1", "Pay", ["a", "B", "c", "d"]))
+    diff = diff_revisions(old, new)
+    assert rows(diff.acs, "Change", "AC #", "Scenario", "Before") == [(CHANGED, "2", "B", "b"), (ADDED, "4", "d", "")]
+    assert diff.counts()["acs"] == {ADDED: 1, REMOVED: 0, CHANGED: 1}
+
+def test_duplicate_story_ids_are_matched_by_occurrence():
+    old = frames(("1.1", "First", ["a"]), ("1.1", "Second", ["b"]), ("1.1", "Third", []))
+    new = frames(("1.1", "First", ["a"]), ("1.1", "Second, renamed", ["b", "c"]))
+    diff = diff_revisions(old, new)
+    # the ACs of every "1.1" form one list; their edits are reported on the first "1.1" only
+    assert rows(diff.stories, "Change", "Story Title", "Before", "Details") == [
+        (CHANGED, "First", "", "1 added AC(s)"),
+        (CHANGED, "Second, renamed", "Second", "AC count 1 → 2"),
+        (REMOVED, "Third", "", "0 AC(s)"),
+    ]
+    assert rows(diff.acs, "Change", "Story ID", "Scenario") == [(ADDED, "1.1", "c")]
+
+def test_revision_reuses_unchanged_sections_and_matches_full_parse(make_docx):
+    intro = [p("Module: Payments"), p("Epic 1: Payments")]
+    first = make_docx(*intro,
+                      p("User Story 1.1: Add UPI"), tbl(HEADER, ["1", "Navigate", "Given x"]),
+                      p("User Story 1.2: Remove UPI"), tbl(HEADER, ["1", "Remove", "Given y"]),
+                      name="v1.docx")
+    second = make_docx(*intro,
+                       p("User Story 1.1: Add UPI"), tbl(HEADER, ["1", "Navigate", "Given x"]),
+                       p("User Story 1.2: Remove UPI"), tbl(HEADER, ["1", "Remove", "Given y"], ["2", "Undo", "Given z"]),
+                       p("User Story 1.3: List UPI"), tbl(HEADER, ["1", "List", "Given w"]),
+                       name="v2.docx")
+    *old, sections = extract_revision(first)
+    for frame, expected in zip(old, extract_user_stories_and_acs(first)):
+        pd.testing.assert_frame_equal(frame, expected)
+
+    *new, new_sections = extract_revision(second, previous=sections)
+    for frame, expected in zip(new, extract_user_stories_and_acs(second)):
+        pd.testing.assert_frame_equal(frame, expected)
+    assert reused_sections(new_sections, sections) == 3  # preamble, Epic 1 and Story 1.1
+    assert diff_revisions(old, new).counts() == {"stories": {ADDED: 1, REMOVED: 0, CHANGED: 1},
+                                                 "acs": {ADDED: 2, REMOVED: 0, CHANGED: 0}}
@@ -0,0 +1,72 @@
+# tests/test_stream_parser.py
+"""The streaming engine and the revision parser must produce exactly the frames of the python-docx engine."""
+from docx import Document
+
+from conftest import HEADER, assert_parity, p, tbl, tc
+from parsing_helpers import paragraph_text, table_text_grid
+
+def test_empty_document(make_docx):
+    stories, acs = assert_parity(make_docx())
+    assert stories.empty and acs.empty
+
+def test_only_prose_and_empty_paragraphs(make_docx):
+    stories, acs = assert_parity(make_docx(p("Module: Empty"), "<w:p/>", p("No stories here.")))
+    assert stories.empty and acs.empty
+
+def test_basic_document(make_docx):
+    stories, acs = assert_parity(make_docx(
+        p("Module: Payments"), p("Epic 1: Payments"), p("User Story 1.1: Add UPI"),
+        tbl(HEADER, ["1.1", "Navigate", "Given x"], ["1.2", "Add", "Given y"]),
+        p("User Story 1.2 - Remove UPI"), tbl(HEADER, ["2.1", "Remove", "Given z"])))
+    assert list(stories["Story ID"]) == ["1.1", "1.2"]
+    assert list(acs["AC #"]) == ["1.1", "1.2", "2.1"]
+    assert stories["Module"].iloc[0] == "Payments"
+
+def test_merged_cells(make_docx):
+    path = make_docx(
+        p("Epic 1: Merges"), p("User Story 1.1: Merged ACs"),
+        tbl(HEADER,
+            [tc("1.1", vmerge="restart"), tc("Spans two columns", span=2)],
+            [tc("", vmerge="continue"), "Second", "Given b"],
+            ["1.3", tc("Spans again", span=2)]))
+    stories, acs = assert_parity(path)
+    assert list(acs["Scenario"]) == ["Spans two columns", "Second", "Spans again"]
+    assert list(acs["AC #"]) == ["1.1", "1.1", "1.3"]
+
+def test_merged_cell_grid_matches_python_docx(make_docx):
+    path = make_docx(tbl(HEADER,
+                         [tc("a", span=2), "b"],
+                         [tc("c", vmerge="restart"), "d", "e"],
+                         [tc("", vmerge="continue"), tc("f", span=2)]))
+    table = Document(path).tables[0]
+    assert table_text_grid(table) == [[c.text for c in row.cells] for row in table.rows]
+
+def test_hyperlinks_breaks_and_tabs(make_docx):
+    story = ('<w:p><w:r><w:t xml:space="preserve">User Story 1.1: Link </w:t></w:r>'
+             '<w:hyperlink w:anchor="x"><w:r><w:t>to spec</w:t></w:r></w:hyperlink>'
+             '<w:r><w:tab/><w:t>tabbed</w:t></w:r></w:p>')
+    scenario = ('<w:p><w:r><w:t>Line one</w:t><w:br/><w:t>line two</w:t>'
+                '<w:br w:type="page"/><w:t>same line</w:t><w:cr/><w:t>three</w:t></w:r></w:p>')
+    path = make_docx(p("Epic 1: Text"), story, tbl(HEADER, ["1", tc(scenario), "Given"]))
+    stories, acs = assert_parity(path)
+    assert stories["Story Title"].iloc[0] == "Link to spec\ttabbed"
+    assert acs["Scenario"].iloc[0] == "Line one\nline twosame line\nthree"
+    doc = Document(path)
+    assert [paragraph_text(par._p) for par in doc.paragraphs] == [par.text for par in doc.paragraphs]
+
+def test_nested_tables_are_not_top_level_blocks(make_docx):
+    inner = tbl(HEADER, ["9.9", "Nested AC", "Given nested"])
+    path = make_docx(
+        p("Epic 1: Nesting"), p("User Story 1.1: Outer"),
+        tbl(HEADER, ["1.1", tc(p("Outer AC") + inner), "Given outer"]),
+        p("User Story 1.2: Inside a table follows"))
+    stories, acs = assert_parity(path)
+    assert list(stories["Story ID"]) == ["1.1", "1.2"]
+    assert list(acs["AC #"]) == ["1.1"]
+
+def test_heading_inside_table_cell_is_ignored(make_docx):
+    path = make_docx(p("Epic 1: Cells"), tbl(["Notes", "x", "y"], [p("User Story 9.9: in a cell"), "a", "b"]),
+                     p("User Story 1.1: Real"))
+    stories, _ = assert_parity(path)
+    assert list(stories["Story ID"]) == ["1.1"]
+
@@ -1,129 +1,343 @@
 # sections/ui_components.py
+"""Page renderers. Only streamlit is imported up front: pandas, the parsers and the other
+heavy modules are imported inside the functions that use them, so the About, User Manual
+and Jira pages start without loading them."""
 import streamlit as st
-import pandas as pd
-import io, html, uuid
-from parsing_helpers import extract_user_stories_and_acs
+import html, os, uuid, zipfile
 
 # ------------------------------
 # STYLING
 # ------------------------------
-def inject_styles():
-    """Inject custom CSS for metrics, pills, buttons, and section headers."""
-    st.markdown("""
-    <style>
-    /* ====== Section Titles ====== */
-    .section-title {
-        background: #f4f8ff;
-        padding: 10px 16px;
-        border-left: 5px solid #1f77b4;
-        border-radius: 6px;
-        font-size: 18px;
-        font-weight: 600;
-        color: #1f77b4;
-        margin-top: 10px;
-        margin-bottom: 14px;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.04);
-    }
-    .sub-heading {
-        font-size: 15px;
-        font-weight: 600;
-        margin: 8px 0 4px 0;
-        color: #444;
-    }
-    /* ====== File Pills ====== */
-    .pillbar {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 8px;
-        margin-bottom: 12px;
-    }
-    .pill {
-        display: inline-flex;
-        align-items: center;
-        background: #eef4fc;
-        padding: 6px 10px;
-        border-radius: 18px;
-        font-size: 14px;
-        color: #333;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.08);
-    }
-    /* ====== Metric Cards ====== */
-    .metric-card {
-        background: #fff;
-        padding: 14px;
-        border-radius: 10px;
-        text-align: center;
-        box-shadow: 0 2px 6px rgba(0,0,0,0.05);
-        margin-bottom: 10px;
-    }
-    .metric-label { font-size: 13px; color: #777; }
-    .metric-value { font-size: 20px; font-weight: 700; color: #1f77b4; }
-    /* ====== Tabs ====== */
-    .stTabs [data-baseweb="tab-list"] { gap: 12px; }
-    .stTabs [data-baseweb="tab"] {
-        background: #f5f7fa;
-        padding: 6px 14px;
-        border-radius: 6px 6px 0 0;
-        font-weight: 500;
-        color: #555;
-        border: 1px solid #e2e6ea;
-    }
-    .stTabs [aria-selected="true"] {
-        background: #fff;
-        color: #1f77b4;
-        border-bottom: 2px solid #1f77b4;
-        box-shadow: 0 -2px 4px rgba(0,0,0,0.05);
-    }
-    </style>
-    """, unsafe_allow_html=True)
+STYLES = """
+<style>
+/* ====== Section Titles ====== */
+.section-title {
+    background: #f4f8ff;
+    padding: 10px 16px;
+    border-left: 5px solid #1f77b4;
+    border-radius: 6px;
+    font-size: 18px;
+    font-weight: 600;
+    color: #1f77b4;
+    margin-top: 10px;
+    margin-bottom: 14px;
+    box-shadow: 0 2px 5px rgba(0,0,0,0.04);
+}
+.sub-heading {
+    font-weight: 600;
+    font-size: 15px;
+    color: #444;
+    margin-top: 10px;
+    margin-bottom: 6px;
+}
+/* ====== File Pills ====== */
+.pillbar {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 8px;
+    margin-bottom: 12px;
+}
+.pill {
+    display: inline-flex;
+    align-items: center;
+    background: #eef4fc;
+    padding: 6px 10px;
+    border-radius: 18px;
+    font-size: 14px;
+    color: #333;
+    box-shadow: 0 1px 2px rgba(0,0,0,0.08);
+}
+/* ====== Metric Cards ====== */
+.metric-card {
+    background: linear-gradient(145deg, #ffffff, #f3f7fc);
+    padding: 16px;
+    border-radius: 12px;
+    text-align: center;
+    box-shadow: 0 4px 10px rgba(0,0,0,0.08), 0 1px 3px rgba(0,0,0,0.06);
+    transition: all 0.3s ease-in-out;
+    border: 1px solid #e4e9f2;
+    margin-bottom: 12px;
+}
+.metric-card:hover {
+    transform: translateY(-3px);
+    box-shadow: 0 6px 15px rgba(0,0,0,0.12), 0 2px 5px rgba(0,0,0,0.08);
+}
+.metric-label {
+    font-size: 13px;
+    font-weight: 600;
+    color: #6b7280;
+    margin-bottom: 4px;
+    letter-spacing: 0.5px;
+}
+.metric-value {
+    font-size: 22px;
+    font-weight: 800;
+    color: #1f77b4;
+    text-shadow: 1px 1px 3px rgba(31,119,180,0.15);
+}
+/* ====== Tabs ====== */
+.stTabs [data-baseweb="tab-list"] { gap: 12px; }
+.stTabs [data-baseweb="tab"] {
+    background: #f5f7fa;
+    padding: 6px 14px;
+    border-radius: 6px 6px 0 0;
+    font-weight: 500;
+    color: #555;
+    border: 1px solid #e2e6ea;
+}
+.stTabs [aria-selected="true"] {
+    background: #fff;
+    color: #1f77b4;
+    border-bottom: 2px solid #1f77b4;
+    box-shadow: 0 -2px 4px rgba(0,0,0,0.05);
+}
+</style>
+"""
 
 def inject_styles():
-    st.markdown("""
-    <style>
-    /* ===== Enhanced Metric Cards ===== */
-    .metric-card {
-        background: linear-gradient(145deg, #ffffff, #f3f7fc);
-        padding: 16px;
-        border-radius: 12px;
-        text-align: center;
-        box-shadow: 0 4px 10px rgba(0,0,0,0.08), 0 1px 3px rgba(0,0,0,0.06);
-        transition: all 0.3s ease-in-out;
-        border: 1px solid #e4e9f2;
-        margin-bottom: 12px;
-    }
-    .metric-card:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 15px rgba(0,0,0,0.12), 0 2px 5px rgba(0,0,0,0.08);
-    }
-    .metric-label {
-        font-size: 13px;
-        font-weight: 600;
-        color: #6b7280;
-        margin-bottom: 4px;
-        letter-spacing: 0.5px;
-    }
-    .metric-value {
-        font-size: 22px;
-        font-weight: 800;
-        color: #1f77b4;
-        text-shadow: 1px 1px 3px rgba(31,119,180,0.15);
-    }
-    /* Optional: Add spacing between summary blocks */
-    .sub-heading {
-        font-weight: 600;
-        font-size: 15px;
-        color: #444;
-        margin-top: 10px;
-        margin-bottom: 6px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    """Inject custom CSS for metrics, pills, tabs, and section headers (needed on every rerun)."""
+    st.markdown(STYLES, unsafe_allow_html=True)
 
 # ------------------------------
 # MAIN PAGE RENDERER
 # ------------------------------
+# -------- Background ingestion --------
+@st.cache_resource
+def shared_result_cache():
+    """Result cache shared by all sessions of this process and by other replicas (``None`` if off)."""
+    from shared_cache import open_shared_cache
+    return open_shared_cache()
+
+@st.cache_resource
+def parse_executor():
+    """The executor every session's background parses share.
+
+    One background thread by default; ``STORYSTRUCT_PARSE_WORKERS=N`` (N > 1) opts in to a
+    pool of N processes instead. Either way the number of parsers does not grow with the
+    number of sessions.
+    """
+    workers = int(os.environ.get("STORYSTRUCT_PARSE_WORKERS", "1"))
+    if workers > 1:
+        from batch_ingest import process_pool
+        return process_pool(workers)
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="storystruct-parse")
+
+def corpus_owner():
+    """Who this session's saved corpus belongs to: the logged-in user, else this session alone."""
+    email = st.user.get("email") if st.user.get("is_logged_in") else None
+    return f"user:{email}" if email else f"session:{uuid.uuid4().hex}"
+
+@st.cache_resource
+def signature_cache():
+    """MinHash signatures per document text column, shared by all sessions of this process."""
+    from dedup import SignatureCache
+    return SignatureCache()
+
+def queue_uploads(store):
+    """Send uploaded files that are not cached yet to the background parser.
+
+    Files the shared result cache or the corpus store already holds are read back
+    straight away; their frames are returned as ``{hash: (stories_df, ac_df)}``.
+    """
+    cache, queue = st.session_state.parse_cache, st.session_state.ingest_queue
+    shared = shared_result_cache()
+    restored = {}
+    for f in st.session_state.uploaded_files:
+        h = f["hash"]
+        if h in cache or h in restored or h in queue: continue
+        # memory-mapped, no parse; strings stay in the mapping only with pandas 3's Arrow-backed
+        # strings (pandas 2 copies them into Python objects)
+        frames = shared.get(h) if shared is not None else None
+        if frames is None and store.has_document(h):
+            frames = store.document_frames(h)
+            if shared is not None: shared.put(h, *frames)
+        if frames is not None:
+            restored[h] = frames
+            cache.put(h, frames)
+            if not store.link_document(h):  # parsed by another replica: save it to this corpus too
+                store.upsert_document(h, f["name"], *frames)
+        else:
+            # parsed section by section, so a later revision of the file can reuse unchanged sections
+            previous = f["previous"]["sections"] if "previous" in f else []
+            queue.submit(h, f["name"], f["file"].getvalue(), profile=st.session_state.get("profile_parsing", False),
+                         previous=previous, grammar=st.session_state.get("doc_grammar"))
+    return restored
+
+def document_key(file, grammar=None):
+    """Cache key of an uploaded file: its content hash, tagged with the grammar unless it is the default."""
+    from grammars import DEFAULT_GRAMMAR
+    from parse_cache import file_digest
+    digest = file_digest(file)
+    return digest if (grammar or DEFAULT_GRAMMAR) == DEFAULT_GRAMMAR else f"{digest}-{grammar}"
+
+def change_grammar():
+    """Re-key uploaded files for the newly selected grammar, so they are parsed (or read from cache) again."""
+    grammar = st.session_state.doc_grammar = st.session_state.grammar_select
+    for entry in st.session_state.uploaded_files:
+        for stale in ("previous", "older", "sections"):  # sections and diffs only hold within one grammar
+            entry.pop(stale, None)
+        entry["hash"] = document_key(entry["file"], grammar)
+
+def expand_uploads(uploads):
+    """``(name, file)`` per uploaded document; zip archives give one lazily read file per .docx member.
+
+    An archive is expanded once per upload, so reruns do not decompress it again.
+    """
+    from batch_ingest import is_archive, open_archive
+    expanded = st.session_state.setdefault("expanded_archives", {})
+    for f in uploads:
+        if not is_archive(f.name):
+            yield f.name, f
+            continue
+        key = getattr(f, "file_id", None) or (f.name, f.size)
+        if key not in expanded:
+            try:
+                expanded[key] = (open_archive(f, f.name), None)
+            except zipfile.BadZipFile as exc:
+                expanded[key] = ([], f"Could not open {f.name}: {exc}")
+        members, problem = expanded[key]
+        if problem or not members:
+            st.warning(f"⚠️ {problem or f'{f.name} contains no .docx files'} "
+                       "(results bundles open under 📦 Results Bundle).")
+        for member in members:
+            yield member.name, member
+
+def register_revision(entry, upload, digest, store):
+    """Swap a new revision of an uploaded file into ``entry``, keeping the previous one for the diff."""
+    old, cache = entry["hash"], st.session_state.parse_cache
+    if old in cache:
+        frames = cache.get(entry["file"], old)
+    elif store.has_document(old):
+        frames = store.document_frames(old)
+    else:
+        frames = None  # previous revision never finished parsing: nothing to diff against
+    if all(f["hash"] != old for f in st.session_state.uploaded_files if f is not entry):
+        st.session_state.ingest_queue.forget(old)
+    entry["previous"] = {"hash": old, "frames": frames, "sections": entry.pop("sections", None) or []}
+    entry["older"] = entry.get("older", ()) + (old,)
+    entry.update(file=upload, hash=digest)
+
+def harvest_parsed(store):
+    """Move finished background parses into the parse cache, the shared cache and the corpus store."""
+    fresh, shared = {}, shared_result_cache()
+    for doc_hash, result in st.session_state.ingest_queue.drain():
+        if result.stats:
+            st.session_state.parse_stats[doc_hash] = (result.name, result.stats)
+        if not result.ok:
+            st.session_state.parse_errors[doc_hash] = result.error
+            continue
+        fresh[doc_hash] = (result.stories, result.acs)
+        replaces = set()
+        for f in st.session_state.uploaded_files:
+            if f["hash"] == doc_hash:
+                f["sections"] = result.sections
+                replaces.update(f.get("older", ()))
+        # an older revision that is still uploaded as a file of its own stays in the store
+        replaces -= {f["hash"] for f in st.session_state.uploaded_files}
+        st.session_state.parse_cache.put(doc_hash, fresh[doc_hash])
+        store.upsert_document(doc_hash, result.name, result.stories, result.acs, replaces=replaces)
+        if shared is not None: shared.put(doc_hash, result.stories, result.acs)
+    return fresh
+
+def uploaded_frames(f, store, fresh):
+    """``(stories_df, ac_df)`` of one uploaded file, or ``None`` if it cannot be parsed.
+
+    Looked up in this rerun's finished parses, the parse cache, the shared cache and the
+    corpus store, in that order; the file is only parsed again if none of them holds it.
+    """
+    h, cache, shared = f["hash"], st.session_state.parse_cache, shared_result_cache()
+    frames = fresh.get(h)
+    if frames is None and h in cache:
+        frames = cache.get(f["file"], h)
+    if frames is None and shared is not None:
+        frames = shared.get(h)
+    if frames is None and store.has_document(h):
+        frames = store.document_frames(h)
+        if shared is not None: shared.put(h, *frames)
+    if frames is None:
+        try:
+            frames = cache.get(f["file"], h, grammar=st.session_state.get("doc_grammar"))
+        except Exception as exc:
+            st.session_state.parse_errors[h] = f"{type(exc).__name__}: {exc}"
+            st.error(f"⚠️ Could not parse {f['name']}: {st.session_state.parse_errors[h]}")
+            return None
+    elif h not in cache:
+        cache.put(h, frames)
+    return frames
+
+@st.fragment(run_every=0.5)
+def render_ingest_progress(n_pending):
+    """Per-file parse progress; reruns the whole page whenever another file finishes."""
+    queue = st.session_state.ingest_queue
+    hashes = {f["hash"] for f in st.session_state.uploaded_files}
+    if len(queue.pending(hashes)) < n_pending:
+        st.rerun()
+    st.markdown("<div class='sub-heading'>⏳ Parsing</div>", unsafe_allow_html=True)
+    for name, fraction, state in queue.progress(hashes):
+        st.progress(fraction, text=f"{name} · {state}")
+
+def render_performance_panel():
+    """Per-stage parse profile of the documents parsed while profiling was switched on."""
+    with st.expander("⏱️ Performance"):
+        st.toggle("Profile parsing", key="profile_parsing",
+                  help="Records per-stage timings for documents parsed from now on (adds a few % to parse time). "
+                       "'net blocks' is the change in live memory blocks over a stage and can be negative.")
+        profiles = st.session_state.parse_stats
+        if not profiles:
+            st.caption("No profiles yet. Switch profiling on, then upload documents.")
+            return
+        import pandas as pd
+        rows = []
+        for name, ps in profiles.values():
+            row = {"File": name, "Engine": ps.engine, "Total ms": round(ps.total_seconds * 1e3, 1)}
+            row.update({f"{stage} ms": round(sec * 1e3, 1) for stage, sec in ps.seconds.items()})
+            row.update({"Paragraphs": ps.paragraphs, "Tables": ps.tables, "AC Tables": ps.ac_tables,
+                        "Stories": ps.stories, "ACs": ps.acs})
+            row.update({f"{stage} net blocks": n for stage, n in ps.net_blocks.items()})
+            rows.append(row)
+        st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
+        if st.button("Clear profiles", key="clear_profiles"):
+            st.session_state.parse_stats = {}
+            st.rerun()
+
+# -------- Result tables --------
+PAGINATE_ABOVE = 5000  # rows; smaller results are sent whole and sorted in the browser
+PAGE_SIZES = [100, 500, 1000, 5000]
+DEFAULT_ORDER = "(default order)"
+
+def render_result_table(findex, table, frame, rows, key):
+    """Whole ``frame`` for small results; above ``PAGINATE_ABOVE`` rows, one page sorted on the server.
+
+    Only the visible page is serialized to the browser.
+    """
+    if len(rows) <= PAGINATE_ABOVE:
+        st.dataframe(frame, width="stretch", hide_index=True)
+        return
+    c1, c2, c3, c4 = st.columns([3, 1, 1, 1])
+    sort_by = c1.selectbox("Sort by", [DEFAULT_ORDER] + list(frame.columns), key=f"{key}_sort")
+    descending = c2.toggle("Descending", key=f"{key}_desc")
+    page_size = c3.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    n_pages = -(-len(rows) // page_size)
+    if st.session_state.get(f"{key}_page", 1) > n_pages:  # result shrank under the current page
+        st.session_state[f"{key}_page"] = n_pages
+    page = c4.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+    column = None if sort_by == DEFAULT_ORDER else sort_by
+    start = (page - 1) * page_size
+    st.dataframe(findex.page(table, rows, page - 1, page_size, column, descending),
+                 width="stretch", hide_index=True)
+    st.caption(f"Rows {start + 1:,}–{min(start + page_size, len(rows)):,} of {len(rows):,}")
+
 def render_home():
     """Main UI for uploading files, viewing metrics, filtering, and exporting."""
+    from parse_cache import ParseCache
+    from batch_ingest import IngestQueue, merge_results
+    from grammars import DEFAULT_GRAMMAR, GRAMMARS
+    from corpus_store import open_corpus_store
+    from search_index import CorpusSearch
+    from filter_index import ACS, STORIES, FilterIndex
+    from exports import (EXCEL_MIME, PARQUET_MIME, ExportCache, bundle_bytes, csv_bytes, excel_bytes,
+                         parquet_bytes, read_bundle)
     inject_styles()
 
     # Reduce Streamlit default top padding/margin
@@ -141,19 +355,50 @@ def render_home():
         st.session_state.step = 1
     if "uploaded_files" not in st.session_state:
         st.session_state.uploaded_files = []
+    if "parse_cache" not in st.session_state:
+        st.session_state.parse_cache = ParseCache()
+    if "corpus_store" not in st.session_state:
+        st.session_state.corpus_store = open_corpus_store(corpus_owner())
+    if "corpus_mode" not in st.session_state:
+        st.session_state.corpus_mode = False
+    if "parse_stats" not in st.session_state:
+        st.session_state.parse_stats = {}
+    if "ingest_queue" not in st.session_state:
+        st.session_state.ingest_queue = IngestQueue(parse_executor())
+        st.session_state.parse_errors = {}
+    if "doc_grammar" not in st.session_state:
+        st.session_state.doc_grammar = DEFAULT_GRAMMAR
+    store = st.session_state.corpus_store
 
     # ---------------------------
     # STEP 1: FILE UPLOAD
     # ---------------------------
     if st.session_state.step == 1:
         st.markdown("<div class='section-title'>📂 Step 1: Upload Document(s)</div>", unsafe_allow_html=True)
-        uploads = st.file_uploader("Upload Word Document(s)", type=["docx"], accept_multiple_files=True)
+        grammars = sorted(GRAMMARS)
+        grammar = st.selectbox("Document format", grammars, index=grammars.index(st.session_state.doc_grammar),
+                               key="grammar_select", on_change=change_grammar,
+                               help="default: 'Epic 1: …' / 'User Story 1.1: …' paragraphs. "
+                                    "headings: also Heading 1 = Epic, Heading 2 = Story. "
+                                    "gherkin: 'Feature: …' = Epic, 'Scenario: …' = Story.")
+        uploads = st.file_uploader("Upload Word Document(s)", type=["docx", "zip"], accept_multiple_files=True,
+                                   help="A .zip is read member by member; its documents are listed as archive/member.")
 
         if uploads:
-            existing = {f["name"] for f in st.session_state.uploaded_files}
-            for f in uploads:
-                if f.name not in existing:
-                    st.session_state.uploaded_files.append({"id": uuid.uuid4().hex[:8], "name": f.name, "file": f})
+            existing = {f["name"]: f for f in st.session_state.uploaded_files}
+            for name, f in expand_uploads(uploads):
+                entry = existing.get(name)
+                if entry is None:
+                    st.session_state.uploaded_files.append({"id": uuid.uuid4().hex[:8], "name": name, "file": f,
+                                                            "hash": document_key(f, grammar)})
+                    continue
+                if f is entry["file"]:  # archive member already registered
+                    continue
+                # same name, new bytes: a new revision (earlier revisions stay listed in the uploader)
+                digest = document_key(f, grammar)
+                if digest != entry["hash"] and digest not in entry.get("older", ()):
+                    register_revision(entry, f, digest, store)
+            queue_uploads(store)  # start parsing while the user is still on this page
 
         if st.session_state.uploaded_files:
             st.markdown("<div class='sub-heading'>📁 Ready to Process</div>", unsafe_allow_html=True)
@@ -162,11 +407,45 @@ def render_home():
                 st.markdown(f"<div class='pill'>{html.escape(f['name'])}</div>", unsafe_allow_html=True)
             st.markdown("</div>", unsafe_allow_html=True)
 
-            if st.button("➡️ Next: View Extracted Data", use_container_width=True, key="next_step"):
+            if st.button("➡️ Next: View Extracted Data", width="stretch", key="next_step"):
                 st.session_state.step = 2
                 st.rerun()
         else:
             st.info("No files selected yet.")
+
+        saved_docs = len(store)
+        if saved_docs:
+            st.markdown("<div class='sub-heading'>📚 Saved Corpus</div>", unsafe_allow_html=True)
+            if st.button(f"📚 Open Saved Corpus ({saved_docs} document(s))", width="stretch", key="open_corpus"):
+                st.session_state.corpus_mode = True
+                st.session_state.pop("corpus_frames", None)
+                st.session_state.pop("bundle", None)
+                st.session_state.step = 2
+                st.rerun()
+            with st.expander("Manage saved documents"):
+                for doc in store.documents().itertuples(index=False):
+                    c1, c2 = st.columns([5, 1])
+                    c1.markdown(f"<div class='pill'>{html.escape(doc[0])} · {doc.Stories} stories · {doc.ACs} ACs</div>",
+                                unsafe_allow_html=True)
+                    if c2.button("🗑️", key=f"del_{doc.Hash}", help=f"Delete {doc[0]} from the saved corpus"):
+                        store.remove_document(doc.Hash)
+                        st.session_state.pop("corpus_frames", None)
+                        st.rerun()
+
+        st.markdown("<div class='sub-heading'>📦 Results Bundle</div>", unsafe_allow_html=True)
+        bundle_file = st.file_uploader("Open a results bundle saved from Step 2", type=["zip"], key="bundle_upload")
+        if bundle_file is not None and st.button("📦 Open Bundle", width="stretch", key="open_bundle"):
+            try:
+                frames = read_bundle(bundle_file)
+            except (ValueError, RuntimeError) as exc:
+                st.error(f"⚠️ Could not open {bundle_file.name}: {exc}")
+            else:
+                # shown like the saved corpus, straight from the bundle's Parquet tables
+                st.session_state.bundle = (bundle_file.name, frames)
+                st.session_state.corpus_mode = True
+                st.session_state.pop("corpus_frames", None)
+                st.session_state.step = 2
+                st.rerun()
         return
 
     # ---------------------------
@@ -176,7 +455,13 @@ def render_home():
 
     # File chips with remove buttons
     clicked_remove = None
-    if st.session_state.uploaded_files:
+    corpus_mode = st.session_state.corpus_mode
+    bundle = st.session_state.get("bundle") if corpus_mode else None
+    if bundle:
+        st.caption(f"📦 Showing the results bundle `{bundle[0]}`.")
+    elif corpus_mode:
+        st.caption(f"📚 Showing the saved corpus ({len(store)} document(s)) from `{store.path}`.")
+    elif st.session_state.uploaded_files:
         st.markdown("<div class='sub-heading'>📁 Uploaded Files</div>", unsafe_allow_html=True)
         cols = st.columns(len(st.session_state.uploaded_files))
         for i, f in enumerate(st.session_state.uploaded_files):
@@ -188,25 +473,60 @@ def render_home():
                     if st.button("❌", key=f"rm_{f['id']}", help=f"Remove {f['name']}"):
                         clicked_remove = i
     if clicked_remove is not None:
-        st.session_state.uploaded_files.pop(clicked_remove)
+        removed = st.session_state.uploaded_files.pop(clicked_remove)
+        if all(f["hash"] != removed["hash"] for f in st.session_state.uploaded_files):
+            st.session_state.parse_cache.evict(removed["hash"])
+            st.session_state.ingest_queue.forget(removed["hash"])
         st.rerun()
 
-    # Parse uploaded files
-    all_stories, all_acs = [], []
+    # Parse uploaded files in the background (cached by content hash, so reruns only parse
+    # new files; files already in the corpus store are read back instead)
+    cache = st.session_state.parse_cache
+    queue = st.session_state.ingest_queue
+    fresh = queue_uploads(store)
+    # taken before harvesting, so a job that finishes in between is harvested rather than re-parsed below
+    pending = set(queue.pending({f["hash"] for f in st.session_state.uploaded_files}))
+    fresh.update(harvest_parsed(store))
+    if fresh:
+        st.session_state.pop("corpus_frames", None)
     for f in st.session_state.uploaded_files:
-        s_df, ac_df = extract_user_stories_and_acs(f["file"])
-        if not s_df.empty: s_df["Source File"] = f["name"]
-        if not ac_df.empty: ac_df["Source File"] = f["name"]
-        all_stories.append(s_df)
-        all_acs.append(ac_df)
-
-    stories_df = pd.concat(all_stories, ignore_index=True) if any(not s.empty for s in all_stories) else \
-        pd.DataFrame(columns=["Module","Epic","Story ID","Story Title","Acceptance Criteria Count","Source File"])
-    ac_df = pd.concat(all_acs, ignore_index=True) if any(not a.empty for a in all_acs) else \
-        pd.DataFrame(columns=["Module","Epic","Story ID","Story Title","AC #","Scenario","Source File"])
+        if f["hash"] in st.session_state.parse_errors:
+            st.error(f"⚠️ Could not parse {f['name']}: {st.session_state.parse_errors[f['hash']]}")
+    if pending and not corpus_mode:
+        render_ingest_progress(len(pending))
+
+    # Merged frames, search index and filter indexes are built once per corpus
+    if corpus_mode:
+        if "corpus_frames" not in st.session_state:
+            st.session_state.corpus_frames = bundle[1] if bundle else store.load()
+        index_key = ("corpus", id(st.session_state.corpus_frames))
+    else:
+        # every uploaded file that is not still parsing: the parse cache only bounds memory,
+        # evicted documents are read back by uploaded_frames
+        ready = [f for f in st.session_state.uploaded_files
+                 if f["hash"] not in pending and f["hash"] not in st.session_state.parse_errors]
+        index_key = tuple((f["name"], f["hash"]) for f in ready)
+    if st.session_state.get("corpus_view", (None,))[0] != index_key:
+        if corpus_mode:
+            stories_df, ac_df = st.session_state.corpus_frames
+        else:
+            loaded = ((f["name"], uploaded_frames(f, store, fresh)) for f in ready)
+            stories_df, ac_df = merge_results((name, *frames) for name, frames in loaded if frames is not None)
+        st.session_state.corpus_view = (index_key, stories_df, ac_df,
+                                        CorpusSearch(stories_df, ac_df), FilterIndex(stories_df, ac_df))
+    _, stories_df, ac_df, search, findex = st.session_state.corpus_view
+
+    stats = cache.stats
+    caption = f"Parse cache: {stats['hits']} hits · {stats['misses']} misses · {stats['entries']} cached"
+    shared = shared_result_cache()
+    if shared is not None and hasattr(shared, "hits"):
+        caption += f" · shared cache: {shared.hits} hits · {shared.misses} misses"
+    st.caption(caption)
+    render_performance_panel()
 
     if stories_df.empty and ac_df.empty:
-        st.warning("⚠️ No user stories or acceptance criteria found.")
+        if not (pending and not corpus_mode):
+            st.warning("⚠️ No user stories or acceptance criteria found.")
         return
 
     # ---------------------------
@@ -215,8 +535,9 @@ def render_home():
     st.markdown("<div class='sub-heading'>📊 Overall Summary</div>", unsafe_allow_html=True)
     cols = st.columns(5)
     metrics = [
-        ("Files", len(st.session_state.uploaded_files)),
-        ("Epics", stories_df["Epic"].nunique() if not stories_df.empty else 0),
+        ("Files", len(findex.options("Source File")) if bundle else
+                  len(store) if corpus_mode else len(st.session_state.uploaded_files)),
+        ("Epics", len(findex.options("Epic"))),
         ("Stories", len(stories_df)),
         ("ACs", len(ac_df)),
         ("Avg ACs/Story", f"{(len(ac_df)/len(stories_df)) if len(stories_df)>0 else 0:.2f}")
@@ -226,106 +547,212 @@ def render_home():
             f"<div class='metric-card'><div class='metric-label'>{label}</div>"
             f"<div class='metric-value'>{val}</div></div>", unsafe_allow_html=True
         )
+    exports = st.session_state.setdefault("export_cache", ExportCache())
+    st.download_button("💾 Save Results Bundle", exports.lazy(("bundle", index_key),
+                                                             lambda: bundle_bytes(stories_df, ac_df)),
+                       "storystruct_bundle.zip", "application/zip", key="save_bundle",
+                       help="Stories and ACs as Parquet; reopen the bundle from Step 1 without the .docx files.")
 
     # ---------------------------
     # Unified Filters
     # ---------------------------
     f1, f2, f3 = st.columns([1, 1, 2])
     with f1:
-        epic = st.selectbox("Filter by Epic", ["All"] + sorted(stories_df["Epic"].dropna().unique()), key="filter_epic")
+        epic = st.selectbox("Filter by Epic", ["All"] + findex.options("Epic"), key="filter_epic")
     with f2:
-        source = st.selectbox("Filter by File", ["All"] + sorted(stories_df["Source File"].dropna().unique()), key="filter_source")
+        source = st.selectbox("Filter by File", ["All"] + findex.options("Source File"), key="filter_source")
     with f3:
-        keyword = st.text_input("Search Title", key="filter_keyword")
-
-    # Apply filters to stories
-    filtered_df = stories_df.copy()
-    if epic != "All": filtered_df = filtered_df[filtered_df["Epic"] == epic]
-    if source != "All": filtered_df = filtered_df[filtered_df["Source File"] == source]
-    if keyword: filtered_df = filtered_df[filtered_df["Story Title"].str.contains(keyword, case=False, na=False)]
-
-    # Filter ACs based on filtered stories
-    ac_filtered = ac_df[ac_df['Story ID'].isin(filtered_df['Story ID'])] if not filtered_df.empty else ac_df.iloc[0:0]
+        keyword = st.text_input("Search Title / Scenario", key="filter_keyword",
+                                help="All words must match; each word also matches as a prefix.")
+
+    def story_rows():
+        rows = findex.story_rows(**{"Epic": None if epic == "All" else epic,
+                                    "Source File": None if source == "All" else source})
+        if not keyword:
+            return rows
+        rank = search.story_rank(keyword)
+        if rank is None:  # no word characters in the query: plain substring match
+            titles = stories_df["Story Title"].iloc[rows]
+            return rows[titles.str.contains(keyword, case=False, na=False, regex=False).to_numpy()]
+        return findex.rank_rows(rows, rank)  # ranked index hits, best first
+
+    # Stories and their ACs (joined on Source File + Story ID), memoized per filter tuple
+    filter_key = (index_key, epic, source, keyword)
+    view = findex.view(filter_key, story_rows)
+    filtered_df, ac_filtered = view.stories, view.acs
+
+    # Exports are built only when a download button is clicked, then cached per filter state
 
     # ---------------------------
     # Tabs
     # ---------------------------
-    tab1, tab2 = st.tabs(["📖 Story Details", "✅ Acceptance Criteria"])
+    revised = [] if corpus_mode else [f for f in st.session_state.uploaded_files
+                                      if f.get("previous", {}).get("frames") is not None and f["hash"] in cache]
+    tab1, tab2, tab_dup, *tab3 = st.tabs(["📖 Story Details", "✅ Acceptance Criteria", "🧬 Duplicates"] +
+                                         (["🔀 Revisions"] if revised else []))
 
     # ---- Tab 1: Story Details ----
     with tab1:
         st.subheader("🎯 Filtered Summary")
         cols_f = st.columns(5)
-        metrics_f = [
-            ("Stories", len(filtered_df)),
-            ("Epics", filtered_df["Epic"].nunique()),
-            ("ACs", len(ac_filtered)),
-            ("Modules", filtered_df["Module"].nunique()),
-            ("Avg ACs/Story", f"{(len(ac_filtered) / len(filtered_df)) if len(filtered_df) > 0 else 0:.2f}")
-        ]
-        for col, (label, val) in zip(cols_f, metrics_f):
+        for col, (label, val) in zip(cols_f, view.story_metrics):
             col.markdown(
                 f"<div class='metric-card'><div class='metric-label'>{label}</div>"
                 f"<div class='metric-value'>{val}</div></div>", unsafe_allow_html=True
             )
 
-        st.dataframe(filtered_df, use_container_width=True, hide_index=True)
+        render_result_table(findex, STORIES, filtered_df, view.story_rows, "stories")
 
         st.markdown("#### 📥 Export Stories")
-        cx1, cx2 = st.columns(2)
-        csv = filtered_df.to_csv(index=False).encode("utf-8-sig")
+        cx1, cx2, cx3 = st.columns(3)
         with cx1:
-            st.download_button("⬇️ CSV", csv, "stories.csv", "text/csv", use_container_width=True, key="csv_stories")
-        excel_io = io.BytesIO()
-        with pd.ExcelWriter(excel_io, engine="xlsxwriter") as writer:
-            filtered_df.to_excel(writer, index=False, sheet_name="Stories")
+            st.download_button("⬇️ CSV", exports.lazy(("stories", "csv", filter_key), lambda: csv_bytes(filtered_df)),
+                               "stories.csv", "text/csv", width="stretch", key="csv_stories")
         with cx2:
-            st.download_button("⬇️ Excel", excel_io.getvalue(), "stories.xlsx",
-                               "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                               use_container_width=True, key="excel_stories")
+            st.download_button("⬇️ Excel", exports.lazy(("stories", "xlsx", filter_key),
+                                                        lambda: excel_bytes(filtered_df, "Stories")),
+                               "stories.xlsx", EXCEL_MIME, width="stretch", key="excel_stories")
+        with cx3:
+            st.download_button("⬇️ Parquet", exports.lazy(("stories", "parquet", filter_key),
+                                                          lambda: parquet_bytes(filtered_df)),
+                               "stories.parquet", PARQUET_MIME, width="stretch", key="parquet_stories")
 
         st.markdown("---")
-        if st.button("⬅️ Back to Upload", use_container_width=True, key="back_btn_tab1"):
+        if st.button("⬅️ Back to Upload", width="stretch", key="back_btn_tab1"):
             st.session_state.step = 1
+            st.session_state.corpus_mode = False
+            st.session_state.pop("bundle", None)
             st.rerun()
 
     # ---- Tab 2: Acceptance Criteria ----
     with tab2:
         st.subheader("🎯 Filtered Summary")
         cols_ac = st.columns(5)
-        metrics_ac = [
-            ("ACs", len(ac_filtered)),
-            ("Epics", ac_filtered["Epic"].nunique()),
-            ("Stories", ac_filtered["Story ID"].nunique()),
-            ("Modules", ac_filtered["Module"].nunique()),
-            ("Files", ac_filtered["Source File"].nunique())
-        ]
-        for col, (label, val) in zip(cols_ac, metrics_ac):
+        for col, (label, val) in zip(cols_ac, view.ac_metrics):
             col.markdown(
                 f"<div class='metric-card'><div class='metric-label'>{label}</div>"
                 f"<div class='metric-value'>{val}</div></div>", unsafe_allow_html=True
             )
 
-        st.dataframe(ac_filtered, use_container_width=True, hide_index=True)
+        render_result_table(findex, ACS, ac_filtered, view.ac_rows, "acs")
 
         st.markdown("#### 📥 Export ACs")
-        h1, h2 = st.columns(2)
-        ac_csv = ac_filtered.to_csv(index=False).encode("utf-8-sig")
+        h1, h2, h3 = st.columns(3)
         with h1:
-            st.download_button("⬇️ CSV", ac_csv, "acs.csv", "text/csv", use_container_width=True, key="csv_acs")
-        ac_x = io.BytesIO()
-        with pd.ExcelWriter(ac_x, engine="xlsxwriter") as writer:
-            ac_filtered.to_excel(writer, index=False, sheet_name="Acceptance Criteria")
+            st.download_button("⬇️ CSV", exports.lazy(("acs", "csv", filter_key), lambda: csv_bytes(ac_filtered)),
+                               "acs.csv", "text/csv", width="stretch", key="csv_acs")
         with h2:
-            st.download_button("⬇️ Excel", ac_x.getvalue(), "acs.xlsx",
-                               "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                               use_container_width=True, key="excel_acs")
+            st.download_button("⬇️ Excel", exports.lazy(("acs", "xlsx", filter_key),
+                                                        lambda: excel_bytes(ac_filtered, "Acceptance Criteria")),
+                               "acs.xlsx", EXCEL_MIME, width="stretch", key="excel_acs")
+        with h3:
+            st.download_button("⬇️ Parquet", exports.lazy(("acs", "parquet", filter_key),
+                                                          lambda: parquet_bytes(ac_filtered)),
+                               "acs.parquet", PARQUET_MIME, width="stretch", key="parquet_acs")
 
         st.markdown("---")
-        if st.button("⬅️ Back to Upload", use_container_width=True, key="back_btn_tab2"):
+        if st.button("⬅️ Back to Upload", width="stretch", key="back_btn_tab2"):
             st.session_state.step = 1
+            st.session_state.corpus_mode = False
+            st.session_state.pop("bundle", None)
             st.rerun()
 
+    # ---- Tab 3: Near-duplicates across the whole corpus ----
+    with tab_dup:
+        render_duplicates(index_key, stories_df, ac_df)
+
+    # ---- Tab 4: Revision diff (only once a file has been re-uploaded) ----
+    if revised:
+        with tab3[0]:
+            render_revision_diff(revised)
+
+DUPLICATE_SOURCES = {
+    "Story titles": ("Story Title", ["Source File", "Story ID", "Story Title", "Epic"]),
+    "AC scenarios": ("Scenario", ["Source File", "Story ID", "AC #", "Scenario"]),
+}
+DUPLICATE_ROWS_SHOWN = 5000
+
+def render_duplicates(index_key, stories_df, ac_df):
+    """Clusters of near-identical story titles or AC scenarios, across all files (ignores the filters)."""
+    from dedup import THRESHOLD, corpus_signatures, duplicate_clusters
+    from exports import csv_bytes
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        kind = st.radio("Compare", list(DUPLICATE_SOURCES), horizontal=True, key="dup_kind")
+    with c2:
+        threshold = st.slider("Minimum similarity", 0.5, 1.0, THRESHOLD, 0.05, key="dup_threshold",
+                              help="Estimated Jaccard similarity of the texts' word pairs; 1.0 finds exact copies.")
+    if not st.toggle("Find near-duplicates", key="dup_on",
+                     help="Signatures are computed once per document, so later runs only hash new files."):
+        st.caption("Finds copy-pasted or slightly reworded stories and ACs, e.g. the same requirement in several specs.")
+        return
+    column, shown = DUPLICATE_SOURCES[kind]
+    frame = stories_df if column == "Story Title" else ac_df
+    if frame.empty:
+        st.info("Nothing to compare yet.")
+        return
+    if st.session_state.get("duplicates", (None,))[0] != index_key:
+        st.session_state.duplicates = (index_key, {}, {})
+    _, signatures, clusters = st.session_state.duplicates
+    if column not in signatures:
+        with st.spinner("Hashing texts…"):
+            signatures[column] = corpus_signatures(frame, column, signature_cache())
+    if (column, threshold) not in clusters:
+        clusters[(column, threshold)] = duplicate_clusters(frame[[c for c in shown if c in frame]],
+                                                           signatures[column], threshold)
+    dups = clusters[(column, threshold)]
+    if dups.empty:
+        st.success("No near-duplicates at this similarity.")
+        return
+
+    n_clusters = int(dups["Cluster"].max())
+    cross_file = int((dups.groupby("Cluster")["Source File"].nunique() > 1).sum()) if "Source File" in dups else 0
+    cols = st.columns(3)
+    for col, (label, val) in zip(cols, [("Clusters", n_clusters), ("Rows in clusters", len(dups)),
+                                        ("Across files", cross_file)]):
+        col.markdown(
+            f"<div class='metric-card'><div class='metric-label'>{label}</div>"
+            f"<div class='metric-value'>{val}</div></div>", unsafe_allow_html=True
+        )
+    if len(dups) > DUPLICATE_ROWS_SHOWN:
+        st.caption(f"Showing the first {DUPLICATE_ROWS_SHOWN:,} of {len(dups):,} rows (largest clusters first); "
+                   "the CSV has all of them.")
+    st.dataframe(dups.head(DUPLICATE_ROWS_SHOWN), width="stretch", hide_index=True)
+    st.download_button("⬇️ CSV", st.session_state.export_cache.lazy(("duplicates", column, threshold, index_key),
+                                                                    lambda: csv_bytes(dups)),
+                       "duplicates.csv", "text/csv", key="csv_duplicates")
+
+def render_revision_diff(revised):
+    """Stories and ACs added, removed or changed by the latest revision of each re-uploaded file."""
+    from revisions import diff_revisions, reused_sections
+    names = [f["name"] for f in revised]
+    f = revised[names.index(st.selectbox("Revised file", names, key="diff_file"))] if len(revised) > 1 else revised[0]
+    previous = f["previous"]
+    diffs = st.session_state.setdefault("revision_diffs", {})
+    key = (previous["hash"], f["hash"])
+    if key not in diffs:
+        diffs[key] = diff_revisions(previous["frames"], st.session_state.parse_cache.get(f["file"], f["hash"]))
+    diff = diffs[key]
+
+    if f.get("sections"):
+        st.caption(f"{f['name']}: {reused_sections(f['sections'], previous['sections'])} of "
+                   f"{len(f['sections'])} sections reused from the previous upload; only edited sections were re-read.")
+    counts = diff.counts()
+    cols = st.columns(6)
+    for col, (label, val) in zip(cols, [(f"Stories {c}", n) for c, n in counts["stories"].items()] +
+                                       [(f"ACs {c}", n) for c, n in counts["acs"].items()]):
+        col.markdown(
+            f"<div class='metric-card'><div class='metric-label'>{label}</div>"
+            f"<div class='metric-value'>{val}</div></div>", unsafe_allow_html=True
+        )
+    if not diff:
+        st.success("No story or AC changes between the two revisions.")
+        return
+    st.markdown("#### 📖 Stories")
+    st.dataframe(diff.stories, width="stretch", hide_index=True)
+    st.markdown("#### ✅ Acceptance Criteria")
+    st.dataframe(diff.acs, width="stretch", hide_index=True)
+
 
 # ------------------------------
 # ABOUT PAGE
@@ -376,10 +803,12 @@ def render_manual():
     st.markdown("### ✅ Accepted Input")
     st.markdown(
         """
-        - **File Type:** `.docx` (Microsoft Word) only  
+        - **File Type:** `.docx` (Microsoft Word), or a `.zip` of `.docx` files  
         - **Recognized Patterns:**  
           - `Epic 1: Payments` → **Epics**  
           - `User Story 1: Add UPI option` → **User Stories**  
+          - Other **Document formats** (chosen in Step 1): *headings* also reads Heading 1 paragraphs as Epics and
+            Heading 2 as Stories; *gherkin* reads `Feature: …` as Epics and `Scenario: …` as Stories  
           - **Acceptance Criteria Tables** — normalized headers such as `S.No`, `Scenario`, `Acceptance Criteria`.
         """
     )
@@ -387,7 +816,7 @@ def render_manual():
     st.markdown("### 🛠 Steps to Use")
     st.markdown(
         """
-        1. 📂 **Upload** one or more `.docx` files containing your requirements.  
+        1. 📂 **Upload** one or more `.docx` files (or `.zip` archives of them) containing your requirements.  
         2. 📊 **Analyze** extracted **Epics**, **Stories**, and **Acceptance Criteria** under *Results & Analysis*.  
         3. 🎯 **Filter & Search** by Epic, File, Story ID, or keyword.  
         4. 📥 **Export** filtered data to CSV or Excel for tools like Jira or Trello.  
@@ -451,8 +880,52 @@ def render_manual():
 
 
 # ------------------------------
-# JIRA PLACEHOLDER
+# JIRA EXPORT
 # ------------------------------
-def render_jira_placeholder():
+def render_jira():
+    """Create the extracted stories (and their ACs as sub-tasks) in a Jira project."""
+    from jira_export import DEFAULT_MAP_PATH, IdempotencyMap, JiraBulkExporter, JiraConfig, JiraError
+    inject_styles()
     st.title("🚀 Jira Integration")
-    st.info("⚠️ Jira integration is **In Progress**. Stay tuned for OAuth support and secure issue creation.")
+    view = st.session_state.get("corpus_view")
+    if view is None:
+        st.info("Extract some documents on the 🏠 Main page first; their stories and ACs can then be sent to Jira.")
+        return
+    _, stories_df, ac_df, _, _ = view
+    st.caption(f"{len(stories_df)} stories and {len(ac_df)} ACs ready. Stories become issues, ACs become sub-tasks. "
+               f"Keys already created are remembered in `{DEFAULT_MAP_PATH}`, so re-running only creates what is missing.")
+
+    with st.form("jira_form"):
+        c1, c2 = st.columns(2)
+        base_url = c1.text_input("Jira URL", placeholder="https://your-team.atlassian.net")
+        project = c2.text_input("Project key", placeholder="PROJ")
+        email = c1.text_input("Account email")
+        token = c2.text_input("API token", type="password")
+        story_type = c1.text_input("Story issue type", value="Story")
+        subtask_type = c2.text_input("Sub-task issue type", value="Sub-task")
+        concurrency = st.slider("Parallel requests", 1, 8, 4,
+                                help="Bulk requests in flight at once; rate limits (HTTP 429) pause all of them.")
+        submitted = st.form_submit_button("Create issues", width="stretch")
+
+    if not submitted:
+        return
+    if not base_url.strip() or not project.strip():
+        st.error("Jira URL and project key are required.")
+        return
+    config = JiraConfig(base_url.strip(), project.strip().upper(), email.strip(), token,
+                        story_type.strip() or "Story", subtask_type.strip() or "Sub-task", concurrency=concurrency)
+    bar = st.progress(0.0, text="Creating issues…")
+    def progress(done, total):
+        bar.progress(done / total if total else 1.0, text=f"{done} / {total} issues")
+    try:
+        report = JiraBulkExporter(config, IdempotencyMap(DEFAULT_MAP_PATH)).export(stories_df, ac_df, progress)
+    except (JiraError, OSError, ValueError) as exc:
+        st.error(f"Jira export failed: {exc}")
+        return
+    bar.progress(1.0, text="Done")
+    st.success(f"Created {report.created} issue(s), skipped {report.skipped} already in Jira, "
+               f"{len(report.failed)} failed · {report.issues_per_second:.1f} issues/s, "
+               f"{report.requests} request(s), {report.retries} rate-limit retr{'y' if report.retries == 1 else 'ies'}.")
+    if report.failed:
+        import pandas as pd
+        st.dataframe(pd.DataFrame(report.failed, columns=["Item", "Error"]), width="stretch", hide_index=True)